@@ -0,0 +1,6 @@
+from .synthetic_docx import build_synthetic_docx, make_png
+
+__all__ = [
+    'build_synthetic_docx',
+    'make_png'
+]
\ No newline at end of file
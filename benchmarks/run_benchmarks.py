@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic_docx import build_synthetic_docx
+from converters import MarkdownConverter
+from converters.word2md_converter import PARSER_ENGINES
+from generators import MarkdownGenerator, MarkdownWriter
+from parsers import ParseCache, WordDocumentParser
+from processors import ImageProcessor
+from selector import SectionSelector
+
+STAGES = ("parse", "select", "images", "generate", "write")
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# 低于该差值的变化视为测量噪声，不算退化
+MIN_TIME_DELTA = 0.01
+MIN_MEMORY_DELTA = 1024 * 1024
+
+
+class StageRecorder:
+    """记录各阶段的耗时，开启内存跟踪时同时记录各阶段的峰值内存"""
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        初始化记录器
+
+        Args:
+            trace_memory: 是否用 tracemalloc 记录各阶段的峰值内存（会拖慢执行，不与计时同时使用）
+        """
+        self.trace_memory = trace_memory
+        self.times: Dict[str, float] = {}
+        self.peaks: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """测量一个阶段"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        self.times[name] = time.perf_counter() - start
+        if self.trace_memory:
+            self.peaks[name] = tracemalloc.get_traced_memory()[1] - base
+
+
+def run_pipeline(docx_path: str, engine: str, work_dir: str, recorder: StageRecorder) -> Dict[str, int]:
+    """
+    按阶段执行一次完整的转换
+
+    parse 包括扫描章节和加载文档模型（docx 引擎）；流式引擎在 images 和 generate
+    阶段各自遍历一次文档，解析耗时计入这两个阶段。images 阶段先保存全部图片，
+    generate 阶段只引用已保存的图片，write 阶段把生成的行写入文件。
+
+    Args:
+        docx_path: 文档路径
+        engine: 解析引擎
+        work_dir: 输出目录（图片和Markdown）
+        recorder: 阶段记录器
+
+    Returns:
+        计数（章节、正文块、图片数和写入字节数）
+    """
+    with recorder.stage("parse"):
+        parser = PARSER_ENGINES[engine](docx_path, cache=ParseCache(enabled=False))
+        if isinstance(parser, WordDocumentParser):
+            parser.document  # 加载python-docx文档模型
+
+    with recorder.stage("select"):
+        indices = [sec.index for sec in parser.get_sections()]
+        selected = SectionSelector.select_sections_by_range(parser, indices)
+
+    image_processor = ImageProcessor(work_dir)
+    with recorder.stage("images"):
+        image_parts = parser.get_image_parts()
+        blocks = 0
+        for _, content in parser.iter_sections(selected):
+            for block in content:
+                blocks += 1
+                for parts in image_processor.index_drawings(block._element, image_parts).values():
+                    for part in parts:
+                        image_processor.image_name(part)
+
+    with recorder.stage("generate"):
+        generator = MarkdownGenerator(MarkdownConverter("c"), image_processor)
+        rendered = [
+            (index, list(lines))
+            for index, lines in generator.iter_markdown(parser.iter_sections(selected), parser)
+        ]
+
+    with recorder.stage("write"):
+        with open(os.path.join(work_dir, "out.md"), "wb") as f:
+            writer = MarkdownWriter(f)
+            for index, lines in rendered:
+                writer.write_section(index, lines)
+
+    return {
+        "sections": len(selected),
+        "blocks": blocks,
+        "images": len(os.listdir(image_processor.image_dir)),
+        "bytes_written": writer.position
+    }
+
+
+def benchmark_engine(docx_path: str, engine: str, repeat: int) -> Dict[str, Any]:
+    """
+    对一个引擎计时 repeat 次取中位数，再单独执行一次测量峰值内存
+
+    Returns:
+        各阶段的耗时（秒）、峰值内存（字节）和计数
+    """
+    times: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        recorder = StageRecorder()
+        with tempfile.TemporaryDirectory() as work_dir:
+            counters = run_pipeline(docx_path, engine, work_dir, recorder)
+        for stage in STAGES:
+            times[stage].append(recorder.times[stage])
+
+    recorder = StageRecorder(trace_memory=True)
+    tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            run_pipeline(docx_path, engine, work_dir, recorder)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "stages": {
+            stage: {"time": round(statistics.median(times[stage]), 6), "peak_memory": recorder.peaks[stage]}
+            for stage in STAGES
+        },
+        "counters": counters
+    }
+
+
+def benchmark_startup(docx_path: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    测量命令行的启动耗时（各命令在新进程中执行 repeat 次取中位数）
+
+    help 只解析参数；list_sections 命中章节索引缓存，list_sections_cold 不使用缓存、重新扫描标题。
+
+    Returns:
+        命令名称 -> {"time": 耗时（秒）}
+    """
+    commands = {
+        "help": ["-h"],
+        "list_sections": ["-i", docx_path, "--list-sections"],
+        "list_sections_cold": ["-i", docx_path, "--list-sections", "--no-cache"]
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, WORD2MD_CACHE_DIR=cache_dir)
+        env.pop("WORD2MD_NO_CACHE", None)
+        # 预热章节索引缓存
+        subprocess.run([sys.executable, MAIN_SCRIPT] + commands["list_sections"], env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        for name, args in commands.items():
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, MAIN_SCRIPT] + args, env=env, stdout=subprocess.DEVNULL, check=True)
+                times.append(time.perf_counter() - start)
+            results[name] = {"time": round(statistics.median(times), 6)}
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    与基准结果比较，返回退化的阶段说明
+
+    耗时或峰值内存超过基准的 (1 + threshold) 倍且差值超过噪声下限时视为退化，
+    启动耗时同样按此规则比较。
+    """
+    regressions = []
+    for name, current in results.get("startup", {}).items():
+        previous = baseline.get("startup", {}).get(name)
+        if previous is None:
+            continue
+        old, new = previous["time"], current["time"]
+        if new > old * (1 + threshold) and new - old > MIN_TIME_DELTA:
+            regressions.append(f"startup/{name} time: {old} -> {new}")
+    for engine, result in results["engines"].items():
+        base_engine = baseline.get("engines", {}).get(engine)
+        if base_engine is None:
+            continue
+        for stage, current in result["stages"].items():
+            previous = base_engine["stages"].get(stage)
+            if previous is None:
+                continue
+            for metric, min_delta in (("time", MIN_TIME_DELTA), ("peak_memory", MIN_MEMORY_DELTA)):
+                old, new = previous[metric], current[metric]
+                if new > old * (1 + threshold) and new - old > min_delta:
+                    regressions.append(f"{engine}/{stage} {metric}: {old} -> {new}")
+    return regressions
+
+
+def print_results(results: Dict[str, Any]):
+    """输出结果表格"""
+    for engine, result in results["engines"].items():
+        print(f"\n[{engine}] {result['counters']}")
+        print(f"{'stage':<10}{'time(s)':>12}{'peak(KiB)':>14}")
+        for stage, metrics in result["stages"].items():
+            print(f"{stage:<10}{metrics['time']:>12.4f}{metrics['peak_memory'] / 1024:>14.1f}")
+
+    if results.get("startup"):
+        print(f"\n[startup]\n{'command':<20}{'time(s)':>12}")
+        for name, metrics in results["startup"].items():
+            print(f"{name:<20}{metrics['time']:>12.4f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """主函数，返回进程退出码"""
+    parser = argparse.ArgumentParser(description="word2md 各阶段性能基准测试")
+    parser.add_argument("--docx", help="使用已有的 .docx 文件，不生成合成文档")
+    parser.add_argument("--sections", type=int, default=20, help="合成文档的章节数")
+    parser.add_argument("--paragraphs", type=int, default=50, help="每个章节的正文段落数")
+    parser.add_argument("--images", type=int, default=20, help="图片总数")
+    parser.add_argument("--tables", type=int, default=5, help="表格总数")
+    parser.add_argument("--table-rows", type=int, default=20, help="每个表格的行数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--engines", nargs="+", default=sorted(PARSER_ENGINES), choices=sorted(PARSER_ENGINES),
+                        help="要测试的解析引擎")
+    parser.add_argument("--repeat", type=int, default=3, help="计时的重复次数，取中位数")
+    parser.add_argument("--no-startup", action="store_true", help="不测量命令行的启动耗时")
+    parser.add_argument("-o", "--output", help="JSON结果的输出路径")
+    parser.add_argument("--baseline", help="基准结果JSON，有阶段退化时以非0状态码退出")
+    parser.add_argument("--threshold", type=float, default=0.25, help="允许的退化比例，默认 0.25")
+    args = parser.parse_args(argv)
+
+    params = {key: getattr(args, key) for key in ("sections", "paragraphs", "images", "tables", "table_rows", "seed")}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        docx_path = args.docx
+        if docx_path is None:
+            docx_path = os.path.join(tmp_dir, "synthetic.docx")
+            build_synthetic_docx(docx_path, **params)
+
+        results = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "document": args.docx or params,
+                "size": os.path.getsize(docx_path),
+                "repeat": args.repeat
+            },
+            "engines": {engine: benchmark_engine(docx_path, engine, args.repeat) for engine in args.engines}
+        }
+        if not args.no_startup:
+            results["startup"] = benchmark_startup(docx_path, max(args.repeat, 5))
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 结果：{args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n❌ 性能退化：")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n✅ 与基准相比没有退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
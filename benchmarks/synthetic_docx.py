@@ -0,0 +1,114 @@
+import io
+import random
+import struct
+import zlib
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Pt
+
+WORDS = (
+    "word", "markdown", "section", "paragraph", "image", "table", "style", "heading", "render",
+    "stream", "cache", "parser", "生成", "文档", "段落", "图片", "表格", "转换"
+)
+CODE_LINES = (
+    "int main(void) {",
+    "    int total = 0;",
+    "    for (int i = 0; i < 10; i++) total += i;",
+    "    return total;",
+    "}"
+)
+
+
+def make_png(seed: int, size: int = 16) -> bytes:
+    """
+    生成纯色PNG，不同的 seed 得到内容不同的图片
+
+    Args:
+        seed: 决定颜色的种子
+        size: 边长（像素）
+
+    Returns:
+        PNG文件内容
+    """
+    color = bytes(((seed * 67) % 256, (seed * 131) % 256, (seed * 197 + seed // 256) % 256))
+    raw = b"".join(b"\x00" + color * size for _ in range(size))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """生成一段随机文本，偶尔带有URL"""
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    if rng.random() < 0.1:
+        text += f" https://example.com/{rng.randrange(1000)}"
+    return text
+
+
+def _add_formatted_paragraph(document, rng: random.Random):
+    """添加由多个不同格式的run组成的正文段落"""
+    para = document.add_paragraph()
+    for _ in range(rng.randint(3, 8)):
+        run = para.add_run(_sentence(rng, rng.randint(2, 8)) + " ")
+        kind = rng.random()
+        if kind < 0.15:
+            run.bold = True
+        elif kind < 0.25:
+            run.italic = True
+        elif kind < 0.3:
+            run.font.strike = True
+        elif kind < 0.35:
+            run.font.name = "Consolas"
+
+
+def build_synthetic_docx(path: str, sections: int = 20, paragraphs: int = 50, images: int = 20,
+                         tables: int = 5, table_rows: int = 20, seed: int = 0):
+    """
+    生成可复现的合成测试文档
+
+    每个章节包含一级标题、二级标题、混合格式的正文段落和代码块；图片和表格平均分布到各章节。
+    相同的参数和 seed 总是生成相同的文档内容。
+
+    Args:
+        path: 输出的 .docx 路径
+        sections: 章节数
+        paragraphs: 每个章节的正文段落数
+        images: 图片总数（每张图片内容不同）
+        tables: 表格总数
+        table_rows: 每个表格的行数
+        seed: 随机种子
+    """
+    rng = random.Random(seed)
+    document = Document()
+    code_style = document.styles.add_style("Code", WD_STYLE_TYPE.PARAGRAPH)
+    code_style.font.name = "Consolas"
+    code_style.font.size = Pt(9)
+
+    for index in range(sections):
+        document.add_heading(f"Section {index + 1} {_sentence(rng, 2)}", level=1)
+        section_images = range(index, images, sections)
+        section_tables = range(index, tables, sections)
+
+        for n in range(paragraphs):
+            if n == paragraphs // 2:
+                document.add_heading(_sentence(rng, 3), level=2)
+            if n % 10 == 5:
+                for line in CODE_LINES:
+                    document.add_paragraph(line, style="Code")
+                continue
+            _add_formatted_paragraph(document, rng)
+
+        for image in section_images:
+            document.add_picture(io.BytesIO(make_png(image)))
+
+        for _ in section_tables:
+            table = document.add_table(rows=table_rows, cols=4)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = _sentence(rng, 3)
+
+    document.save(path)
@@ -1,7 +1,29 @@
-from .markdown_converter import MarkdownConverter
-from .word2md_converter import Word2MarkdownConverter
+import importlib
+
+# 导出名称 -> 所在子模块，首次访问时才导入（PEP 562），导入包本身不会加载 python-docx 等依赖
+_EXPORTS = {
+    'MarkdownConverter': 'markdown_converter',
+    'ConversionStats': 'conversion_stats',
+    'ConversionResult': 'conversion_result',
+    'Word2MarkdownConverter': 'word2md_converter',
+    'BatchConverter': 'batch_converter',
+    'DocumentWatcher': 'watcher'
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'MarkdownConverter',
-    'Word2MarkdownConverter'
+    'ConversionStats',
+    'ConversionResult',
+    'Word2MarkdownConverter',
+    'BatchConverter',
+    'DocumentWatcher'
 ]
\ No newline at end of file
@@ -0,0 +1,193 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from converters.word2md_converter import Word2MarkdownConverter
+
+GLOB_CHARS = "*?["
+
+
+def _convert_file(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    在工作进程中转换单个文件
+
+    Args:
+        task: 转换任务（输入、输出路径及转换参数）
+
+    Returns:
+        单个文件的转换结果
+    """
+    start = time.perf_counter()
+    result = {"input": task["input"], "output": task["output"], "status": "ok", "error": None,
+              "stages": {}, "counters": {}}
+    try:
+        os.makedirs(os.path.dirname(task["output"]), exist_ok=True)
+        converter = Word2MarkdownConverter(task["code_language"], use_cache=task["use_cache"])
+        stats = converter.convert(task["input"], task["output"], engine=task["engine"], interactive=False,
+                                  incremental=task["incremental"])
+        if not stats:
+            result["status"] = "failed"
+            result["error"] = stats.error
+        result["stages"] = stats.stages
+        result["counters"] = dict(stats.counters)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+class BatchConverter:
+    """批量转换器，将目录、通配符或清单中的文档并行转换到输出目录"""
+
+    def __init__(self, code_language: str = "", workers: Optional[int] = None,
+                 engine: str = "docx", use_cache: bool = True, incremental: bool = False):
+        """
+        初始化批量转换器
+
+        Args:
+            code_language: 代码块语言标识
+            workers: 并行的工作进程数（默认为CPU核数）
+            engine: 解析引擎
+            use_cache: 是否使用章节索引缓存
+            incremental: 是否增量转换
+        """
+        self.code_language = code_language
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.use_cache = use_cache
+        self.incremental = incremental
+
+    @staticmethod
+    def _is_docx(path: str) -> bool:
+        """是否为可转换的Word文档（忽略Word打开文件时生成的 ~$ 锁文件）"""
+        name = os.path.basename(path)
+        return name.lower().endswith(".docx") and not name.startswith("~$")
+
+    def _expand(self, spec: str) -> List[Tuple[str, str]]:
+        """
+        展开单个输入项
+
+        Args:
+            spec: 目录、通配符或 .docx 文件路径
+
+        Returns:
+            (文档路径, 镜像到输出目录时使用的基准目录) 列表
+        """
+        if os.path.isdir(spec):
+            files = []
+            for root, _, names in os.walk(spec):
+                files.extend(os.path.join(root, name) for name in sorted(names))
+            base = spec
+        elif any(c in spec for c in GLOB_CHARS):
+            files = sorted(glob.glob(spec, recursive=True))
+            # 基准目录为通配符之前的部分
+            prefix = spec[:min(spec.index(c) for c in GLOB_CHARS if c in spec)]
+            base = os.path.dirname(prefix) or "."
+        else:
+            files = [spec]
+            base = os.path.dirname(spec) or "."
+        return [(f, base) for f in files if os.path.isfile(f) and self._is_docx(f)]
+
+    @staticmethod
+    def read_manifest(manifest_path: str) -> List[str]:
+        """
+        读取清单文件，每行一个输入项，# 开头为注释；相对路径相对于清单所在目录
+
+        Args:
+            manifest_path: 清单文件路径
+
+        Returns:
+            输入项列表
+        """
+        manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+        specs = []
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    specs.append(os.path.join(manifest_dir, line))
+        return specs
+
+    def collect_tasks(self, specs: Iterable[str], output_root: str) -> List[Dict[str, Any]]:
+        """
+        收集转换任务，按输入目录结构镜像到输出根目录
+
+        Args:
+            specs: 输入项（目录、通配符或 .docx 文件）
+            output_root: 输出根目录
+
+        Returns:
+            转换任务列表
+        """
+        tasks = []
+        seen = set()
+        for spec in specs:
+            for docx_path, base in self._expand(spec):
+                key = os.path.abspath(docx_path)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                relative = os.path.relpath(docx_path, base)
+                stem = os.path.splitext(relative)[0]
+                tasks.append({
+                    "input": docx_path,
+                    "output": os.path.join(output_root, stem + ".md"),
+                    "code_language": self.code_language,
+                    "engine": self.engine,
+                    "use_cache": self.use_cache,
+                    "incremental": self.incremental
+                })
+        return tasks
+
+    def run(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        并行执行转换任务，单个文件失败不影响其他文件
+
+        Args:
+            tasks: 转换任务列表
+
+        Returns:
+            汇总结果（各文件的状态、耗时、各阶段耗时、计数和错误信息）
+        """
+        start = time.perf_counter()
+        results = []
+
+        if self.workers == 1:
+            results = [_convert_file(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(_convert_file, task): task for task in tasks}
+                for future in as_completed(futures):
+                    task = futures[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # 工作进程异常退出等情况
+                        results.append({
+                            "input": task["input"], "output": task["output"], "status": "failed",
+                            "error": f"{type(e).__name__}: {e}", "duration": None
+                        })
+
+        order = {task["input"]: i for i, task in enumerate(tasks)}
+        results.sort(key=lambda r: order[r["input"]])
+        failed = sum(1 for r in results if r["status"] != "ok")
+        return {
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "duration": round(time.perf_counter() - start, 3),
+            "files": results
+        }
+
+    @staticmethod
+    def write_summary(summary: Dict[str, Any], summary_path: str):
+        """将汇总结果写入JSON文件"""
+        directory = os.path.dirname(os.path.abspath(summary_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
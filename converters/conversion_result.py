@@ -0,0 +1,51 @@
+import os
+from typing import Any, Dict
+
+from converters.conversion_stats import ConversionStats
+from processors.image_writer import copy_image_part
+
+# 内存转换结果中Markdown引用图片使用的相对目录
+IMAGE_LINK_DIR = "images"
+
+
+class ConversionResult:
+    """内存中的转换结果
+
+    markdown 为生成的Markdown文本，其中图片以 images/文件名 的相对路径引用；
+    images 为 文件名 -> 图片部件，部件按需读取（blob 取得全部内容，open() 以流的方式读取），
+    转换过程中不会写入任何文件。可以直接作为布尔值使用，表示转换是否成功。
+    """
+
+    def __init__(self, markdown: str, images: Dict[str, Any], stats: ConversionStats):
+        """
+        初始化转换结果
+
+        Args:
+            markdown: Markdown文本
+            images: 图片文件名 -> 图片部件（ZipPart）
+            stats: 转换统计
+        """
+        self.markdown = markdown
+        self.images = images
+        self.stats = stats
+
+    def __bool__(self) -> bool:
+        return bool(self.stats)
+
+    def image_bytes(self) -> Dict[str, bytes]:
+        """读取全部图片的内容，返回 文件名 -> 图片内容"""
+        return {name: part.blob for name, part in self.images.items()}
+
+    def save(self, output_md_path: str):
+        """
+        把结果写入磁盘，图片保存在输出目录下的 images 中，与Markdown中的引用一致
+
+        Args:
+            output_md_path: 输出Markdown文件路径
+        """
+        image_dir = os.path.join(os.path.dirname(os.path.abspath(output_md_path)), IMAGE_LINK_DIR)
+        os.makedirs(image_dir, exist_ok=True)
+        for name, part in self.images.items():
+            copy_image_part(os.path.join(image_dir, name), part)
+        with open(output_md_path, "w", encoding="utf-8", newline="") as f:
+            f.write(self.markdown)
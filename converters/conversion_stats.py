@@ -0,0 +1,142 @@
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+# 各阶段在报告中的显示顺序
+STAGES = ("parse", "select", "generate", "image_write", "file_write")
+
+
+class ConversionStats:
+    """单次转换的统计结果
+
+    记录各阶段的耗时、计数（章节、段落、表格、run、图片、写入字节数）和进程峰值内存，开启内存跟踪时
+    同时用 tracemalloc 记录各阶段的Python峰值内存。生成和写入是流式交替进行的，
+    generate 阶段包含边生成边写出的时间（图片在首次引用时确定文件名并提交后台写入，也计入其中），
+    file_write 只包含最后的刷新和替换文件，image_write 为等待后台图片写入完成（或写入归档时复制图片）的时间。
+    可以直接作为布尔值使用，表示转换是否成功。
+    """
+
+    def __init__(self, docx_path: str, output_md_path: Optional[str] = None, track_memory: bool = False):
+        """
+        初始化统计结果
+
+        Args:
+            docx_path: 输入Word文档路径
+            output_md_path: 输出Markdown文件路径（输出到流时为None）
+            track_memory: 是否记录各阶段的峰值内存
+        """
+        self.docx_path = docx_path
+        self.output_md_path = output_md_path
+        self.success = False
+        self.cancelled = False
+        self.error: Optional[str] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Counter = Counter()
+        self.track_memory = track_memory
+        self._started_tracing = False
+        self._start = time.perf_counter()
+        self.duration = 0.0
+
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        测量一个阶段，同名阶段多次进入时累加耗时
+
+        Args:
+            name: 阶段名称
+        """
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self.stages.setdefault(name, {"time": 0.0})
+            record["time"] = round(record["time"] + time.perf_counter() - start, 6)
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                record["peak_memory"] = max(record.get("peak_memory", 0), peak)
+
+    def count(self, name: str, value: int = 1):
+        """累加计数"""
+        self.counters[name] += value
+
+    def finish(self, success: bool, error: Optional[str] = None, cancelled: bool = False):
+        """
+        结束统计
+
+        Args:
+            success: 转换是否成功
+            error: 失败原因
+            cancelled: 转换是否被取消（此时 success 为False）
+        """
+        self.success = success
+        self.cancelled = cancelled
+        self.error = error
+        self.duration = round(time.perf_counter() - self._start, 6)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @staticmethod
+    def max_rss() -> Optional[int]:
+        """进程的峰值常驻内存（字节），平台不支持时为None"""
+        if resource is None:
+            return None
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 以字节为单位，Linux 以KB为单位
+        return rss if sys.platform == "darwin" else rss * 1024
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化为JSON的字典"""
+        return {
+            "input": self.docx_path,
+            "output": self.output_md_path,
+            "success": self.success,
+            "cancelled": self.cancelled,
+            "error": self.error,
+            "duration": self.duration,
+            "stages": {name: self.stages[name] for name in sorted(self.stages, key=_stage_order)},
+            "counters": dict(self.counters),
+            "max_rss": self.max_rss()
+        }
+
+    def format_report(self) -> str:
+        """生成便于阅读的统计报告"""
+        lines = [f"📊 转换统计：{self.docx_path}（{'成功' if self.success else '失败'}，共 {self.duration:.3f}s）"]
+        for name in sorted(self.stages, key=_stage_order):
+            record = self.stages[name]
+            line = f"  {name:<12}{record['time']:>10.3f}s"
+            if "peak_memory" in record:
+                line += f"{record['peak_memory'] / 1024 / 1024:>10.1f} MiB"
+            lines.append(line)
+        if self.counters:
+            lines.append("  " + "，".join(f"{name}={value}" for name, value in sorted(self.counters.items())))
+        max_rss = self.max_rss()
+        if max_rss is not None:
+            lines.append(f"  进程峰值内存：{max_rss / 1024 / 1024:.1f} MiB")
+        if self.error:
+            lines.append(f"  错误：{self.error}")
+        return "\n".join(lines)
+
+
+def _stage_order(name: str) -> int:
+    """按流水线顺序排列阶段，未知阶段排在最后"""
+    return STAGES.index(name) if name in STAGES else len(STAGES)
@@ -1,5 +1,15 @@
 import re
 
+# 纯文本中的URL，遇到空白、括号、引号和中文标点时结束
+URL_PATTERN = re.compile(r"(https?://[^\s\)\]\}<>\"\'，。：；！、]+)")
+# 链接文字中需要转义的字符
+LINK_TEXT_SPECIAL_PATTERN = re.compile(r"([\\\[\]])")
+
+
+def escape_link_text(text: str) -> str:
+    """转义Markdown链接文字中的反斜杠和方括号，避免提前结束链接"""
+    return LINK_TEXT_SPECIAL_PATTERN.sub(r"\\\1", text)
+
 
 class MarkdownConverter:
     """Word文档到Markdown转换器"""
@@ -12,24 +22,18 @@ class MarkdownConverter:
             code_language: 代码块的默认语言标识
         """
         self.code_language = code_language
-        self.image_counter = 1
 
     @staticmethod
     def convert_plain_urls_to_md(text: str) -> str:
         """
         将纯文本URL转换为Markdown链接格式
 
+        与行内渲染使用同一个 URL_PATTERN，保留给外部调用。
+
         Args:
             text: 包含URL的文本
 
         Returns:
             转换后的Markdown文本
         """
-        url_pattern = r"(https?://[^\s\)\]\}<>\"\'，。：；！、]+)"
-
-        def replacer(match):
-            url = match.group(1)
-            return f"[{url}]({url})"
-
-        return re.sub(url_pattern, replacer, text)
-
+        return URL_PATTERN.sub(r"[\1](\1)", text)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Set, Tuple
+
+from parsers.section import Section
+
+MANIFEST_VERSION = 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class SectionManifest:
+    """增量转换清单
+
+    与输出的Markdown放在一起，记录每个章节的内容指纹、在输出中的字节位置和引用的图片。
+    再次转换时，内容与图片都未改变的章节直接从上一次的输出中读取，不再重新生成。
+    新的输出需要先写入临时文件，读取完复用的章节后再替换原文件。
+    """
+
+    def __init__(self, output_md_path: str, settings: Dict[str, Any]):
+        """
+        初始化清单
+
+        Args:
+            output_md_path: 输出Markdown文件路径
+            settings: 影响输出内容的转换参数（如代码块语言、图片目录）和所有章节共用部件的指纹，
+                任何一项变化时都不复用
+        """
+        self.output_md_path = output_md_path
+        self.manifest_path = os.path.splitext(output_md_path)[0] + ".manifest.json"
+        self.settings = settings
+        self.previous_sections: Dict[int, Dict[str, Any]] = {}
+        self._load()
+
+    def _output_hash(self) -> str:
+        """按块计算上一次输出文件的哈希"""
+        hasher = hashlib.sha256()
+        with open(self.output_md_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _load(self):
+        """读取上一次的清单并校验输出文件，两者不一致时视为没有可复用的内容"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            output_hash = self._output_hash()
+        except (OSError, ValueError):
+            return
+
+        if (manifest.get("version") != MANIFEST_VERSION
+                or manifest.get("settings") != self.settings
+                or manifest.get("output_hash") != output_hash):
+            return
+
+        self.previous_sections = {sec["index"]: sec for sec in manifest.get("sections", [])}
+
+    def reusable_sections(self, sections: List[Section], image_parts: Dict[str, Any],
+                          image_dir: str) -> Set[int]:
+        """
+        找出可以直接复用上一次输出的章节
+
+        章节的标题和内容指纹相同、引用的图片部件未改变（CRC和大小一致）且图片文件仍然存在时可以复用。
+
+        Args:
+            sections: 选定的章节索引
+            image_parts: 当前文档中的部件
+            image_dir: 图片目录
+
+        Returns:
+            可以复用的章节索引
+        """
+        parts = {part.partname: part for part in image_parts.values()}
+        reusable = set()
+        for sec in sections:
+            previous = self.previous_sections.get(sec.index)
+            if (previous is None or not sec.fingerprint
+                    or previous["title"] != sec.title
+                    or previous["fingerprint"] != sec.fingerprint):
+                continue
+
+            images_unchanged = all(
+                image["part"] in parts
+                and parts[image["part"]].crc == image["crc"]
+                and parts[image["part"]].size == image["size"]
+                and os.path.isfile(os.path.join(image_dir, image["name"]))
+                for image in previous["images"]
+            )
+            if images_unchanged:
+                reusable.add(sec.index)
+        return reusable
+
+    def read_section(self, index: int) -> str:
+        """
+        从上一次的输出中读取一个章节的Markdown文本
+
+        Args:
+            index: 章节索引
+
+        Returns:
+            该章节的Markdown文本
+        """
+        previous = self.previous_sections[index]
+        with open(self.output_md_path, "rb") as f:
+            f.seek(previous["offset"])
+            return f.read(previous["length"]).decode("utf-8")
+
+    def save(self, sections: List[Section], spans: Dict[int, Tuple[int, int]], output_hash: str,
+             section_images: Dict[int, List[Dict[str, Any]]], reused: Set[int]):
+        """
+        保存本次转换的清单
+
+        Args:
+            sections: 本次输出的章节（按文档顺序）
+            spans: 章节索引 -> 该章节在输出中的 (字节偏移, 字节长度)
+            output_hash: 输出内容的sha256
+            section_images: 本次重新生成的章节引用的图片
+            reused: 复用上一次输出的章节索引，沿用上一次的图片记录
+        """
+        records = []
+        for sec in sections:
+            index = sec.index
+            offset, length = spans[index]
+            if index in reused:
+                images = self.previous_sections[index]["images"]
+            else:
+                images = section_images.get(index, [])
+            records.append({
+                "index": index,
+                "title": sec.title,
+                "fingerprint": sec.fingerprint,
+                "offset": offset,
+                "length": length,
+                "images": images
+            })
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "settings": self.settings,
+            "output_hash": output_hash,
+            "sections": records
+        }
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,239 @@
+import os
+import signal
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from converters.batch_converter import GLOB_CHARS, BatchConverter
+from converters.word2md_converter import Word2MarkdownConverter
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # 未安装 watchdog 时定时检查文件的修改时间
+    FileSystemEventHandler = object
+    Observer = None
+
+# 最后一次保存后等待多久没有新的改动才开始转换（秒）
+DEFAULT_DEBOUNCE = 1.0
+# 未安装 watchdog 时检查文件状态的间隔（秒）
+DEFAULT_POLL_INTERVAL = 1.0
+# 等待文件事件时每次最多阻塞的时间（秒）：Windows 上没有超时的等待不能被 Ctrl+C 打断
+WAIT_INTERVAL = 0.5
+# 触发重新检查的文件事件
+WATCHED_EVENTS = ("created", "modified", "moved", "deleted")
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """文件事件处理：Word文档或目录改变时置位事件"""
+
+    def __init__(self, changed: threading.Event):
+        super().__init__()
+        self.changed = changed
+
+    def on_any_event(self, event):
+        if event.event_type not in WATCHED_EVENTS:
+            return
+        # Word保存时先写临时文件再改名，改名的目标才是文档
+        paths = (event.src_path, getattr(event, "dest_path", "") or "")
+        if event.is_directory or any(BatchConverter._is_docx(os.fsdecode(path)) for path in paths):
+            self.changed.set()
+
+
+class DocumentWatcher:
+    """监视模式：文档保存后自动重新转换
+
+    监视单个文件或目录树，连续多次保存合并为一次转换，忽略Word的 ~$ 锁文件；
+    只重新转换修改时间或大小改变的文档，并以增量方式转换，内容未改变的章节直接复用上一次的输出；
+    转换失败的文档在下一次检查时重新尝试。安装了 watchdog 时等待系统的文件事件，否则定时检查文件状态。
+    调用 stop 后监视在 WAIT_INTERVAL 秒内结束。
+    """
+
+    def __init__(self, specs: Iterable[str], output: str, code_language: str = "", engine: str = "docx",
+                 use_cache: bool = True, workers: int = 1, debounce: float = DEFAULT_DEBOUNCE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        初始化监视器
+
+        Args:
+            specs: 监视的输入项（.docx 文件、目录或通配符）
+            output: 输出路径，监视单个文件时可为 .md 文件，否则为输出根目录
+            code_language: 代码块语言标识
+            engine: 解析引擎
+            use_cache: 是否使用章节索引缓存
+            workers: 生成Markdown的进程数
+            debounce: 最后一次改动后等待的秒数
+            poll_interval: 未安装 watchdog 时检查文件状态的间隔（秒）
+        """
+        self.specs = list(specs)
+        self.output = output
+        self.engine = engine
+        self.workers = workers
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.batch = BatchConverter(code_language, workers=1, engine=engine, use_cache=use_cache,
+                                    incremental=True)
+        # 转换器在整个监视过程中复用，避免每次转换重新导入和初始化
+        self.converter = Word2MarkdownConverter(code_language, use_cache=use_cache)
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._states: Dict[str, Tuple[int, int]] = {}
+
+    def collect_targets(self) -> Dict[str, str]:
+        """
+        收集当前需要转换的文档
+
+        Returns:
+            文档路径 -> 输出Markdown路径
+        """
+        if (len(self.specs) == 1 and os.path.isfile(self.specs[0])
+                and self.output.lower().endswith(".md")):
+            return {self.specs[0]: self.output}
+        return {task["input"]: task["output"] for task in self.batch.collect_tasks(self.specs, self.output)}
+
+    def _watch_dirs(self) -> List[Tuple[str, bool]]:
+        """需要监视的目录及是否递归"""
+        dirs = []
+        for spec in self.specs:
+            if os.path.isdir(spec):
+                dirs.append((spec, True))
+            elif any(c in spec for c in GLOB_CHARS):
+                prefix = spec[:min(spec.index(c) for c in GLOB_CHARS if c in spec)]
+                dirs.append((os.path.dirname(prefix) or ".", "**" in spec))
+            else:
+                dirs.append((os.path.dirname(spec) or ".", False))
+        return dirs
+
+    @staticmethod
+    def _file_state(path: str) -> Optional[Tuple[int, int]]:
+        """文件的 (修改时间, 大小)，文件不存在时为None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _snapshot(self, targets: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+        """记录所有文档的当前状态"""
+        snapshot = {}
+        for path in targets:
+            state = self._file_state(path)
+            if state is not None:
+                snapshot[path] = state
+        return snapshot
+
+    def _convert(self, docx_path: str, output_md_path: str) -> bool:
+        """增量转换单个文档，返回是否成功"""
+        print(f"\n🔄 {docx_path}")
+        os.makedirs(os.path.dirname(os.path.abspath(output_md_path)), exist_ok=True)
+        stats = self.converter.convert(docx_path, output_md_path, engine=self.engine, interactive=False,
+                                       workers=self.workers, incremental=True)
+        if stats:
+            print(f"⏱️ 耗时 {stats.duration:.2f}s")
+        return bool(stats)
+
+    def convert_changed(self) -> int:
+        """
+        转换新增或改变的文档
+
+        只有转换成功的文档才记录其当前状态，转换失败（例如文件还没写完）的文档在下一次检查时重新尝试。
+
+        Returns:
+            尝试转换的文档数
+        """
+        targets = self.collect_targets()
+        snapshot = self._snapshot(targets)
+        changed = [path for path, state in snapshot.items() if self._states.get(path) != state]
+        for path in sorted(set(self._states) - set(snapshot)):
+            print(f"\n🗑️ 文档已删除：{path}（保留原有输出）")
+            del self._states[path]
+
+        for path in changed:
+            if self._convert(path, targets[path]):
+                self._states[path] = snapshot[path]
+            else:
+                self._states.pop(path, None)
+        return len(changed)
+
+    def stop(self):
+        """停止监视（可以在其他线程或信号处理函数中调用）"""
+        self._stopped.set()
+
+    def _start_observer(self):
+        """启动 watchdog 的文件事件监视，未安装时返回None"""
+        if Observer is None:
+            return None
+        observer = Observer()
+        handler = _ChangeHandler(self._changed)
+        for directory, recursive in self._watch_dirs():
+            if os.path.isdir(directory):
+                observer.schedule(handler, directory, recursive=recursive)
+        observer.start()
+        return observer
+
+    def _wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        等待事件置位，最多等待 timeout 秒
+
+        每次最多阻塞 WAIT_INTERVAL 秒，使 Ctrl+C 能及时生效；停止监视时提前返回。
+
+        Returns:
+            事件是否已置位
+        """
+        deadline = time.monotonic() + timeout
+        while not self._stopped.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if event.wait(min(remaining, WAIT_INTERVAL)):
+                return True
+        return False
+
+    def _wait_for_change(self, observer) -> bool:
+        """等待可能的改动；返回False时表示没有改动，需要继续等待"""
+        if observer is not None:
+            return self._changed.wait(WAIT_INTERVAL)
+        self._wait(self._stopped, self.poll_interval)
+        return self._snapshot(self.collect_targets()) != self._states
+
+    def _wait_quiet(self, observer):
+        """等待连续的保存结束，直到 debounce 秒内没有新的改动"""
+        if observer is not None:
+            while not self._stopped.is_set():
+                self._changed.clear()
+                if not self._wait(self._changed, self.debounce):
+                    return
+            return
+        snapshot = self._snapshot(self.collect_targets())
+        while not self._stopped.is_set():
+            self._wait(self._stopped, self.debounce)
+            latest = self._snapshot(self.collect_targets())
+            if latest == snapshot:
+                return
+            snapshot = latest
+
+    def run(self):
+        """先转换全部文档，然后持续监视，直到按下 Ctrl+C、收到 SIGTERM 或调用 stop"""
+        # 只有主线程可以设置信号处理函数
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        if not self.convert_changed():
+            print("暂时没有找到 .docx 文件，新增的文档会自动转换")
+
+        observer = self._start_observer()
+        mode = "文件事件" if observer is not None else f"每 {self.poll_interval}s 检查一次文件状态"
+        print(f"\n👀 正在监视 {', '.join(self.specs)}（{mode}），按 Ctrl+C 停止")
+        try:
+            while not self._stopped.is_set():
+                if not self._wait_for_change(observer):
+                    continue
+                self._wait_quiet(observer)
+                if not self._stopped.is_set():
+                    self.convert_changed()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("\n已停止监视")
+            if observer is not None:
+                observer.stop()
+                observer.join()
@@ -1,72 +1,525 @@
+import contextlib
+import io
 import os
+import sys
+import threading
 
 from converters import MarkdownConverter
-from generators import MarkdownGenerator
-from processors import ImageProcessor
+from converters.conversion_result import IMAGE_LINK_DIR, ConversionResult
+from converters.conversion_stats import ConversionStats
+from converters.section_manifest import SectionManifest
+from generators import ArchiveWriter, MarkdownGenerator, MarkdownWriter
+from generators.archive_writer import detect_archive_format, strip_archive_extension
+from generators.split_writer import DEFAULT_INDEX_NAME, SplitWriter
+from generators.markdown_writer import WRITE_BUFFER_SIZE
+from processors import ImageProcessor, BackgroundImageWriter
 from selector import SectionSelector
-from parsers import WordDocumentParser
-from typing import List, Optional, Set, Union
+from parsers import WordDocumentParser, StreamingDocumentParser, ParseCache
+from parsers.package_reader import source_name
+from parsers.section import Section
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+
+PARSER_ENGINES = {
+    "docx": WordDocumentParser,
+    "stream": StreamingDocumentParser,
+}
+
+# 输出路径为该值时输出到标准输出
+STDOUT_PATH = "-"
+
+
+class ConversionCancelled(Exception):
+    """转换被取消"""
 
 
 class Word2MarkdownConverter:
     """Word到Markdown转换器主类"""
 
-    def __init__(self, code_language: str = ""):
+    def __init__(self, code_language: str = "", use_cache: bool = True, track_memory: bool = False,
+                 stats_hook: Optional[Callable[[ConversionStats], None]] = None,
+                 progress_hook: Optional[Callable[[str, int, int], None]] = None,
+                 relative_image_links: bool = False):
         """
         初始化转换器
 
         Args:
             code_language: 代码块语言标识
+            use_cache: 是否使用章节索引的磁盘缓存
+            track_memory: 是否在统计结果中记录各阶段的峰值内存（会拖慢转换）
+            stats_hook: 每次转换结束（无论成功与否）后以统计结果调用的回调，可用于上报监控指标
+            progress_hook: 进度回调，参数为 (类型, 已完成数, 总数)：("sections", 已写出章节数, 选中章节数)
+                或 ("images", 已写入图片数, 已提交图片数)；图片进度在后台写入线程中回调
+            relative_image_links: Markdown中是否以相对输出文件的路径引用图片，便于移动或打包输出目录
         """
         self.converter = MarkdownConverter(code_language)
         self.selector = SectionSelector()
+        self.cache = ParseCache(enabled=use_cache)
+        self.track_memory = track_memory
+        self.stats_hook = stats_hook
+        self.progress_hook = progress_hook
+        self.relative_image_links = relative_image_links
+
+    def _report_progress(self, kind: str, done: int, total: int):
+        """报告进度"""
+        if self.progress_hook is not None:
+            self.progress_hook(kind, done, total)
+
+    def _finish_stats(self, stats: ConversionStats, success: bool, error: Optional[str] = None,
+                      cancelled: bool = False) -> ConversionStats:
+        """结束统计并调用回调，回调出错不影响转换结果"""
+        stats.finish(success, error, cancelled)
+        if self.stats_hook is not None:
+            try:
+                self.stats_hook(stats)
+            except Exception as e:
+                print(f"统计回调出错：{e}")
+        return stats
+
+    def _run_conversion(self, stats: ConversionStats, convert: Callable[[], bool],
+                        quiet: bool = False) -> ConversionStats:
+        """
+        执行一次转换并结束统计
+
+        所有公开的转换方法（包括 convert_document）都经由这里调用 _convert 或 _convert_split，
+        共用取消、出错和统计的处理。文件、流、归档和拆分输出不建立在 convert_document 之上：
+        它把整个Markdown保存在内存中、图片只记录不写入，也不支持交互式选择和增量转换。
+
+        Args:
+            stats: 本次转换的统计结果
+            convert: 执行转换的函数，返回是否选中了章节，出错时直接抛出异常
+            quiet: 取消或出错时是否不输出提示（原因仍记录在统计结果中）
+
+        Returns:
+            结束后的统计结果
+        """
+        try:
+            success = convert()
+        except ConversionCancelled:
+            if not quiet:
+                print("转换已取消")
+            return self._finish_stats(stats, False, "已取消", cancelled=True)
+        except Exception as e:
+            if not quiet:
+                print(f"转换过程中发生错误：{e}")
+            return self._finish_stats(stats, False, f"{type(e).__name__}: {e}")
+        return self._finish_stats(stats, success, None if success else "没有选择任何章节")
 
-    def convert(self, docx_path: str, output_md_path: str,
-                section_range: Optional[Union[Set[int], List[int]]] = None) -> bool:
+    def convert(self, docx_path, output_md_path: str,
+                section_range: Optional[Union[Set[int], List[int]]] = None,
+                engine: str = "docx", interactive: bool = True,
+                image_dir: Optional[str] = None, workers: int = 1,
+                incremental: bool = False, parser=None,
+                cancel_event: Optional[threading.Event] = None) -> ConversionStats:
         """
         执行转换
 
         Args:
-            docx_path: 输入Word文档路径
-            output_md_path: 输出Markdown文件路径
+            docx_path: 输入Word文档路径（也可以是文件内容或二进制文件对象）
+            output_md_path: 输出Markdown文件路径，为 "-" 时输出到标准输出
             section_range: 要转换的章节范围（可选）
+            engine: 解析引擎，"docx" 为 python-docx 完整解析，"stream" 为流式解析
+            interactive: 未指定 section_range 时是否交互式选择，为False时转换全部章节
+            image_dir: 图片输出目录（可选，默认为输出目录下的 images）
+            workers: 生成Markdown的进程数，大于1时各章节并行生成
+            incremental: 是否增量转换，内容未改变的章节直接复用上一次的输出
+            parser: 已扫描好章节的文档解析器（可选），提供时不再重新解析
+            cancel_event: 取消事件（可选），置位后在下一个章节开始前停止转换，不写出输出文件
 
         Returns:
-            转换是否成功
+            转换的统计结果，可直接作为布尔值表示转换是否成功
         """
-        try:
-            # 解析文档
-            parser = WordDocumentParser(docx_path)
+        if output_md_path == STDOUT_PATH:
+            return self.convert_to_stream(docx_path, sys.stdout, section_range, engine,
+                                          interactive, image_dir, workers, parser, cancel_event)
+        stats = ConversionStats(source_name(docx_path), output_md_path, self.track_memory)
+        return self._run_conversion(stats, lambda: self._convert(
+            docx_path, output_md_path, section_range, engine, interactive, image_dir, workers, incremental,
+            stats=stats, parser=parser, cancel_event=cancel_event
+        ))
+
+    def convert_to_stream(self, docx_path, stream,
+                          section_range: Optional[Union[Set[int], List[int]]] = None,
+                          engine: str = "docx", interactive: bool = False,
+                          image_dir: Optional[str] = None, workers: int = 1, parser=None,
+                          cancel_event: Optional[threading.Event] = None) -> ConversionStats:
+        """
+        执行转换，Markdown边生成边写入给定的流
+
+        输出到标准输出时，提示信息改为输出到标准错误，标准输出中只有Markdown。
+
+        Args:
+            docx_path: 输入Word文档路径（也可以是文件内容或二进制文件对象）
+            stream: 输出流，二进制流或文本流均可
+            section_range: 要转换的章节范围（可选）
+            engine: 解析引擎
+            interactive: 未指定 section_range 时是否交互式选择，为False时转换全部章节
+            image_dir: 图片输出目录（可选，默认为当前目录下的 images）
+            workers: 生成Markdown的进程数
+            parser: 已扫描好章节的文档解析器（可选）
+            cancel_event: 取消事件（可选）
+
+        Returns:
+            转换的统计结果，可直接作为布尔值表示转换是否成功
+        """
+        to_stdout = stream in (sys.stdout, getattr(sys.stdout, "buffer", None))
+        stats = ConversionStats(source_name(docx_path), None, self.track_memory)
+        with contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext():
+            return self._run_conversion(stats, lambda: self._convert(
+                docx_path, None, section_range, engine, interactive, image_dir, workers,
+                stream=stream, stats=stats, parser=parser, cancel_event=cancel_event
+            ))
+
+    def convert_document(self, source, section_range: Optional[Union[Set[int], List[int]]] = None,
+                         engine: str = "docx", parser=None,
+                         cancel_event: Optional[threading.Event] = None) -> ConversionResult:
+        """
+        在内存中执行转换，不读写任何文件
+
+        与其他转换方法共用同一个转换流程，只是Markdown写入内存、图片只记录不写入，适合服务等整体处理结果的场景；
+        大文档需要边生成边输出时使用 convert_to_stream 或 convert_to_archive。
+
+        Args:
+            source: Word文档的内容（bytes）、二进制文件对象或文件路径
+            section_range: 要转换的章节范围（可选，默认全部章节）
+            engine: 解析引擎
+            parser: 已扫描好章节的文档解析器（可选）
+            cancel_event: 取消事件（可选）
+
+        Returns:
+            转换结果：Markdown文本（以 images/文件名 引用图片）、图片文件名 -> 按需读取的图片部件和转换统计
+        """
+        stats = ConversionStats(source_name(source), None, self.track_memory)
+        stream = io.BytesIO()
+        images: Dict[str, Any] = {}
+        self._run_conversion(stats, lambda: self._convert(
+            source, None, section_range, engine, False, None, stream=stream, stats=stats, parser=parser,
+            cancel_event=cancel_event, images=images, quiet=True
+        ), quiet=True)
+        if not stats:
+            return ConversionResult("", {}, stats)
+        return ConversionResult(stream.getvalue().decode("utf-8"), images, stats)
+
+    def convert_to_archive(self, docx_path, archive_path: str,
+                           section_range: Optional[Union[Set[int], List[int]]] = None,
+                           engine: str = "docx", interactive: bool = False,
+                           archive_format: Optional[str] = None, name: Optional[str] = None,
+                           workers: int = 1, parser=None,
+                           cancel_event: Optional[threading.Event] = None) -> ConversionStats:
+        """
+        执行转换，Markdown和图片直接写入单个zip或tar归档，不在磁盘上生成中间文件
+
+        归档中Markdown位于根目录，图片位于 images 目录并以相对路径引用。
+        写入文件时先写临时文件，成功后再替换；输出到标准输出时提示信息改为输出到标准错误。
+
+        Args:
+            docx_path: 输入Word文档路径（也可以是文件内容或二进制文件对象）
+            archive_path: 归档文件路径，为 "-" 时输出到标准输出
+            section_range: 要转换的章节范围（可选）
+            engine: 解析引擎
+            interactive: 未指定 section_range 时是否交互式选择，为False时转换全部章节
+            archive_format: 归档格式（zip、tar 或 tar.gz），默认根据扩展名识别，标准输出默认为 zip
+            name: 归档中Markdown的文件名（不含扩展名），默认与归档文件同名，输出到标准输出时与文档同名
+            workers: 生成Markdown的进程数
+            parser: 已扫描好章节的文档解析器（可选）
+            cancel_event: 取消事件（可选）
+
+        Returns:
+            转换的统计结果，可直接作为布尔值表示转换是否成功
+        """
+        to_stdout = archive_path == STDOUT_PATH
+        archive_format = archive_format or detect_archive_format(archive_path) or "zip"
+        if name is None and not to_stdout:
+            name = os.path.basename(strip_archive_extension(archive_path))
+        elif name is None:
+            name = os.path.splitext(os.path.basename(docx_path))[0] \
+                if isinstance(docx_path, (str, os.PathLike)) else "document"
 
-            # 选择章节
-            if section_range is None:
+        stats = ConversionStats(source_name(docx_path), archive_path, self.track_memory)
+        tmp_path = None if to_stdout else f"{archive_path}.{os.getpid()}.tmp"
+        # 在提示信息重定向之前取得标准输出
+        target = sys.stdout.buffer if to_stdout else tmp_path
+        images: Dict[str, Any] = {}
+
+        def write_archive() -> bool:
+            with ArchiveWriter(target, archive_format) as archive:
+                with archive.open_member(f"{name}.md") as stream:
+                    success = self._convert(docx_path, None, section_range, engine, interactive,
+                                            None, workers, stream=stream, stats=stats, parser=parser,
+                                            cancel_event=cancel_event, images=images)
+                if success:
+                    with stats.stage("image_write"):
+                        for image_name in sorted(images):
+                            archive.add_part(f"{IMAGE_LINK_DIR}/{image_name}", images[image_name])
+            if success and tmp_path is not None:
+                os.replace(tmp_path, archive_path)
+                print(f"📦 归档文件：{archive_path}")
+            return success
+
+        with contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext():
+            try:
+                return self._run_conversion(stats, write_archive)
+            finally:
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def convert_split(self, docx_path, output_dir: str,
+                      section_range: Optional[Union[Set[int], List[int]]] = None,
+                      engine: str = "docx", interactive: bool = False, split_level: int = 1,
+                      filename_template: Optional[str] = None, index_name: str = DEFAULT_INDEX_NAME,
+                      image_dir: Optional[str] = None, workers: int = 1, parser=None,
+                      cancel_event: Optional[threading.Event] = None) -> ConversionStats:
+        """
+        执行转换，每个章节（或每个二级标题）写入单独的Markdown文件，并生成目录文件
+
+        所有文件共用输出目录下的同一个图片目录，以相对路径引用图片；workers 大于1时各组章节在多个进程中
+        并行生成和写入。
+
+        Args:
+            docx_path: 输入Word文档路径（也可以是文件内容或二进制文件对象）
+            output_dir: 输出目录
+            section_range: 要转换的章节范围（可选）
+            engine: 解析引擎
+            interactive: 未指定 section_range 时是否交互式选择，为False时转换全部章节
+            split_level: 拆分的标题级别，1 为每个章节一个文件，2 为每个二级标题一个文件
+            filename_template: 文件名模板（可选），可用字段 {index}、{part}、{title}
+            index_name: 目录文件名
+            image_dir: 图片输出目录（可选，默认为输出目录下的 images）
+            workers: 生成和写入文件的进程数
+            parser: 已扫描好章节的文档解析器（可选）
+            cancel_event: 取消事件（可选），并行时在每组章节之间检查
+
+        Returns:
+            转换的统计结果，可直接作为布尔值表示转换是否成功
+        """
+        stats = ConversionStats(source_name(docx_path), output_dir, self.track_memory)
+        return self._run_conversion(stats, lambda: self._convert_split(
+            docx_path, SplitWriter(output_dir, split_level, filename_template, index_name), section_range,
+            engine, interactive, image_dir, workers, stats, parser, cancel_event
+        ))
+
+    def _select_sections(self, docx_path, section_range: Optional[Union[Set[int], List[int]]],
+                         engine: str, interactive: bool, stats: ConversionStats,
+                         parser=None, fingerprints: bool = False) -> Tuple[Any, List[Section]]:
+        """扫描章节标题（未提供 parser 时，fingerprints 为是否计算章节指纹）并选择章节，返回 (解析器, 选中的章节)"""
+        if parser is None:
+            with stats.stage("parse"):
+                parser = PARSER_ENGINES[engine](docx_path, cache=self.cache, fingerprints=fingerprints)
+
+        with stats.stage("select"):
+            if section_range is not None:
+                selected_sections = self.selector.select_sections_by_range(parser, section_range)
+            elif interactive:
                 selected_sections = self.selector.select_sections_interactive(parser)
             else:
-                selected_sections = self.selector.select_sections_by_range(parser, section_range)
+                # 与交互式选择一致，第一个一级标题之前的内容（章节 0）不转换
+                selected_sections = [sec for sec in parser.get_sections() if sec.index > 0]
+        return parser, selected_sections
 
-            if not selected_sections:
-                print("没有选择任何章节")
-                return False
+    def _convert_split(self, docx_path, split_writer: SplitWriter,
+                       section_range: Optional[Union[Set[int], List[int]]], engine: str, interactive: bool,
+                       image_dir: Optional[str], workers: int, stats: ConversionStats, parser=None,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        执行拆分输出的转换，出错时直接抛出异常
 
-            # 准备输出目录和图片处理器
-            output_dir = os.path.dirname(os.path.abspath(output_md_path))
-            image_processor = ImageProcessor(output_dir)
+        Raises:
+            ConversionCancelled: cancel_event 被置位
+        """
+        parser, selected_sections = self._select_sections(docx_path, section_range, engine, interactive,
+                                                          stats, parser)
+        if not selected_sections:
+            print("没有选择任何章节")
+            return False
 
-            # 生成Markdown
+        output_dir = split_writer.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        entries: List[Dict[str, Any]] = []
+        with BackgroundImageWriter(on_written=lambda done, total: self._report_progress("images", done, total)
+                                   ) as image_writer:
+            image_processor = ImageProcessor(output_dir, image_dir, image_writer, relative_links=True)
             generator = MarkdownGenerator(self.converter, image_processor)
-            markdown_lines = generator.generate_markdown_for_sections(
-                selected_sections, parser.document
-            )
+            try:
+                with stats.stage("generate"):
+                    written = generator.write_split(selected_sections, parser, split_writer, workers)
+                    for done, (_, section_entries) in enumerate(written, 1):
+                        entries.extend(section_entries)
+                        self._report_progress("sections", done, len(selected_sections))
+                        if cancel_event is not None and cancel_event.is_set():
+                            written.close()
+                            raise ConversionCancelled()
+            finally:
+                stats.counters.update(generator.counters)
 
-            # 写入文件
-            with open(output_md_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(markdown_lines))
+            with stats.stage("image_write"):
+                image_processor.flush()
+            with stats.stage("file_write"):
+                index_path = split_writer.write_index(entries, self._document_title(docx_path))
 
-            print(f"\n✅ 转换完成：{output_md_path}")
-            print(f"🖼️ 图片输出目录：{image_processor.image_dir}")
+        images = [image for refs in image_processor.section_images.values() for image in refs]
+        stats.count("images", len(images))
+        stats.count("image_files", len({image["name"] for image in images}))
+        stats.count("files", len(entries))
+        stats.count("bytes_written", sum(entry["bytes"] for entry in entries))
 
-            return True
+        print(f"\n✅ 转换完成：{len(entries)} 个文件，目录 {index_path}")
+        print(f"🖼️ 图片输出目录：{image_processor.image_dir}")
+        return True
 
-        except Exception as e:
-            print(f"转换过程中发生错误：{e}")
-            return False
\ No newline at end of file
+    @staticmethod
+    def _document_title(docx_path) -> str:
+        """目录文件的标题：文档文件名，内存中的文档为“目录”"""
+        name = source_name(docx_path)
+        return "目录" if name == "<内存>" else os.path.splitext(os.path.basename(name))[0]
+
+    def _convert(self, docx_path, output_md_path: Optional[str],
+                 section_range: Optional[Union[Set[int], List[int]]],
+                 engine: str, interactive: bool, image_dir: Optional[str],
+                 workers: int = 1, incremental: bool = False, stream=None,
+                 stats: Optional[ConversionStats] = None, parser=None,
+                 cancel_event: Optional[threading.Event] = None,
+                 images: Optional[Dict[str, Any]] = None, quiet: bool = False) -> bool:
+        """
+        执行转换，出错时直接抛出异常；提供 stream 时写入该流而不是 output_md_path
+
+        文件、流和内存三种输出共用这一流程，只是写入Markdown和图片的目标不同：
+        提供 images 时图片只记录到该字典中，不写入磁盘；quiet 为True时不输出任何提示。
+        各阶段的耗时和计数记录到 stats 中；提供 parser 时直接使用其章节索引。
+
+        Raises:
+            ConversionCancelled: cancel_event 被置位
+        """
+        if stats is None:
+            stats = ConversionStats(source_name(docx_path), output_md_path)
+
+        parser, selected_sections = self._select_sections(docx_path, section_range, engine, interactive,
+                                                          stats, parser, fingerprints=incremental)
+        if not selected_sections:
+            if not quiet:
+                print("没有选择任何章节")
+            return False
+
+        # 准备输出目录和图片处理器，图片在后台写入；输出到内存时图片以相对路径引用
+        output_dir = os.path.dirname(os.path.abspath(output_md_path)) if output_md_path else os.getcwd()
+        with BackgroundImageWriter(on_written=lambda done, total: self._report_progress("images", done, total)
+                                   ) as image_writer:
+            if images is not None:
+                image_processor = ImageProcessor(os.curdir, IMAGE_LINK_DIR, relative_links=True, images=images)
+            else:
+                image_processor = ImageProcessor(output_dir, image_dir, image_writer, self.relative_image_links)
+
+            if stream is not None:
+                writer = MarkdownWriter(stream, autoflush=True)
+                with stats.stage("generate"):
+                    self._write_markdown(writer, parser, selected_sections, image_processor,
+                                         workers, stats=stats, cancel_event=cancel_event)
+                with stats.stage("image_write"):
+                    image_processor.flush()
+                with stats.stage("file_write"):
+                    writer.flush()
+                self._count_output(stats, writer, image_processor)
+                if not quiet:
+                    print("\n✅ 转换完成")
+                if images is None:
+                    print(f"🖼️ 图片输出目录：{image_processor.image_dir}")
+                return True
+
+            # 增量转换时找出可以复用上一次输出的章节
+            manifest = None
+            reused = set()
+            if incremental:
+                with stats.stage("select"):
+                    manifest = SectionManifest(output_md_path, {
+                        "code_language": self.converter.code_language,
+                        "image_dir": image_processor.image_dir,
+                        "image_link_dir": image_processor.link_dir,
+                        "shared_parts": parser.get_shared_fingerprint()
+                    })
+                    reused = manifest.reusable_sections(
+                        selected_sections, parser.get_image_parts(), image_processor.image_dir
+                    )
+
+            # 先写入临时文件，全部成功后再替换输出文件
+            tmp_path = f"{output_md_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                    writer = MarkdownWriter(f)
+                    with stats.stage("generate"):
+                        self._write_markdown(writer, parser, selected_sections, image_processor,
+                                             workers, manifest, reused, stats, cancel_event)
+                    with stats.stage("file_write"):
+                        writer.flush()
+
+                # 确认所有图片都已写入
+                with stats.stage("image_write"):
+                    image_processor.flush()
+                with stats.stage("file_write"):
+                    os.replace(tmp_path, output_md_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        self._count_output(stats, writer, image_processor)
+        if manifest is not None:
+            with stats.stage("file_write"):
+                manifest.save(selected_sections, writer.spans, writer.output_hash,
+                              image_processor.section_images, reused)
+            stats.count("reused_sections", len(reused))
+            print(f"♻️ 复用 {len(reused)} 个章节，重新生成 {len(selected_sections) - len(reused)} 个章节")
+
+        print(f"\n✅ 转换完成：{output_md_path}")
+        print(f"🖼️ 图片输出目录：{image_processor.image_dir}")
+
+        return True
+
+    def _write_markdown(self, writer: MarkdownWriter, parser, selected_sections: List[Section],
+                        image_processor: ImageProcessor, workers: int,
+                        manifest: Optional[SectionManifest] = None, reused: Set[int] = frozenset(),
+                        stats: Optional[ConversionStats] = None,
+                        cancel_event: Optional[threading.Event] = None):
+        """
+        按文档顺序生成选中章节的Markdown并逐个章节写出
+
+        Args:
+            writer: Markdown写入器
+            parser: 文档解析器
+            selected_sections: 选中的章节
+            image_processor: 图片处理器
+            workers: 生成Markdown的进程数
+            manifest: 增量转换清单（可选）
+            reused: 直接复用上一次输出的章节索引
+            stats: 统计结果（可选），累加生成的章节、段落、表格和run数量
+            cancel_event: 取消事件（可选），每个章节开始前检查
+
+        Raises:
+            ConversionCancelled: cancel_event 被置位
+        """
+        # 只加载需要重新生成的章节的内容
+        pending_sections = [sec for sec in selected_sections if sec.index not in reused]
+        generator = MarkdownGenerator(self.converter, image_processor)
+        if workers > 1:
+            rendered = generator.iter_markdown_parallel(pending_sections, parser, workers)
+        else:
+            rendered = generator.iter_markdown(parser.iter_sections(pending_sections), parser)
+
+        try:
+            for done, sec in enumerate(selected_sections, 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ConversionCancelled()
+                if sec.index in reused:
+                    writer.write_section(sec.index, [manifest.read_section(sec.index)])
+                else:
+                    writer.write_section(*next(rendered))
+                self._report_progress("sections", done, len(selected_sections))
+        finally:
+            rendered.close()
+            if stats is not None:
+                stats.counters.update(generator.counters)
+
+    @staticmethod
+    def _count_output(stats: ConversionStats, writer: MarkdownWriter, image_processor: ImageProcessor):
+        """记录输出的字节数和图片数量"""
+        images = [image for refs in image_processor.section_images.values() for image in refs]
+        stats.count("images", len(images))
+        stats.count("image_files", len({image["name"] for image in images}))
+        stats.count("bytes_written", writer.position)
\ No newline at end of file
@@ -1,5 +1,25 @@
-from .markdown_generator import MarkdownGenerator
+import importlib
+
+# 导出名称 -> 所在子模块，首次访问时才导入（PEP 562），导入包本身不会加载 python-docx 等依赖
+_EXPORTS = {
+    'MarkdownGenerator': 'markdown_generator',
+    'MarkdownWriter': 'markdown_writer',
+    'ArchiveWriter': 'archive_writer',
+    'SplitWriter': 'split_writer'
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
-    'MarkdownGenerator'
+    'MarkdownGenerator',
+    'MarkdownWriter',
+    'ArchiveWriter',
+    'SplitWriter'
 ]
\ No newline at end of file
@@ -0,0 +1,170 @@
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+from processors.image_writer import COPY_CHUNK_SIZE
+
+# 归档格式 -> 文件扩展名
+ARCHIVE_FORMATS = {
+    "zip": (".zip",),
+    "tar": (".tar",),
+    "tar.gz": (".tar.gz", ".tgz"),
+}
+# tar 使用 "|" 流模式，只顺序写入，可以直接写到管道
+TAR_MODES = {"tar": "w|", "tar.gz": "w|gz"}
+# tar 成员（如Markdown）生成时在内存中保留的最大字节数，超过后转存到临时文件
+TAR_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def detect_archive_format(path: str) -> Optional[str]:
+    """
+    根据文件扩展名识别归档格式
+
+    Args:
+        path: 归档文件路径
+
+    Returns:
+        归档格式（zip、tar 或 tar.gz），不是归档文件时为None
+    """
+    lower = path.lower()
+    for archive_format, extensions in ARCHIVE_FORMATS.items():
+        if lower.endswith(extensions):
+            return archive_format
+    return None
+
+
+def strip_archive_extension(path: str) -> str:
+    """去掉路径中归档格式的扩展名"""
+    archive_format = detect_archive_format(path)
+    if archive_format is None:
+        return os.path.splitext(path)[0]
+    extension = next(ext for ext in ARCHIVE_FORMATS[archive_format] if path.lower().endswith(ext))
+    return path[:-len(extension)]
+
+
+class ArchiveWriter:
+    """把Markdown和图片直接写入单个zip或tar归档
+
+    成员按顺序流式写入归档，不在磁盘上生成中间文件：zip中的成员边生成边压缩写入；
+    tar的成员头部需要事先知道大小，Markdown先写入临时文件（不超过 TAR_SPOOL_SIZE 时留在内存中），
+    图片按zip目录中记录的大小直接复制。
+    输出目标可以是文件路径、"-"（标准输出）或二进制流，标准输出和管道等不可定位的流同样支持。
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], archive_format: str = "zip"):
+        """
+        初始化归档写入器
+
+        Args:
+            target: 归档文件路径、"-"（标准输出）或可写的二进制流
+            archive_format: 归档格式，zip、tar 或 tar.gz
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"不支持的归档格式：{archive_format}")
+        self.archive_format = archive_format
+        self._owns_stream = isinstance(target, str) and target != "-"
+        if target == "-":
+            self._stream = sys.stdout.buffer
+        elif self._owns_stream:
+            self._stream = open(target, "wb")
+        else:
+            self._stream = target
+
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(self._stream, "w")
+            self._tar = None
+        else:
+            self._zip = None
+            self._tar = tarfile.open(fileobj=self._stream, mode=TAR_MODES[archive_format])
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _zip_info(self, name: str, compress_type: int) -> zipfile.ZipInfo:
+        """创建zip成员信息"""
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = compress_type
+        info.external_attr = 0o644 << 16
+        return info
+
+    def _tar_info(self, name: str, size: int) -> tarfile.TarInfo:
+        """创建tar成员信息"""
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        return info
+
+    @contextmanager
+    def open_member(self, name: str) -> Iterator[BinaryIO]:
+        """
+        以流的方式写入一个压缩的成员（如Markdown），退出上下文时写入完成
+
+        Args:
+            name: 成员在归档中的路径
+        """
+        if self._zip is not None:
+            with self._zip.open(self._zip_info(name, zipfile.ZIP_DEFLATED), "w") as stream:
+                yield stream
+            return
+
+        with tempfile.SpooledTemporaryFile(TAR_SPOOL_SIZE) as buffer:
+            yield buffer
+            size = buffer.tell()
+            buffer.seek(0)
+            self._tar.addfile(self._tar_info(name, size), buffer)
+
+    def write_bytes(self, name: str, data: bytes):
+        """
+        写入内存中的成员
+
+        Args:
+            name: 成员在归档中的路径
+            data: 成员内容
+        """
+        with self.open_member(name) as stream:
+            stream.write(data)
+
+    def add_part(self, name: str, part):
+        """
+        把图片部件从 .docx 包中按块复制到归档，图片本身已压缩，zip中不再压缩
+
+        Args:
+            name: 成员在归档中的路径
+            part: 图片部件（ZipPart）
+        """
+        if self._zip is not None:
+            info = self._zip_info(name, zipfile.ZIP_STORED)
+            with part.open() as source, self._zip.open(info, "w", force_zip64=part.size > zipfile.ZIP64_LIMIT) as f:
+                shutil.copyfileobj(source, f, COPY_CHUNK_SIZE)
+            return
+
+        if part.size < 0:
+            data = part.blob
+            self._tar.addfile(self._tar_info(name, len(data)), io.BytesIO(data))
+            return
+        with part.open() as source:
+            self._tar.addfile(self._tar_info(name, part.size), source)
+
+    def close(self):
+        """写入归档的目录（或结束标记）并关闭文件"""
+        try:
+            if self._zip is not None:
+                self._zip.close()
+            else:
+                self._tar.close()
+        finally:
+            if self._owns_stream:
+                self._stream.close()
+            else:
+                self._stream.flush()
@@ -0,0 +1,205 @@
+import re
+from collections import Counter
+from docx.oxml.ns import qn
+from typing import Dict, List, Optional, Tuple
+
+from converters.markdown_converter import URL_PATTERN, escape_link_text
+from processors import ImageProcessor
+
+# 强调格式的顺序和对应的Markdown标记，同时开启时按此顺序嵌套
+EMPHASIS_MARKERS = (("bold", "**"), ("italic", "*"), ("strike", "~~"))
+
+# 视为行内代码的字符样式和等宽字体
+CODE_STYLE_PATTERN = re.compile(r"code", re.IGNORECASE)
+MONOSPACE_FONTS = frozenset({
+    "consolas", "courier", "courier new", "menlo", "monaco", "lucida console",
+    "source code pro", "fira code", "jetbrains mono", "cascadia code", "cascadia mono"
+})
+BACKTICKS_PATTERN = re.compile(r"`+")
+SURROUNDING_SPACE_PATTERN = re.compile(r"^(\s*)(.*?)(\s*)$", re.DOTALL)
+
+TAG_R = qn("w:r")
+TAG_HYPERLINK = qn("w:hyperlink")
+TAG_RPR = qn("w:rPr")
+TAG_RSTYLE = qn("w:rStyle")
+TAG_RFONTS = qn("w:rFonts")
+ATTR_VAL = qn("w:val")
+ATTR_ASCII = qn("w:ascii")
+ATTR_ANCHOR = qn("w:anchor")
+ATTR_RID = qn("r:id")
+TOGGLE_TAGS = {"bold": (qn("w:b"),), "italic": (qn("w:i"),), "strike": (qn("w:strike"), qn("w:dstrike"))}
+FALSE_VALUES = frozenset({"0", "false", "off", "none"})
+
+# (是否加粗, 是否斜体, 是否删除线, 是否行内代码)
+Format = Tuple[bool, bool, bool, bool]
+
+
+class InlineRenderer:
+    """行内格式渲染器
+
+    一次遍历段落中的run和超链接：相邻且格式相同的run先合并为一段，再按格式的变化
+    打开或关闭加粗、斜体、删除线标记；行内代码和超链接整体输出，纯文本中的URL转换为链接。
+    各段文本先收集到列表中，最后只拼接一次。
+    """
+
+    def __init__(self, image_processor: ImageProcessor, counters: Optional[Counter] = None):
+        """
+        初始化行内格式渲染器
+
+        Args:
+            image_processor: 图片处理器
+            counters: 计数器（可选），累加渲染的run数量
+        """
+        self.image_processor = image_processor
+        self.counters = counters if counters is not None else Counter()
+
+    @staticmethod
+    def _is_on(rPr, tags) -> bool:
+        """run属性中的开关格式是否直接开启"""
+        for tag in tags:
+            elem = rPr.find(tag)
+            if elem is not None and elem.get(ATTR_VAL, "true").lower() not in FALSE_VALUES:
+                return True
+        return False
+
+    def _run_format(self, r) -> Format:
+        """读取run的直接格式"""
+        rPr = r.find(TAG_RPR)
+        if rPr is None:
+            return False, False, False, False
+
+        rStyle = rPr.find(TAG_RSTYLE)
+        rFonts = rPr.find(TAG_RFONTS)
+        code = bool(
+            (rStyle is not None and CODE_STYLE_PATTERN.search(rStyle.get(ATTR_VAL, "")))
+            or (rFonts is not None and rFonts.get(ATTR_ASCII, "").lower() in MONOSPACE_FONTS)
+        )
+        return (self._is_on(rPr, TOGGLE_TAGS["bold"]), self._is_on(rPr, TOGGLE_TAGS["italic"]),
+                self._is_on(rPr, TOGGLE_TAGS["strike"]), code)
+
+    def _collect_segments(self, parent, drawings, section_index: int, image_count: int,
+                          hyperlinks: Dict[str, str], image_lines: List[str]) -> Tuple[list, int]:
+        """
+        收集段落（或超链接）中的文本段，相邻且格式相同的run合并为一段，同时输出run中的图片
+
+        Returns:
+            ([(格式, 文本片段列表, 超链接地址)], 更新后的图片计数)
+        """
+        segments = []
+        for child in parent.iterchildren(TAG_R, TAG_HYPERLINK):
+            if child.tag == TAG_HYPERLINK:
+                inner, image_count = self._collect_segments(
+                    child, drawings, section_index, image_count, hyperlinks, image_lines
+                )
+                address = self._hyperlink_address(child, hyperlinks)
+                if address is None:
+                    segments.extend(inner)
+                elif inner:
+                    segments.append((None, inner, address))
+                continue
+
+            self.counters["runs"] += 1
+
+            # 处理图片，按run查段落的图片索引
+            parts = drawings.get(child)
+            if parts:
+                img_lines, image_count = self.image_processor.process_image_parts(
+                    parts, section_index, image_count
+                )
+                image_lines.extend(img_lines)
+
+            text = child.text
+            if not text:
+                continue
+            fmt = self._run_format(child)
+            if segments and segments[-1][0] == fmt and segments[-1][2] is None:
+                segments[-1][1].append(text)
+            else:
+                segments.append((fmt, [text], None))
+        return segments, image_count
+
+    @staticmethod
+    def _hyperlink_address(hyperlink, hyperlinks: Dict[str, str]) -> Optional[str]:
+        """超链接的地址，外部链接加上书签锚点，文档内书签为 #锚点"""
+        anchor = hyperlink.get(ATTR_ANCHOR)
+        rId = hyperlink.get(ATTR_RID)
+        if rId is not None and rId in hyperlinks:
+            return hyperlinks[rId] + (f"#{anchor}" if anchor else "")
+        if anchor:
+            return f"#{anchor}"
+        return None
+
+    @staticmethod
+    def _code_span(text: str) -> str:
+        """生成行内代码，文本中含反引号时使用更长的反引号包围"""
+        longest = max((len(m) for m in BACKTICKS_PATTERN.findall(text)), default=0)
+        fence = "`" * (longest + 1)
+        if longest:
+            return f"{fence} {text} {fence}"
+        return f"{fence}{text}{fence}"
+
+    def _render_segments(self, segments: list, parts: List[str], autolink: bool = True):
+        """按格式的变化输出标记和文本，超链接内的文本不再转换URL，并转义其中的方括号和反斜杠"""
+        stack: List[str] = []
+        pending_space = ""
+
+        for fmt, texts, address in segments:
+            if address is not None:
+                inner: List[str] = []
+                self._render_segments(texts, inner, autolink=False)
+                text = "".join(inner)
+            else:
+                text = "".join(texts)
+            if not text.strip():
+                pending_space += text
+                continue
+            lead, core, trail = SURROUNDING_SPACE_PATTERN.match(text).groups()
+
+            # 关闭不再需要的标记（同时关闭在它之后打开的标记），再打开新的标记
+            wanted = {marker for (_, marker), on in zip(EMPHASIS_MARKERS, fmt or ()) if on}
+            keep = next((i for i, marker in enumerate(stack) if marker not in wanted), len(stack))
+            while len(stack) > keep:
+                parts.append(stack.pop())
+            parts.append(pending_space + lead)
+            for _, marker in EMPHASIS_MARKERS:
+                if marker in wanted and marker not in stack:
+                    parts.append(marker)
+                    stack.append(marker)
+
+            if address is not None:
+                parts.append(f"[{core}]({address})")
+            elif fmt[3]:
+                parts.append(self._code_span(core))
+            elif autolink:
+                parts.append(URL_PATTERN.sub(r"[\1](\1)", core))
+            else:
+                parts.append(escape_link_text(core))
+            pending_space = trail
+
+        while stack:
+            parts.append(stack.pop())
+        parts.append(pending_space)
+
+    def render(self, para, image_parts, section_index: int, image_count: int,
+               hyperlinks: Optional[Dict[str, str]] = None) -> Tuple[str, List[str], int]:
+        """
+        渲染段落的行内内容
+
+        Args:
+            para: 段落对象
+            image_parts: 文档关系中的部件
+            section_index: 章节索引
+            image_count: 图片计数
+            hyperlinks: 超链接关系 rId -> 地址
+
+        Returns:
+            (行内Markdown文本, 图片markdown行列表, 更新后的图片计数)
+        """
+        image_lines: List[str] = []
+        drawings = self.image_processor.index_drawings(para._p, image_parts)
+        segments, image_count = self._collect_segments(
+            para._p, drawings, section_index, image_count, hyperlinks or {}, image_lines
+        )
+        parts: List[str] = []
+        self._render_segments(segments, parts)
+        return "".join(parts), image_lines, image_count
@@ -1,7 +1,15 @@
 from converters import MarkdownConverter
-from processors import ImageProcessor
-from typing import List, Dict, Any, Tuple
-from docx import Document
+from processors import ImageProcessor, BackgroundImageWriter
+from parsers import WordDocumentParser, StreamingDocumentParser
+from parsers.section import Section
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from docx.table import Table
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple, Union
+
+from .inline_renderer import InlineRenderer
+from .split_writer import HeadingEvent, SplitWriter
+from .table_renderer import TableRenderer
 
 
 class MarkdownGenerator:
@@ -17,118 +25,316 @@ class MarkdownGenerator:
         """
         self.converter = converter
         self.image_processor = image_processor
+        # 已生成的章节、段落、表格和run数量
+        self.counters: Counter = Counter()
+        self.inline_renderer = InlineRenderer(image_processor, self.counters)
+        self.table_renderer = TableRenderer(self.inline_renderer)
 
-    def _process_paragraph_runs(self, para, rels, section_index: int,
-                                image_count: int)-> Tuple[str, List[str], int]:
+    def iter_section_lines(self, sec: Section, content: Iterable[Any],
+                           parser: Union[WordDocumentParser, StreamingDocumentParser],
+                           image_parts: Dict[str, Any],
+                           hyperlinks: Optional[Dict[str, str]] = None,
+                           heading_events: bool = False) -> Iterator[Union[str, HeadingEvent]]:
         """
-        处理段落中的runs
+        逐行生成单个章节的Markdown
+
+        每个章节的图片编号和代码块状态相互独立，章节之间可以并行生成。
 
         Args:
-            para: 段落对象
-            rels: 文档关系
-            section_index: 章节索引
-            image_count: 图片计数
+            sec: 章节
+            content: 章节的段落和表格
+            parser: 文档解析器
+            image_parts: 文档关系中的部件
+            hyperlinks: 超链接关系 rId -> 地址（可选，默认从解析器读取）
+            heading_events: 是否在每个二、三级标题行之前产生 HeadingEvent（拆分输出使用）
 
-        Returns:
-            (合并的文本, 图片markdown行列表, 更新后的图片计数)
+        Yields:
+            Markdown行，heading_events 为True时还有标题事件
         """
-        merged_text = ""
-        current_bold = None
-        image_lines = []
+        if hyperlinks is None:
+            hyperlinks = parser.get_hyperlinks()
+        image_count = 1
+        sec_index = sec.index
+        self.counters["sections"] += 1
+        yield f"## {sec.title}"
+
+        in_code_block = False
+
+        for para in content:
+            # 处理表格
+            if isinstance(para, Table):
+                self.counters["tables"] += 1
+                if in_code_block:
+                    yield "```"
+                    in_code_block = False
+                table_lines, image_count = self.table_renderer.render(
+                    para._tbl, image_parts, sec_index, image_count, hyperlinks
+                )
+                yield from table_lines
+                yield ""
+                continue
+
+            self.counters["paragraphs"] += 1
+            style = parser.get_style_name(para)
+            para_text = para.text.strip()
+
+            # 处理标题
+            if style == "Heading 2":
+                if in_code_block:
+                    yield "```"
+                    in_code_block = False
+                if heading_events:
+                    yield HeadingEvent(2, para_text)
+                yield f"### {para_text}"
+                continue
+            elif style == "Heading 3":
+                if in_code_block:
+                    yield "```"
+                    in_code_block = False
+                if heading_events:
+                    yield HeadingEvent(3, para_text)
+                yield f"#### {para_text}"
+                continue
 
-        for run in para.runs:
-            # 处理图片
-            img_lines, image_count = self.image_processor.process_images_in_run(
-                run, rels, section_index, image_count
+            # 处理代码块
+            if style == "Code":
+                if not in_code_block:
+                    yield "```" + self.converter.code_language
+                    in_code_block = True
+                yield para.text
+                continue
+            else:
+                if in_code_block:
+                    yield "```"
+                    in_code_block = False
+
+            # 处理正文、图片和格式
+            merged_text, image_lines, image_count = self.inline_renderer.render(
+                para, image_parts, sec_index, image_count, hyperlinks
             )
-            image_lines.extend(img_lines)
 
-            # 处理文本和格式
-            text = run.text
-            bold = run.bold
+            # 添加图片行
+            yield from image_lines
+
+            # 添加文本行（纯文本中的URL已在行内渲染时转换为链接）
+            if merged_text.strip():
+                yield merged_text.strip()
+
+            yield ""
+
+        if in_code_block:
+            yield "```"
+
+    def iter_markdown(self, sections: Iterable[Tuple[Section, Iterable[Any]]],
+                      parser: Union[WordDocumentParser, StreamingDocumentParser]
+                      ) -> Iterator[Tuple[int, Iterator[str]]]:
+        """
+        按文档顺序逐个章节、逐行生成Markdown，不在内存中保留已生成的内容
+
+        每个章节的行需要在取下一个章节之前消费完。
+
+        Args:
+            sections: (章节, 段落和表格) 的迭代器，即解析器 iter_sections 的结果
+            parser: 文档解析器
+
+        Yields:
+            (章节索引, 该章节的Markdown行迭代器)
+        """
+        image_parts = parser.get_image_parts()
+        hyperlinks = parser.get_hyperlinks()
+        for sec, content in sections:
+            yield sec.index, self.iter_section_lines(sec, content, parser, image_parts, hyperlinks)
+
+    def iter_markdown_parallel(self, sections: List[Section],
+                               parser: Union[WordDocumentParser, StreamingDocumentParser],
+                               workers: int) -> Iterator[Tuple[int, Iterable[str]]]:
+        """
+        在多个进程中并行生成选定章节的Markdown，按文档顺序逐组返回
+
+        选定章节按段落数均分为连续的若干组，每个工作进程独立打开文档并生成一组章节；
+        某一组完成后即可写出，不必等待全部章节生成完毕。
+
+        Args:
+            sections: 选定的章节
+            parser: 文档解析器
+            workers: 工作进程数
+
+        Yields:
+            (章节索引, 该章节的Markdown行)
+        """
+        sections = sorted(sections, key=lambda sec: sec.index)
+        workers = min(workers, len(sections))
+        if workers <= 1:
+            yield from self.iter_markdown(parser.iter_sections(sections), parser)
+            return
+
+        for lines in self._map_workers(_render_sections, sections, parser, workers):
+            yield from lines.items()
+
+    def _map_workers(self, worker: Callable[[Dict[str, Any]], Tuple[Any, Dict[int, Any], Counter]],
+                     sections: List[Section], parser: Union[WordDocumentParser, StreamingDocumentParser],
+                     workers: int, **options) -> Iterator[Any]:
+        """
+        把章节按段落数均分为连续的若干组，在多个进程中分别处理，按文档顺序逐组返回结果
+
+        每个任务包含打开文档和创建生成器所需的参数（见 _open_task）；worker 返回
+        (结果, 各章节引用的图片, 生成计数)，图片和计数在这里合并到当前生成器。
+
+        Args:
+            worker: 在工作进程中处理一组章节的函数
+            sections: 按文档顺序排列的选定章节
+            parser: 文档解析器
+            workers: 工作进程数
+            options: 附加到每个任务中的参数
+
+        Yields:
+            每组章节的处理结果
+        """
+        tasks = [{
+            "parser_class": type(parser),
+            "docx_path": parser.docx_path,
+            "code_language": self.converter.code_language,
+            "output_dir": self.image_processor.output_dir,
+            "image_dir": self.image_processor.image_dir,
+            "relative_links": self.image_processor.relative_links,
+            "collect_images": self.image_processor.images is not None,
+            "sections": chunk,
+            **options
+        } for chunk in _split_sections(sections, workers)]
 
-            if bold != current_bold:
-                if current_bold is True:
-                    merged_text += "**"
-                if bold is True:
-                    merged_text += "**"
-                current_bold = bold
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result, section_images, counters in executor.map(worker, tasks):
+                self._merge_section_images(section_images, parser)
+                self.counters.update(counters)
+                yield result
 
-            merged_text += text
+    def _merge_section_images(self, section_images: Dict[int, List[Dict[str, Any]]],
+                              parser: Union[WordDocumentParser, StreamingDocumentParser]):
+        """
+        合并工作进程返回的各章节图片
 
-        if current_bold is True:
-            merged_text += "**"
+        图片处理器只收集图片、不写入磁盘时，工作进程同样只计算文件名，
+        这里按部件名把图片对应到本进程的图片部件，记录到图片处理器的 images 中。
 
-        return merged_text, image_lines, image_count
+        Args:
+            section_images: 章节索引 -> 该章节引用的图片
+            parser: 文档解析器
+        """
+        self.image_processor.section_images.update(section_images)
+        if self.image_processor.images is None:
+            return
+        parts = {part.partname: part for part in parser.get_image_parts().values()}
+        for refs in section_images.values():
+            for image in refs:
+                self.image_processor.images[image["name"]] = parts[image["part"]]
 
-    def generate_markdown_for_sections(self, sections: List[Dict[str, Any]],
-                                       document: Document) -> List[str]:
+    def write_split(self, sections: List[Section], parser: Union[WordDocumentParser, StreamingDocumentParser],
+                    split_writer: SplitWriter, workers: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        把选定章节分别写入单独的Markdown文件，按文档顺序逐个章节返回写入的文件
+
+        workers 大于1时选定章节按段落数均分为连续的若干组，每个工作进程独立打开文档，
+        生成并直接写入一组章节的文件，图片写入同一个图片目录。
+
+        Args:
+            sections: 选定的章节
+            parser: 文档解析器
+            split_writer: 拆分输出写入器
+            workers: 工作进程数
+
+        Yields:
+            (章节索引, 该章节写入的文件)
+        """
+        sections = sorted(sections, key=lambda sec: sec.index)
+        workers = min(workers, len(sections))
+        if workers <= 1:
+            image_parts = parser.get_image_parts()
+            hyperlinks = parser.get_hyperlinks()
+            for sec, content in parser.iter_sections(sections):
+                yield sec.index, split_writer.write_section(
+                    sec, self.iter_section_lines(sec, content, parser, image_parts, hyperlinks, heading_events=True)
+                )
+            return
+
+        for entries in self._map_workers(_write_split_sections, sections, parser, workers,
+                                         split_writer=split_writer):
+            yield from entries.items()
+
+    def render_sections(self, sections: Iterable[Tuple[Section, Iterable[Any]]],
+                        parser: Union[WordDocumentParser, StreamingDocumentParser]) -> Dict[int, List[str]]:
+        """
+        逐个生成选定章节的Markdown
+
+        Args:
+            sections: (章节, 段落和表格) 的迭代器，即解析器 iter_sections 的结果
+            parser: 文档解析器
+
+        Returns:
+            章节索引 -> Markdown行列表（按文档顺序）
+        """
+        image_parts = parser.get_image_parts()
+        hyperlinks = parser.get_hyperlinks()
+        return {
+            sec.index: list(self.iter_section_lines(sec, content, parser, image_parts, hyperlinks))
+            for sec, content in sections
+        }
+
+    def generate_markdown_for_sections(self, sections: Iterable[Section],
+                                       parser: Union[WordDocumentParser, StreamingDocumentParser]) -> List[str]:
         """
         为选定章节生成Markdown
 
+        保留给外部调用的简单包装：基于 iter_markdown 生成，并把所有行收集到一个列表中。
+
         Args:
             sections: 选定的章节列表
-            document: Word文档对象
+            parser: 文档解析器
 
         Returns:
             Markdown行列表
         """
-        markdown_lines = []
-        rels = document.part._rels
-
-        for sec in sections:
-            image_count = 1
-            sec_index = sec["index"]
-            markdown_lines.append(f"## {sec['title']}")
-
-            in_code_block = False
-
-            for para in sec["content"]:
-                style = para.style.name.strip()
-                para_text = para.text.strip()
-
-                # 处理标题
-                if style == "Heading 2":
-                    if in_code_block:
-                        markdown_lines.append("```")
-                        in_code_block = False
-                    markdown_lines.append(f"### {para_text}")
-                    continue
-                elif style == "Heading 3":
-                    if in_code_block:
-                        markdown_lines.append("```")
-                        in_code_block = False
-                    markdown_lines.append(f"#### {para_text}")
-                    continue
-
-                # 处理代码块
-                if style == "Code":
-                    if not in_code_block:
-                        markdown_lines.append("```" + self.converter.code_language)
-                        in_code_block = True
-                    markdown_lines.append(para.text)
-                    continue
-                else:
-                    if in_code_block:
-                        markdown_lines.append("```")
-                        in_code_block = False
-
-                # 处理正文、图片和格式
-                merged_text, image_lines, image_count = self._process_paragraph_runs(
-                    para, rels, sec_index, image_count
-                )
+        return [line for _, lines in self.iter_markdown(parser.iter_sections(sections), parser) for line in lines]
+
+
+def _split_sections(sections: List[Section], parts: int) -> List[List[Section]]:
+    """按段落数把章节分成若干组连续的章节"""
+    total = sum(sec.size for sec in sections)
+    target = total / parts
+    chunks, current, size = [], [], 0
+    for sec in sections:
+        current.append(sec)
+        size += sec.size
+        if size >= target * (len(chunks) + 1) and len(chunks) < parts - 1:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
 
-                # 添加图片行
-                markdown_lines.extend(image_lines)
+def _open_task(task: Dict[str, Any], writer: BackgroundImageWriter
+               ) -> Tuple[Union[WordDocumentParser, StreamingDocumentParser], MarkdownGenerator]:
+    """在工作进程中按任务打开文档，创建通过 writer 写入同一图片目录（或只收集图片）的生成器"""
+    parser = task["parser_class"](task["docx_path"], sections=task["sections"])
+    image_processor = ImageProcessor(task["output_dir"], task["image_dir"], writer, task["relative_links"],
+                                     images={} if task["collect_images"] else None)
+    return parser, MarkdownGenerator(MarkdownConverter(task["code_language"]), image_processor)
 
-                # 添加文本行
-                if merged_text.strip():
-                    converted_text = self.converter.convert_plain_urls_to_md(merged_text.strip())
-                    markdown_lines.append(converted_text)
 
-                markdown_lines.append("")
+def _render_sections(task: Dict[str, Any]) -> Tuple[Dict[int, List[str]], Dict[int, List[Dict[str, Any]]], Counter]:
+    """在工作进程中生成一组章节的Markdown，同时返回各章节引用的图片和生成计数"""
+    with BackgroundImageWriter() as writer:
+        parser, generator = _open_task(task, writer)
+        section_lines = generator.render_sections(parser.iter_sections(task["sections"]), parser)
+        generator.image_processor.flush()
+    return section_lines, generator.image_processor.section_images, generator.counters
 
-            if in_code_block:
-                markdown_lines.append("```")
 
-        return markdown_lines
\ No newline at end of file
+def _write_split_sections(task: Dict[str, Any]) -> Tuple[Dict[int, List[Dict[str, Any]]],
+                                                        Dict[int, List[Dict[str, Any]]], Counter]:
+    """在工作进程中生成并写入一组章节的文件，同时返回各章节引用的图片和生成计数"""
+    with BackgroundImageWriter() as writer:
+        parser, generator = _open_task(task, writer)
+        entries = dict(generator.write_split(task["sections"], parser, task["split_writer"]))
+        generator.image_processor.flush()
+    return entries, generator.image_processor.section_images, generator.counters
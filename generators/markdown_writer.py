@@ -0,0 +1,68 @@
+import hashlib
+import io
+from typing import Dict, Iterable, Tuple
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class MarkdownWriter:
+    """Markdown流式写入器
+
+    按章节把生成的行直接写入文件或任意流，输出不在内存中整体拼接；行之间以换行分隔，
+    与 "\\n".join 全部行的结果一致。同时记录每个章节在输出中的字节位置和输出的哈希，供增量转换使用。
+    """
+
+    def __init__(self, stream, autoflush: bool = False):
+        """
+        初始化写入器
+
+        Args:
+            stream: 输出流，二进制流或文本流（如 sys.stdout、io.StringIO）均可
+            autoflush: 每写完一个章节是否立即刷新输出流，输出到终端或管道时使接收方尽早收到内容
+        """
+        if isinstance(stream, io.TextIOBase) and hasattr(stream, "buffer"):
+            # 文本流直接写入其底层的二进制流，避免换行符转换使字节位置失真
+            stream.flush()
+            stream = stream.buffer
+        self.stream = stream
+        self.binary = not isinstance(stream, io.TextIOBase)
+        self.autoflush = autoflush
+        self.position = 0
+        # 章节索引 -> (字节偏移, 字节长度)
+        self.spans: Dict[int, Tuple[int, int]] = {}
+        self._hasher = hashlib.sha256()
+
+    def _write(self, text: str):
+        """写入一段文本并更新位置和哈希"""
+        data = text.encode("utf-8")
+        self.stream.write(data if self.binary else text)
+        self._hasher.update(data)
+        self.position += len(data)
+
+    def write_section(self, index: int, lines: Iterable[str]):
+        """
+        写入一个章节的所有行
+
+        Args:
+            index: 章节索引
+            lines: 章节的Markdown行（可以是生成器，边生成边写入）
+        """
+        if self.spans:
+            self._write("\n")
+        start = self.position
+        for i, line in enumerate(lines):
+            if i:
+                self._write("\n")
+            self._write(line)
+        self.spans[index] = (start, self.position - start)
+        if self.autoflush:
+            self.stream.flush()
+
+    @property
+    def output_hash(self) -> str:
+        """已写入内容的sha256"""
+        return self._hasher.hexdigest()
+
+    def flush(self):
+        """刷新输出流"""
+        self.stream.flush()
@@ -0,0 +1,150 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import quote
+
+from converters.markdown_converter import escape_link_text
+from generators.markdown_writer import WRITE_BUFFER_SIZE
+from parsers.section import Section
+
+# 可拆分到的标题级别：1 为每个一级标题（章节）一个文件，2 为每个二级标题再拆分一个文件
+SPLIT_LEVELS = (1, 2)
+# 各拆分级别的默认文件名模板（不含扩展名），可用字段：index 章节索引、part 章节内的序号、title 标题
+DEFAULT_TEMPLATES = {
+    1: "{index:03d}-{title}",
+    2: "{index:03d}-{part:02d}-{title}",
+}
+DEFAULT_INDEX_NAME = "index.md"
+UNSAFE_FILENAME_PATTERN = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+MAX_TITLE_LENGTH = 80
+
+
+def safe_filename(title: str) -> str:
+    """把标题转换为可用作文件名的文本"""
+    name = UNSAFE_FILENAME_PATTERN.sub("_", title)
+    name = re.sub(r"\s+", " ", name).strip(". ")[:MAX_TITLE_LENGTH].strip(". ")
+    return name or "section"
+
+
+class HeadingEvent:
+    """生成器在章节内的标题行之前产生的事件，标记可能的拆分位置"""
+
+    __slots__ = ("level", "title")
+
+    def __init__(self, level: int, title: str):
+        """
+        初始化标题事件
+
+        Args:
+            level: Word中的标题级别（2 为二级标题）
+            title: 标题文本
+        """
+        self.level = level
+        self.title = title
+
+    def __repr__(self) -> str:
+        return f"HeadingEvent(level={self.level}, title={self.title!r})"
+
+
+class SplitWriter:
+    """拆分输出写入器
+
+    把每个章节（或章节中的每个二级标题）写入单独的Markdown文件，并生成目录文件。
+    章节的行边生成边写入，遇到拆分级别的标题事件（HeadingEvent）时切换到下一个文件。
+    不同章节写入不同的文件，可以在多个进程中同时写入同一个输出目录。
+    """
+
+    def __init__(self, output_dir: str, split_level: int = 1, filename_template: Optional[str] = None,
+                 index_name: str = DEFAULT_INDEX_NAME):
+        """
+        初始化拆分写入器
+
+        Args:
+            output_dir: 输出目录
+            split_level: 拆分的标题级别（1 或 2）
+            filename_template: 文件名模板（可选，不含扩展名），必须包含 {index}，拆分到二级标题时还必须包含 {part}
+            index_name: 目录文件名
+
+        Raises:
+            ValueError: 拆分级别或文件名模板无效
+        """
+        if split_level not in SPLIT_LEVELS:
+            raise ValueError(f"不支持的拆分级别：{split_level}")
+        template = filename_template or DEFAULT_TEMPLATES[split_level]
+        required = ("index", "part") if split_level == 2 else ("index",)
+        missing = [field for field in required if "{" + field not in template]
+        if missing:
+            raise ValueError(f"文件名模板必须包含 {', '.join('{' + field + '}' for field in missing)}，"
+                             f"否则不同章节的文件名可能重复")
+        try:
+            template.format(index=1, part=0, title="")
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"文件名模板格式错误：{e}")
+
+        self.output_dir = output_dir
+        self.split_level = split_level
+        self.filename_template = template
+        self.index_name = index_name
+
+    def file_name(self, index: int, part: int, title: str) -> str:
+        """根据模板生成文件名"""
+        name = self.filename_template.format(index=index, part=part, title=safe_filename(title))
+        return name if name.lower().endswith(".md") else name + ".md"
+
+    def write_section(self, sec: Section, lines: Iterable[Union[str, HeadingEvent]]) -> List[Dict[str, Any]]:
+        """
+        写入一个章节的所有行
+
+        Args:
+            sec: 章节
+            lines: 章节的Markdown行和标题事件（可以是生成器，边生成边写入）
+
+        Returns:
+            写入的文件（章节索引、序号、标题、文件名、字节数），按写入顺序
+        """
+        entries: List[Dict[str, Any]] = []
+        f = None
+        title = sec.title
+        try:
+            for line in lines:
+                if isinstance(line, HeadingEvent):
+                    if line.level == self.split_level and f is not None:
+                        f.close()
+                        f = None
+                        title = line.title
+                    continue
+
+                if f is None:
+                    entry = {"index": sec.index, "part": len(entries), "title": title,
+                             "file": self.file_name(sec.index, len(entries), title), "bytes": 0}
+                    entries.append(entry)
+                    f = open(os.path.join(self.output_dir, entry["file"]), "wb", buffering=WRITE_BUFFER_SIZE)
+                    data = line.encode("utf-8")
+                else:
+                    data = ("\n" + line).encode("utf-8")
+                f.write(data)
+                entries[-1]["bytes"] += len(data)
+        finally:
+            if f is not None:
+                f.close()
+        return entries
+
+    def write_index(self, entries: Iterable[Dict[str, Any]], title: str) -> str:
+        """
+        写入目录文件，二级标题的文件缩进列在所属章节下；标题与行内超链接一样转义后作为链接文字
+
+        Args:
+            entries: 按文档顺序排列的已写入文件
+            title: 目录标题
+
+        Returns:
+            目录文件路径
+        """
+        lines = [f"# {title}", ""]
+        for entry in entries:
+            indent = "  " if entry["part"] > 0 else ""
+            lines.append(f"{indent}- [{escape_link_text(entry['title'])}]({quote(entry['file'])})")
+        index_path = os.path.join(self.output_dir, self.index_name)
+        with open(index_path, "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join(lines) + "\n")
+        return index_path
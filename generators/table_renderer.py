@@ -0,0 +1,123 @@
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from typing import Dict, List, Optional, Tuple
+
+from .inline_renderer import InlineRenderer
+
+TAG_P = qn("w:p")
+TAG_TBL = qn("w:tbl")
+TAG_TR = qn("w:tr")
+TAG_TC = qn("w:tc")
+TAG_TRPR = qn("w:trPr")
+TAG_TCPR = qn("w:tcPr")
+TAG_GRID_SPAN = qn("w:gridSpan")
+TAG_GRID_BEFORE = qn("w:gridBefore")
+TAG_GRID_AFTER = qn("w:gridAfter")
+TAG_VMERGE = qn("w:vMerge")
+ATTR_VAL = qn("w:val")
+
+
+class TableRenderer:
+    """表格渲染器
+
+    直接遍历 w:tr/w:tc 一次生成GFM表格，耗时与单元格数量成正比。
+    第一行作为表头；横向合并的单元格内容放在第一列，其余列留空；
+    纵向合并的单元格内容放在第一行，后续行留空。
+    """
+
+    def __init__(self, inline_renderer: InlineRenderer):
+        """
+        初始化表格渲染器
+
+        Args:
+            inline_renderer: 行内格式渲染器，用于渲染单元格中的段落
+        """
+        self.inline_renderer = inline_renderer
+
+    @staticmethod
+    def _int_val(parent, tag: str, default: int) -> int:
+        """读取属性元素中的整数值"""
+        if parent is None:
+            return default
+        elem = parent.find(tag)
+        if elem is None:
+            return default
+        try:
+            return int(elem.get(ATTR_VAL, default))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        """转义单元格文本中的竖线和换行"""
+        return text.replace("|", "\\|").replace("\r\n", "<br>").replace("\n", "<br>")
+
+    def _render_cell(self, tc, image_parts, section_index: int, image_count: int,
+                     hyperlinks: Dict[str, str]) -> Tuple[str, int]:
+        """
+        渲染单元格内容，多个段落以 <br> 分隔，嵌套表格展开为段落
+
+        Returns:
+            (单元格文本, 更新后的图片计数)
+        """
+        lines = []
+        for child in tc.iterchildren(TAG_P, TAG_TBL):
+            paragraphs = [child] if child.tag == TAG_P else child.iter(TAG_P)
+            for p in paragraphs:
+                text, image_lines, image_count = self.inline_renderer.render(
+                    Paragraph(p, None), image_parts, section_index, image_count, hyperlinks
+                )
+                lines.extend(image_lines)
+                if text.strip():
+                    lines.append(text.strip())
+        return "<br>".join(self._escape(line) for line in lines), image_count
+
+    def render(self, tbl, image_parts, section_index: int, image_count: int,
+               hyperlinks: Optional[Dict[str, str]] = None) -> Tuple[List[str], int]:
+        """
+        渲染表格
+
+        Args:
+            tbl: 表格元素（w:tbl）
+            image_parts: 文档关系中的部件
+            section_index: 章节索引
+            image_count: 图片计数
+            hyperlinks: 超链接关系 rId -> 地址
+
+        Returns:
+            (Markdown表格行列表, 更新后的图片计数)
+        """
+        hyperlinks = hyperlinks or {}
+        rows: List[List[str]] = []
+        columns = 0
+
+        for tr in tbl.iterchildren(TAG_TR):
+            trPr = tr.find(TAG_TRPR)
+            row = [""] * self._int_val(trPr, TAG_GRID_BEFORE, 0)
+            for tc in tr.iterchildren(TAG_TC):
+                tcPr = tc.find(TAG_TCPR)
+                span = max(self._int_val(tcPr, TAG_GRID_SPAN, 1), 1)
+                vmerge = tcPr.find(TAG_VMERGE) if tcPr is not None else None
+                if vmerge is not None and vmerge.get(ATTR_VAL, "continue") == "continue":
+                    # 纵向合并的后续单元格
+                    text = ""
+                else:
+                    text, image_count = self._render_cell(
+                        tc, image_parts, section_index, image_count, hyperlinks
+                    )
+                row.append(text)
+                row.extend([""] * (span - 1))
+            row.extend([""] * self._int_val(trPr, TAG_GRID_AFTER, 0))
+            columns = max(columns, len(row))
+            rows.append(row)
+
+        if not rows or not columns:
+            return [], image_count
+
+        lines = []
+        for i, row in enumerate(rows):
+            row.extend([""] * (columns - len(row)))
+            lines.append("| " + " | ".join(row) + " |")
+            if i == 0:
+                lines.append("|" + " --- |" * columns)
+        return lines, image_count
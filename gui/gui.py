@@ -4,11 +4,12 @@ import sys
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QLineEdit, QPushButton,
-    QFileDialog, QVBoxLayout, QHBoxLayout, QWidget, QMessageBox, QListWidget, QComboBox
+    QFileDialog, QVBoxLayout, QHBoxLayout, QWidget, QMessageBox, QListView, QComboBox, QProgressBar,
+    QAbstractItemView
 )
-from converters.word2md_converter import Word2MarkdownConverter
-from parsers.document_parser import WordDocumentParser
+from section_model import SECTION_INDEX_ROLE, SectionFilterModel, SectionListModel
 from style import get_stylesheet  # 导入样式
+from workers import ConversionWorker, SectionLoader
 
 
 class Word2MdGUI(QMainWindow):
@@ -19,6 +20,9 @@ class Word2MdGUI(QMainWindow):
         self.setGeometry(100, 100, 900, 500)
 
         self.setStyleSheet(get_stylesheet())  # 应用样式表
+        self.parser = None  # 加载章节时得到的解析器，转换时复用
+        self.loader = None
+        self.worker = None
         self.initUI()
 
     def initUI(self):
@@ -41,9 +45,21 @@ class Word2MdGUI(QMainWindow):
         # Section selection and conversion list
         list_layout = QHBoxLayout()
 
-        self.all_sections_list = QListWidget(self)
-        self.all_sections_list.setSelectionMode(QListWidget.MultiSelection)
-        list_layout.addWidget(self.all_sections_list)
+        # 两个列表共享 索引 -> 标题 字典，只保存章节索引
+        self.titles = {}
+        self.all_sections_model = SectionListModel(self.titles, self)
+        self.selected_sections_model = SectionListModel(self.titles, self)
+        self.filter_model = SectionFilterModel(self.all_sections_model, self)
+
+        all_layout = QVBoxLayout()
+        self.filter_line = QLineEdit(self)
+        self.filter_line.setPlaceholderText("搜索章节标题")
+        self.filter_line.textChanged.connect(self.filter_model.setFilterFixedString)
+        all_layout.addWidget(self.filter_line)
+
+        self.all_sections_list = self.create_section_view(self.filter_model)
+        all_layout.addWidget(self.all_sections_list)
+        list_layout.addLayout(all_layout)
 
         button_layout = QVBoxLayout()
         button_layout.addStretch()
@@ -77,8 +93,7 @@ class Word2MdGUI(QMainWindow):
 
         list_layout.addLayout(button_layout)
 
-        self.selected_sections_list = QListWidget(self)
-        self.selected_sections_list.setSelectionMode(QListWidget.MultiSelection)
+        self.selected_sections_list = self.create_section_view(self.selected_sections_model)
         list_layout.addWidget(self.selected_sections_list)
 
         layout.addLayout(list_layout)
@@ -98,15 +113,44 @@ class Word2MdGUI(QMainWindow):
         layout.addLayout(output_layout)
 
         # Convert button
+        convert_layout = QHBoxLayout()
         self.convert_button = QPushButton("转换", self)
         self.convert_button.clicked.connect(self.convert_word_to_md)
-        layout.addWidget(self.convert_button)
+        convert_layout.addWidget(self.convert_button)
+
+        self.cancel_button = QPushButton("取消", self)
+        self.cancel_button.clicked.connect(self.cancel_conversion)
+        self.cancel_button.setEnabled(False)
+        convert_layout.addWidget(self.cancel_button)
+
+        layout.addLayout(convert_layout)
+
+        # Progress
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("", self)
+        layout.addWidget(self.status_label)
 
         # Setting the central widget
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+    def create_section_view(self, model):
+        """创建章节列表视图，条目等高时视图只计算和绘制可见的条目"""
+        view = QListView(self)
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QAbstractItemView.MultiSelection)
+        return view
+
+    @staticmethod
+    def selected_indices(view):
+        """视图中选中条目的章节索引"""
+        return [index.data(SECTION_INDEX_ROLE) for index in view.selectionModel().selectedIndexes()]
+
     def select_input_file(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "选择 Word 文件", "", "Word Files (*.docx)")
         if file_name:
@@ -114,39 +158,74 @@ class Word2MdGUI(QMainWindow):
             self.load_sections(file_name)
 
     def load_sections(self, file_name):
-        """加载并展示 Word 文件中的段落"""
-        try:
-            parser = WordDocumentParser(file_name)
-            self.all_sections_list.clear()
-            for section in parser.get_sections():
-                if section['index'] > 0:
-                    self.all_sections_list.addItem(f"{section['index']}: {section['title']}")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"解析 Word 文件时发生错误：{str(e)}")
+        """在后台线程中加载 Word 文件中的段落，完成后展示"""
+        self.parser = None
+        self.titles = {}
+        self.all_sections_model.set_titles(self.titles)
+        self.selected_sections_model.set_titles(self.titles)
+        self.set_busy(True, "正在解析 Word 文件...")
+        self.progress_bar.setRange(0, 0)  # 解析时显示忙碌状态
+
+        self.loader = SectionLoader(file_name, self)
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.loaded.connect(self.on_sections_loaded)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.cancelled.connect(self.on_load_cancelled)
+        self.loader.start()
+        self.cancel_button.setEnabled(True)
+
+    def on_load_progress(self, percent):
+        """更新解析进度"""
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(percent)
+
+    def on_sections_loaded(self, parser):
+        """展示加载好的段落"""
+        self.loader = None
+        self.parser = parser
+        self.titles = parser.get_section_titles()
+        self.all_sections_model.set_titles(self.titles)
+        self.selected_sections_model.titles = self.titles
+        self.progress_bar.setRange(0, 1)
+        self.set_busy(False, f"共 {len(self.titles)} 个章节")
+
+    def on_load_failed(self, error):
+        self.loader = None
+        self.progress_bar.setRange(0, 1)
+        self.set_busy(False, "")
+        QMessageBox.critical(self, "错误", f"解析 Word 文件时发生错误：{error}")
+
+    def on_load_cancelled(self):
+        self.loader = None
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(0)
+        self.set_busy(False, "已取消解析")
+
+    def set_busy(self, busy, status=None):
+        """后台任务运行时禁用会改变输入的按钮"""
+        for button in (self.input_button, self.output_button, self.convert_button,
+                       self.add_button, self.add_all_button, self.remove_button, self.remove_all_button):
+            button.setEnabled(not busy)
+        self.input_line.setEnabled(not busy)
+        self.cancel_button.setEnabled(busy and (self.worker is not None or self.loader is not None))
+        if status is not None:
+            self.status_label.setText(status)
 
     def add_to_conversion_list(self):
         """将选中的段落添加到待转换列表"""
-        selected_items = self.all_sections_list.selectedItems()
-        for item in selected_items:
-            if item.text() not in [self.selected_sections_list.item(i).text() for i in range(self.selected_sections_list.count())]:
-                self.selected_sections_list.addItem(item.text())
+        self.selected_sections_model.add_indices(self.selected_indices(self.all_sections_list))
 
     def add_all_to_conversion_list(self):
-        """将所有段落添加到待转换列表"""
-        for i in range(self.all_sections_list.count()):
-            item_text = self.all_sections_list.item(i).text()
-            if item_text not in [self.selected_sections_list.item(j).text() for j in range(self.selected_sections_list.count())]:
-                self.selected_sections_list.addItem(item_text)
+        """将所有段落（有搜索条件时为搜索结果）添加到待转换列表"""
+        self.selected_sections_model.add_indices(self.filter_model.visible_indices())
 
     def remove_from_conversion_list(self):
         """从待转换列表中移除选中的段落"""
-        selected_items = self.selected_sections_list.selectedItems()
-        for item in selected_items:
-            self.selected_sections_list.takeItem(self.selected_sections_list.row(item))
+        self.selected_sections_model.remove_indices(self.selected_indices(self.selected_sections_list))
 
     def remove_all_from_conversion_list(self):
         """清空待转换列表"""
-        self.selected_sections_list.clear()
+        self.selected_sections_model.clear()
 
     def select_output_file(self):
         file_name, _ = QFileDialog.getSaveFileName(self, "选择 Markdown 文件", "", "Markdown Files (*.md)")
@@ -163,27 +242,72 @@ class Word2MdGUI(QMainWindow):
             return
 
         try:
-            selected_indices = []
-            for i in range(self.selected_sections_list.count()):
-                text = self.selected_sections_list.item(i).text()
-                index = int(text.split(":")[0])  # 提取段落索引
-                selected_indices.append(index)
+            selected_indices = self.selected_sections_model.indices()
 
             if not selected_indices:
                 QMessageBox.warning(self, "警告", "没有选择任何章节")
                 return
 
-            converter = Word2MarkdownConverter(code_language=lang)
-            success = converter.convert(input_path, output_path, section_range=selected_indices)
-
-            if success:
-                self.show_success_message(output_path)
-            else:
-                QMessageBox.warning(self, "失败", "转换失败，请检查输入文件。")
+            # 输入文件改过时不能复用已加载的解析器
+            parser = self.parser if self.parser is not None and self.parser.docx_path == input_path else None
+            self.worker = ConversionWorker(input_path, output_path, selected_indices, lang, parser, self)
+            self.worker.progress.connect(self.on_progress)
+            self.worker.finished_with_stats.connect(self.on_conversion_finished)
+            self.worker.failed.connect(self.on_conversion_failed)
+            self.progress_bar.setRange(0, len(selected_indices))
+            self.progress_bar.setValue(0)
+            self.set_busy(True, "正在转换...")
+            self.worker.start()
 
         except Exception as e:
             QMessageBox.critical(self, "错误", f"发生错误：{str(e)}")
 
+    def cancel_conversion(self):
+        """取消正在进行的转换或章节解析"""
+        task = self.worker or self.loader
+        if task is not None:
+            task.cancel()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("正在取消...")
+
+    def on_progress(self, kind, done, total):
+        """更新转换进度"""
+        if kind == "sections":
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+            self.status_label.setText(f"已转换 {done}/{total} 个章节")
+        elif kind == "images":
+            self.status_label.setText(f"已保存 {done}/{total} 张图片")
+
+    def on_conversion_finished(self, stats):
+        output_path = stats.output_md_path
+        self.worker = None
+        self.set_busy(False)
+        if stats:
+            self.status_label.setText(f"转换完成，用时 {stats.duration:.2f}s")
+            self.show_success_message(output_path)
+        elif stats.cancelled:
+            self.progress_bar.setValue(0)
+            self.status_label.setText("转换已取消")
+        else:
+            self.status_label.setText("")
+            QMessageBox.warning(self, "失败", f"转换失败，请检查输入文件。{stats.error or ''}")
+
+    def on_conversion_failed(self, error):
+        self.worker = None
+        self.set_busy(False, "")
+        QMessageBox.critical(self, "错误", f"发生错误：{error}")
+
+    def closeEvent(self, event):
+        """关闭窗口时取消并等待后台任务结束"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader.wait()
+        super().closeEvent(event)
+
     def show_success_message(self, output_path):
         """显示成功提示框，并添加两个按钮"""
         msg_box = QMessageBox(self)
@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, List
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+
+# 取出条目对应的章节索引
+SECTION_INDEX_ROLE = Qt.UserRole
+
+
+class SectionListModel(QAbstractListModel):
+    """章节列表模型
+
+    只保存按顺序排列的章节索引和索引集合，标题从共享的 索引 -> 标题 字典中读取，
+    判断是否已在列表中为 O(1)。批量添加或移除时合并后整体重置一次，不逐条插入，
+    配合 QListView 只绘制可见条目，数万条章节也能立即完成。
+    """
+
+    def __init__(self, titles: Dict[int, str], parent=None):
+        """
+        初始化章节列表模型
+
+        Args:
+            titles: 章节索引 -> 标题
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.titles = titles
+        self._indices: List[int] = []
+        self._members = set()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._indices)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        section_index = self._indices[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{section_index}: {self.titles.get(section_index, '')}"
+        if role == SECTION_INDEX_ROLE:
+            return section_index
+        return None
+
+    def __contains__(self, section_index: int) -> bool:
+        return section_index in self._members
+
+    def indices(self) -> List[int]:
+        """按顺序排列的章节索引"""
+        return list(self._indices)
+
+    def set_indices(self, indices: Iterable[int]):
+        """替换全部章节"""
+        self.beginResetModel()
+        self._members = set(indices)
+        self._indices = sorted(self._members)
+        self.endResetModel()
+
+    def set_titles(self, titles: Dict[int, str]):
+        """替换标题字典，并以其中的全部章节作为列表内容"""
+        self.titles = titles
+        self.set_indices(titles)
+
+    def add_indices(self, indices: Iterable[int]):
+        """添加章节，已在列表中的忽略"""
+        new = set(indices) - self._members
+        if new:
+            self.set_indices(self._members | new)
+
+    def remove_indices(self, indices: Iterable[int]):
+        """移除章节，不在列表中的忽略"""
+        removed = self._members.intersection(indices)
+        if removed:
+            self.set_indices(self._members - removed)
+
+    def clear(self):
+        """清空列表"""
+        self.set_indices(())
+
+
+class SectionFilterModel(QSortFilterProxyModel):
+    """按标题文本过滤章节（不区分大小写）"""
+
+    def __init__(self, source: SectionListModel, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+    def visible_indices(self) -> List[int]:
+        """过滤后可见的章节索引，没有过滤条件时直接返回全部"""
+        source = self.sourceModel()
+        if not self.filterRegExp().pattern():
+            return source.indices()
+        return [self.data(self.index(row, 0), SECTION_INDEX_ROLE) for row in range(self.rowCount())]
@@ -0,0 +1,111 @@
+import threading
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class LoadCancelled(Exception):
+    """加载章节被取消"""
+
+
+class SectionLoader(QThread):
+    """在后台线程中扫描 Word 文件的章节，避免大文件阻塞界面
+
+    扫描时以已读取正文的百分比报告进度，支持取消；命中章节索引缓存时不扫描，也没有进度。
+    """
+
+    progress = pyqtSignal(int)  # 已扫描的百分比
+    loaded = pyqtSignal(object)  # 扫描好章节的解析器
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, docx_path: str, parent=None):
+        """
+        初始化章节加载线程
+
+        Args:
+            docx_path: Word文档路径
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.docx_path = docx_path
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，扫描在下一次报告进度时停止"""
+        self.cancel_event.set()
+
+    def _report_progress(self, done: int, total: int):
+        """扫描进度回调，已请求取消时中止扫描"""
+        if self.cancel_event.is_set():
+            raise LoadCancelled()
+        if total > 0:
+            self.progress.emit(min(done * 100 // total, 100))
+
+    def run(self):
+        # 在后台线程中才导入 python-docx，加快窗口的启动
+        from parsers.document_parser import WordDocumentParser
+        from parsers.package_reader import DocxPackageReader
+        from parsers.parse_cache import ParseCache
+
+        try:
+            cache = ParseCache()
+            reader = DocxPackageReader(self.docx_path)
+            sections = cache.load_sections(
+                self.docx_path, lambda: reader.scan_sections(cache.enabled, self._report_progress)
+            )
+            if self.cancel_event.is_set():
+                raise LoadCancelled()
+            self.loaded.emit(WordDocumentParser(self.docx_path, cache=cache, sections=sections))
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ConversionWorker(QThread):
+    """在后台线程中执行转换，报告进度并支持取消
+
+    进度信号的参数为 (类型, 已完成数, 总数)，类型为 "sections" 或 "images"；
+    图片进度由后台写入线程发出，Qt 会自动排队到界面线程处理。
+    结束时发出转换统计，被取消的转换其 cancelled 为True。
+    """
+
+    progress = pyqtSignal(str, int, int)
+    finished_with_stats = pyqtSignal(object)  # ConversionStats
+    failed = pyqtSignal(str)
+
+    def __init__(self, docx_path: str, output_md_path: str, section_range, code_language: str = "",
+                 parser=None, parent=None):
+        """
+        初始化转换线程
+
+        Args:
+            docx_path: Word文档路径
+            output_md_path: 输出Markdown路径
+            section_range: 选中的章节索引
+            code_language: 代码块语言
+            parser: 加载章节时得到的解析器（可选），提供时不再重新扫描
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.docx_path = docx_path
+        self.output_md_path = output_md_path
+        self.section_range = section_range
+        self.code_language = code_language
+        self.parser = parser
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，转换在下一个章节开始前停止"""
+        self.cancel_event.set()
+
+    def run(self):
+        from converters.word2md_converter import Word2MarkdownConverter
+
+        try:
+            converter = Word2MarkdownConverter(code_language=self.code_language, progress_hook=self.progress.emit)
+            stats = converter.convert(self.docx_path, self.output_md_path, section_range=self.section_range,
+                                      parser=self.parser, cancel_event=self.cancel_event)
+            self.finished_with_stats.emit(stats)
+        except Exception as e:
+            self.failed.emit(str(e))
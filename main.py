@@ -1,16 +1,175 @@
 import argparse
-from converters import Word2MarkdownConverter
+import json
+import os
+import sys
+
+# 转换相关的模块只在需要时导入，查看帮助和列出章节时不加载 python-docx 和生成器
+from parsers import ENGINES
+
+
+def list_sections(args) -> int:
+    """列出文档的章节（文本或JSON），返回进程退出码
+
+    命中章节索引缓存时只读取缓存文件，未命中时只扫描标题，不加载生成器和图片处理模块。
+    """
+    from parsers.parse_cache import ParseCache
+
+    docx_path = args.input[0]
+    cache = ParseCache(enabled=not args.no_cache)
+
+    def scan():
+        from parsers.package_reader import DocxPackageReader
+        return DocxPackageReader(docx_path).scan_sections(cache.enabled)
+
+    try:
+        sections = cache.load_sections(docx_path, scan)
+    except Exception as e:
+        print(f"❌ 解析失败：{e}", file=sys.stderr)
+        return 1
+
+    sections = [{"index": sec.index, "title": sec.title} for sec in sections if sec.index > 0]
+    if args.list_sections == "json":
+        print(json.dumps(sections, ensure_ascii=False))
+    else:
+        for sec in sections:
+            print(f"{sec['index']}: {sec['title']}")
+    return 0
+
+
+def run_batch(args) -> int:
+    """批量转换，返回进程退出码"""
+    from converters import BatchConverter
+
+    batch = BatchConverter(args.lang, workers=args.jobs, engine=args.engine,
+                           use_cache=not args.no_cache, incremental=args.incremental)
+    specs = list(args.input or [])
+    if args.manifest:
+        specs.extend(batch.read_manifest(args.manifest))
+
+    tasks = batch.collect_tasks(specs, args.output)
+    if not tasks:
+        print("没有找到需要转换的 .docx 文件")
+        return 1
+
+    summary = batch.run(tasks)
+    summary_path = args.summary or os.path.join(args.output, "word2md-summary.json")
+    batch.write_summary(summary, summary_path)
+
+    print(f"\n📦 批量转换完成：成功 {summary['succeeded']}，失败 {summary['failed']}，"
+          f"耗时 {summary['duration']}s")
+    for result in summary["files"]:
+        if result["status"] != "ok":
+            print(f"❌ {result['input']}：{result['error']}")
+    print(f"📄 汇总结果：{summary_path}")
+
+    return 1 if summary["failed"] else 0
+
+
+def run_watch(args):
+    """监视模式，文档保存后自动重新转换"""
+    from converters import DocumentWatcher
+
+    watcher = DocumentWatcher(args.input, args.output, args.lang, engine=args.engine,
+                              use_cache=not args.no_cache, workers=args.jobs or 1, debounce=args.debounce)
+    watcher.run()
+
 
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="将 Word 文件按段落转换为 Markdown")
-    parser.add_argument("-i", "--input", required=True, help="输入的 .docx 文件路径")
-    parser.add_argument("-o", "--output", required=True, help="输出的 .md 文件路径")
+    parser.add_argument("-i", "--input", nargs="+",
+                        help="输入的 .docx 文件路径；批量模式下可为多个文件、目录或通配符")
+    parser.add_argument("-o", "--output", help="输出的 .md 文件路径，- 表示标准输出；批量模式下为输出根目录")
     parser.add_argument("-l", "--lang", required=False, default="", help="代码块语言类型")
+    parser.add_argument("-e", "--engine", required=False, default="docx", choices=ENGINES,
+                        help="解析引擎，大文档可使用 stream 流式解析")
+    parser.add_argument("--no-cache", action="store_true", help="不使用章节索引缓存")
+    parser.add_argument("-b", "--batch", action="store_true", help="批量模式，转换全部章节")
+    parser.add_argument("-m", "--manifest", help="批量模式的清单文件，每行一个文件、目录或通配符")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="并行进程数：批量模式下为同时转换的文件数（默认为CPU核数），单文件模式下为并行生成章节的进程数")
+    parser.add_argument("--summary", help="批量模式的JSON汇总结果路径，默认写入输出根目录")
+    parser.add_argument("--incremental", action="store_true",
+                        help="增量转换，内容未改变的章节直接复用上一次的输出")
+    parser.add_argument("--stats", action="store_true", help="转换结束后输出各阶段耗时、计数和进程峰值内存")
+    parser.add_argument("--stats-json", help="将转换统计写入指定的JSON文件")
+    parser.add_argument("--stats-memory", action="store_true",
+                        help="统计中加入各阶段的Python峰值内存（tracemalloc，会明显拖慢转换，阶段耗时也会偏大）")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="ADDRESS",
+                        help="以常驻服务运行，监听 host:port（默认 127.0.0.1:8765）或 unix:路径，"
+                             "工作进程数由 -j 指定")
+    parser.add_argument("--max-queue", type=int, default=16, help="服务模式下最多排队等待的请求数")
+    parser.add_argument("--archive", nargs="?", const="zip", choices=("zip", "tar", "tar.gz"),
+                        help="把Markdown和图片直接写入单个归档（默认 zip），-o 以 .zip/.tar/.tar.gz/.tgz 结尾时自动启用；"
+                             "-o - 时归档输出到标准输出")
+    parser.add_argument("--split", action="store_true",
+                        help="拆分输出：每个章节写入单独的 .md 文件并生成目录 index.md，-o 为输出目录")
+    parser.add_argument("--split-level", type=int, default=1, choices=(1, 2),
+                        help="拆分的标题级别：1 每个一级标题一个文件（默认），2 每个二级标题一个文件")
+    parser.add_argument("--split-template",
+                        help="拆分输出的文件名模板，可用 {index}、{part}、{title}，"
+                             "默认 {index:03d}-{title}（二级为 {index:03d}-{part:02d}-{title}）")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="监视模式：监视输入的文件或目录，文档保存后自动增量转换；"
+                             "-o 为 .md 文件（单个文件）或输出根目录")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                        help="监视模式下最后一次保存后等待的秒数，连续保存只转换一次（默认 1.0）")
+    parser.add_argument("--list-sections", nargs="?", const="text", choices=("text", "json"),
+                        help="只列出文档的章节索引和标题后退出（默认 text，可选 json），不需要 -o")
     args = parser.parse_args()
 
-    converter = Word2MarkdownConverter(args.lang)
-    converter.convert(args.input, args.output)
+    if args.serve:
+        from service import serve
+        serve(args.serve, workers=args.jobs, max_queue=args.max_queue)
+        return
+
+    if args.list_sections:
+        if not args.input or len(args.input) != 1:
+            parser.error("--list-sections 需要且只能指定一个 -i 输入文件")
+        sys.exit(list_sections(args))
+
+    if not args.output:
+        parser.error("需要指定 -o 输出路径")
+
+    if args.watch:
+        if not args.input:
+            parser.error("监视模式需要通过 -i 指定文件或目录")
+        if args.output == "-":
+            parser.error("监视模式不支持输出到标准输出")
+        run_watch(args)
+        return
+
+    if args.batch:
+        sys.exit(run_batch(args))
+
+    if not args.input or len(args.input) != 1:
+        parser.error("单文件模式需要且只能指定一个 -i 输入文件，批量转换请使用 -b")
+
+    from converters import Word2MarkdownConverter
+    from generators.archive_writer import detect_archive_format
+
+    converter = Word2MarkdownConverter(args.lang, use_cache=not args.no_cache,
+                                       track_memory=args.stats_memory)
+    archive_format = args.archive or detect_archive_format(args.output)
+    if args.split:
+        if args.output == "-":
+            parser.error("拆分输出需要通过 -o 指定输出目录")
+        stats = converter.convert_split(args.input[0], args.output, engine=args.engine, interactive=True,
+                                        split_level=args.split_level, filename_template=args.split_template,
+                                        workers=args.jobs or 1)
+    elif archive_format:
+        stats = converter.convert_to_archive(args.input[0], args.output, engine=args.engine, interactive=True,
+                                             archive_format=archive_format, workers=args.jobs or 1)
+    else:
+        stats = converter.convert(args.input[0], args.output, engine=args.engine, workers=args.jobs or 1,
+                                  incremental=args.incremental)
+
+    if args.stats or args.stats_memory:
+        # 输出到标准输出时统计信息写到标准错误
+        print(stats.format_report(), file=sys.stderr if args.output == "-" else sys.stdout)
+    if args.stats_json:
+        with open(args.stats_json, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
 
 
 if __name__ == "__main__":
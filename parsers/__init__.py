@@ -1,4 +1,30 @@
-from .document_parser import WordDocumentParser
+import importlib
 
+# 可用的解析引擎名称，与 Word2MarkdownConverter 的 PARSER_ENGINES 一致
+ENGINES = ("docx", "stream")
 
-__all__ = ['WordDocumentParser']
\ No newline at end of file
+# 导出名称 -> 所在子模块，首次访问时才导入（PEP 562），导入包本身不会加载 python-docx 等依赖
+_EXPORTS = {
+    'WordDocumentParser': 'document_parser',
+    'StreamingDocumentParser': 'streaming_parser',
+    'ParseCache': 'parse_cache',
+    'Section': 'section',
+    'StyleTable': 'style_table'
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'WordDocumentParser',
+    'StreamingDocumentParser',
+    'ParseCache',
+    'Section',
+    'StyleTable'
+]
\ No newline at end of file
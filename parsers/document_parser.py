@@ -1,52 +1,107 @@
+import io
+from collections import deque
 from docx import Document
-from typing import List, Dict, Any
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+from .package_reader import DocxPackageReader, DocxSource, ZipPart, load_source
+from .parse_cache import ParseCache
+from .section import Section
+
+P_TAG = qn("w:p")
+TBL_TAG = qn("w:tbl")
 
 
 class WordDocumentParser:
-    """Word文档解析器"""
+    """Word文档解析器
 
-    def __init__(self, docx_path: str):
+    解析分两个阶段：构造时只扫描一级标题并记录每个章节的正文块范围；
+    选定章节后再通过 iter_sections 加载 python-docx 文档，按范围取出章节的段落和表格，
+    段落和表格对象在遍历时才创建，用完即可释放。
+    """
+
+    def __init__(self, docx_path: DocxSource, cache: Optional[ParseCache] = None,
+                 sections: Optional[List[Section]] = None, fingerprints: bool = False):
         """
         初始化文档解析器
 
         Args:
-            docx_path: Word文档路径
+            docx_path: Word文档路径或文件内容（也可以是二进制文件对象）
+            cache: 章节索引缓存（可选，不提供时不使用缓存；内存中的文档不使用缓存）
+            sections: 已知的章节索引（可选，提供时跳过扫描）
+            fingerprints: 扫描时是否计算章节内容指纹（增量转换需要，使用缓存时总会计算）
+        """
+        self.docx_path = docx_path = load_source(docx_path)
+        self.cache = cache if cache is not None else ParseCache(enabled=False)
+        self._document = None
+        self.reader = DocxPackageReader(docx_path)
+        self.sections = sections if sections is not None else self.cache.load_sections(
+            docx_path, lambda: self.reader.scan_sections(fingerprints or self.cache.enabled)
+        )
+
+    @property
+    def document(self) -> Document:
+        """python-docx 文档对象，首次访问时才加载"""
+        if self._document is None:
+            source = self.docx_path
+            self._document = Document(io.BytesIO(source) if isinstance(source, bytes) else source)
+        return self._document
+
+    def iter_sections(self, sections: Iterable[Section]
+                      ) -> Iterator[Tuple[Section, Iterator[Union[Paragraph, Table]]]]:
+        """
+        加载选定章节的内容
+
+        按文档顺序单次遍历正文，只为选定章节范围内的正文块创建段落和表格对象。
+        章节的内容为惰性迭代器，需要在取下一个章节之前消费（未消费的部分会被跳过）。
+
+        Args:
+            sections: 选定的章节列表
+
+        Returns:
+            (章节, 段落和表格迭代器) 的迭代器
         """
-        self.docx_path = docx_path
-        self.document = Document(docx_path)
-        self.sections = []
-        self._parse_sections()
-
-    def _parse_sections(self):
-        """解析文档中的章节"""
-        current_section = {"title": "", "content": [], "index": 0}
-        section_index = 0
-
-        for para in self.document.paragraphs:
-            style = para.style.name.strip()
-            if style == "Heading 1":
-                if current_section["content"]:
-                    self.sections.append(current_section)
-                section_index += 1
-                current_section = {
-                    "title": para.text.strip(),
-                    "content": [],
-                    "index": section_index
-                }
-            else:
-                current_section["content"].append(para)
-
-        if current_section["content"]:
-            self.sections.append(current_section)
-
-    def get_sections(self) -> List[Dict[str, Any]]:
-        """获取所有章节"""
+        body = self.document._body
+        children = body._element.iterchildren(P_TAG, TBL_TAG)
+        position = 0
+        for sec in sections:
+            if sec.start < position:
+                # 章节不是按文档顺序给出时从头重新遍历
+                children = body._element.iterchildren(P_TAG, TBL_TAG)
+                position = 0
+            deque(islice(children, sec.start - position), maxlen=0)
+            elements = islice(children, sec.size)
+            yield sec, (Paragraph(elem, body) if elem.tag == P_TAG else Table(elem, body) for elem in elements)
+            deque(elements, maxlen=0)
+            position = sec.end
+
+    def get_style_name(self, para) -> str:
+        """获取段落的规范化样式名称（按 w:pStyle 查样式表）"""
+        return self.reader.get_style_name(para._p)
+
+    def get_image_parts(self) -> Dict[str, ZipPart]:
+        """获取文档关系中可供读取的部件（直接从zip包中流式读取）"""
+        return self.reader.get_image_parts()
+
+    def get_hyperlinks(self) -> Dict[str, str]:
+        """获取文档中外部超链接的地址，rId -> URL"""
+        return self.reader.get_hyperlinks()
+
+    def get_shared_fingerprint(self) -> str:
+        """获取所有章节共用的样式表和外部关系的指纹"""
+        return self.reader.shared_fingerprint()
+
+    def get_sections(self) -> List[Section]:
+        """获取所有章节（只含标题和位置，内容通过 iter_sections 加载）"""
         return self.sections
 
     def get_section_titles(self) -> Dict[int, str]:
         """获取章节标题映射"""
-        return {sec["index"]: sec["title"] for sec in self.sections if sec["index"] > 0}
+        return {sec.index: sec.title for sec in self.sections if sec.index > 0}
 
     def get_max_section_index(self) -> int:
         """获取最大章节索引"""
-        return max((sec["index"] for sec in self.sections), default=0)
+        return max((sec.index for sec in self.sections), default=0)
@@ -0,0 +1,385 @@
+import hashlib
+import io
+import os
+import posixpath
+import threading
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.oxml.parser import element_class_lookup
+from docx.oxml.table import CT_Tbl
+from docx.oxml.text.paragraph import CT_P
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from .section import Section
+from .style_table import StyleTable
+
+RT_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+RT_STYLES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+RT_HYPERLINK = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+PR_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+CT_DEFAULT = "{http://schemas.openxmlformats.org/package/2006/content-types}Default"
+CT_OVERRIDE = "{http://schemas.openxmlformats.org/package/2006/content-types}Override"
+NS_RELATIONSHIPS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+# 正文元素中引用关系的属性（r:embed、r:id、r:link 等）的值
+REL_ID_XPATH = etree.XPath(f"descendant-or-self::*/@*[namespace-uri()='{NS_RELATIONSHIPS}']")
+
+# 扫描正文时每处理多少个元素报告一次进度
+SCAN_PROGRESS_INTERVAL = 500
+
+# 图片内容类型对应的文件扩展名
+IMAGE_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/gif": "gif",
+    "image/bmp": "bmp",
+    "image/tiff": "tiff",
+    "image/x-emf": "emf",
+    "image/x-wmf": "wmf",
+    "image/svg+xml": "svg",
+    "image/webp": "webp",
+}
+
+
+# Word文档的来源：文件路径或内存中的文件内容
+DocxSource = Union[str, bytes]
+
+
+def load_source(source) -> DocxSource:
+    """
+    规范化文档来源：路径和bytes原样返回，文件对象读入内存
+
+    Args:
+        source: 文件路径（str 或 PathLike）、文件内容（bytes）或二进制文件对象
+
+    Returns:
+        文件路径或文件内容
+    """
+    if isinstance(source, (str, bytes)):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    if hasattr(source, "read"):
+        return source.read()
+    raise TypeError(f"不支持的文档来源：{type(source).__name__}")
+
+
+def source_name(source) -> str:
+    """文档来源的显示名称，内存中的文档使用文件对象的名称（如果有）"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    name = getattr(source, "name", None)
+    return name if isinstance(name, str) else "<内存>"
+
+
+def open_package(source: DocxSource) -> zipfile.ZipFile:
+    """打开 .docx zip 包；内存中的文档每次包装为独立的流，可在多个线程中同时读取"""
+    return zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+class SharedPackage:
+    """在多次读取之间共享的已打开 zip 包
+
+    每次打开 zip 包都要重新读取中央目录，成千上万张图片时开销远大于读取图片本身；
+    这里每个线程只打开一次并一直复用，不同线程各自持有独立的句柄，可以同时读取。
+    句柄随对象一起释放；序列化时只保留文档来源，反序列化后按需重新打开。
+    """
+
+    def __init__(self, source: DocxSource):
+        """
+        初始化共享的 zip 包
+
+        Args:
+            source: Word文档路径或文件内容
+        """
+        self.source = source
+        self._local = threading.local()
+
+    def zipfile(self) -> zipfile.ZipFile:
+        """当前线程的 zip 包句柄，首次访问时打开"""
+        package = getattr(self._local, "package", None)
+        if package is None:
+            package = self._local.package = open_package(self.source)
+        return package
+
+    def open(self, partname: str) -> BinaryIO:
+        """以流的方式打开部件，同一个句柄可以同时打开多个部件"""
+        return self.zipfile().open(partname)
+
+    def __getstate__(self):
+        return {"source": self.source}
+
+    def __setstate__(self, state):
+        self.__init__(state["source"])
+
+
+class ZipPart:
+    """zip包中的一个部件，按需以流的方式读取内容"""
+
+    def __init__(self, package: SharedPackage, partname: str, content_type: str = "", size: int = -1,
+                 crc: int = 0):
+        """
+        初始化部件
+
+        Args:
+            package: 部件所在的共享 zip 包
+            partname: 部件在zip包中的名称（如 word/media/image1.png）
+            content_type: 部件的内容类型（来自 [Content_Types].xml）
+            size: 解压后的大小
+            crc: zip目录中记录的CRC32，可在不读取内容的情况下判断部件是否改变
+        """
+        self.package = package
+        self.partname = partname
+        self.content_type = content_type
+        self.size = size
+        self.crc = crc
+
+    @property
+    def extension(self) -> str:
+        """根据内容类型（其次是部件名）确定的文件扩展名"""
+        if self.content_type in IMAGE_EXTENSIONS:
+            return IMAGE_EXTENSIONS[self.content_type]
+        ext = posixpath.splitext(self.partname)[1].lstrip(".").lower()
+        return "jpg" if ext == "jpeg" else ext or "bin"
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """以流的方式打开部件内容"""
+        with self.package.open(self.partname) as stream:
+            yield stream
+
+    @property
+    def blob(self) -> bytes:
+        """部件的二进制内容"""
+        with self.open() as stream:
+            return stream.read()
+
+
+class DocxPackageReader:
+    """直接读取 .docx zip 包的轻量读取器
+
+    不构建 python-docx 的 Document 对象，只读取关系、样式表，
+    并增量遍历 word/document.xml 的正文段落。文档可以是文件路径，也可以是内存中的文件内容。
+    """
+
+    def __init__(self, docx_path: DocxSource):
+        """
+        初始化读取器
+
+        Args:
+            docx_path: Word文档路径或文件内容（也可以是二进制文件对象，会被读入内存）
+        """
+        self.docx_path = load_source(docx_path)
+        # 读取器和它创建的所有部件共用同一个已打开的 zip 包
+        self.package = SharedPackage(self.docx_path)
+
+        package = self.package.zipfile()
+        self.styles_hash = ""
+        self.document_partname = self._find_document_partname(package)
+        self.rels, self.external_rels = self._read_rels(package, self.document_partname)
+        self.style_table = self._read_style_table(package)
+        self.content_types = self._read_content_types(package)
+        self.part_infos = {info.filename: info for info in package.infolist()}
+
+    @staticmethod
+    def _rels_partname(partname: str) -> str:
+        """获取部件对应的关系部件名称"""
+        directory, filename = posixpath.split(partname)
+        return posixpath.join(directory, "_rels", filename + ".rels")
+
+    @staticmethod
+    def _iter_relationships(package: zipfile.ZipFile, rels_partname: str) -> Iterator[etree._Element]:
+        """遍历关系部件中的所有关系"""
+        if rels_partname not in package.namelist():
+            return
+        root = etree.fromstring(package.read(rels_partname))
+        yield from root.iter(PR_RELATIONSHIP)
+
+    def _find_document_partname(self, package: zipfile.ZipFile) -> str:
+        """从包关系中找到主文档部件"""
+        for rel in self._iter_relationships(package, "_rels/.rels"):
+            if rel.get("Type") == RT_OFFICE_DOCUMENT:
+                return rel.get("Target").lstrip("/")
+        return "word/document.xml"
+
+    def _read_rels(self, package: zipfile.ZipFile,
+                   partname: str) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, str]]]:
+        """读取部件的关系，返回 (包内关系, 外部关系)，均为 rId -> {type, target}"""
+        rels, external_rels = {}, {}
+        base_dir = posixpath.dirname(partname)
+        for rel in self._iter_relationships(package, self._rels_partname(partname)):
+            if rel.get("TargetMode") == "External":
+                external_rels[rel.get("Id")] = {"type": rel.get("Type"), "target": rel.get("Target")}
+                continue
+            target = rel.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get("Id")] = {"type": rel.get("Type"), "target": target}
+        return rels, external_rels
+
+    @staticmethod
+    def _read_content_types(package: zipfile.ZipFile) -> Dict[str, str]:
+        """读取 [Content_Types].xml，返回 部件名 -> 内容类型"""
+        content_types = {}
+        if "[Content_Types].xml" not in package.namelist():
+            return content_types
+
+        root = etree.fromstring(package.read("[Content_Types].xml"))
+        defaults = {
+            elem.get("Extension", "").lower(): elem.get("ContentType")
+            for elem in root.iter(CT_DEFAULT)
+        }
+        for name in package.namelist():
+            ext = posixpath.splitext(name)[1].lstrip(".").lower()
+            if ext in defaults:
+                content_types[name] = defaults[ext]
+        for elem in root.iter(CT_OVERRIDE):
+            content_types[elem.get("PartName", "").lstrip("/")] = elem.get("ContentType")
+        return content_types
+
+    def _read_style_table(self, package: zipfile.ZipFile) -> StyleTable:
+        """读取 styles.xml 并建立样式解析表"""
+        styles_partname = next(
+            (rel["target"] for rel in self.rels.values() if rel["type"] == RT_STYLES), None
+        )
+        if styles_partname is None or styles_partname not in package.namelist():
+            return StyleTable()
+        styles_xml = package.read(styles_partname)
+        self.styles_hash = hashlib.sha1(styles_xml).hexdigest()
+        return StyleTable(parse_xml(styles_xml))
+
+    def get_style_name(self, p: CT_P) -> str:
+        """获取段落元素的规范化样式名称"""
+        return self.style_table.name(p.style)
+
+    def get_image_parts(self) -> Dict[str, ZipPart]:
+        """获取文档关系中可供读取的部件"""
+        parts = {}
+        for rId, rel in self.rels.items():
+            info = self.part_infos.get(rel["target"])
+            parts[rId] = ZipPart(self.package, rel["target"], self.content_types.get(rel["target"], ""),
+                                 info.file_size if info else -1, info.CRC if info else 0)
+        return parts
+
+    def get_hyperlinks(self) -> Dict[str, str]:
+        """获取文档中外部超链接的地址，rId -> URL"""
+        return {
+            rId: rel["target"] for rId, rel in self.external_rels.items() if rel["type"] == RT_HYPERLINK
+        }
+
+    def shared_fingerprint(self) -> str:
+        """
+        所有章节共用的部件的指纹
+
+        章节指纹只覆盖正文XML，样式表（决定标题、代码块等样式）和外部关系（超链接地址）
+        改变时章节内容即使未变，生成的Markdown也可能不同。
+
+        Returns:
+            样式表内容与外部关系的哈希
+        """
+        hasher = hashlib.sha1(self.styles_hash.encode("ascii"))
+        for rId in sorted(self.external_rels):
+            rel = self.external_rels[rId]
+            hasher.update(f"\0{rId}\0{rel['type']}\0{rel['target']}".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _relationship_key(self, rIds) -> bytes:
+        """章节引用的关系 rId -> 目标的序列化结果，用于章节指纹"""
+        items = []
+        for rId in sorted(rIds):
+            rel = self.rels.get(rId) or self.external_rels.get(rId) or {}
+            items.append(f"{rId}\0{rel.get('type', '')}\0{rel.get('target', '')}")
+        return "\n".join(items).encode("utf-8")
+
+    def iter_body_blocks(self, progress: Optional[Callable[[int, int], None]] = None
+                         ) -> Iterator[Union[CT_P, CT_Tbl]]:
+        """
+        按文档顺序增量遍历正文中的段落和表格元素，每个元素被消费后即释放
+
+        Args:
+            progress: 进度回调（可选），每处理 SCAN_PROGRESS_INTERVAL 个元素以及结束时以
+                (已读取的正文字节数, 正文总字节数) 调用；回调抛出的异常会中止遍历
+
+        Returns:
+            段落和表格元素的迭代器
+        """
+        body_tag = qn("w:body")
+        block_tags = (qn("w:p"), qn("w:tbl"))
+        info = self.part_infos.get(self.document_partname)
+        total = info.file_size if info else -1
+        count = 0
+        with self.package.open(self.document_partname) as source:
+            context = etree.iterparse(
+                source, events=("end",), tag=(qn("w:p"), qn("w:tbl"), qn("w:sdt")),
+                remove_blank_text=True, resolve_entities=False
+            )
+            context.set_element_class_lookup(element_class_lookup)
+            for _, elem in context:
+                body = elem.getparent()
+                if body is None or body.tag != body_tag:
+                    continue
+                if elem.tag in block_tags:
+                    yield elem
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del body[0]
+                count += 1
+                if progress is not None and count % SCAN_PROGRESS_INTERVAL == 0:
+                    progress(source.tell(), total)
+        if progress is not None:
+            progress(total, total)
+
+    def scan_sections(self, fingerprints: bool = False,
+                      progress: Optional[Callable[[int, int], None]] = None) -> List[Section]:
+        """
+        只扫描一级标题，建立章节索引
+
+        start/end 为章节正文在正文块（段落和表格，按文档顺序）中的下标范围 [start, end)，
+        不含内容的章节与原解析规则一致被忽略。
+
+        Args:
+            fingerprints: 是否为每个章节计算内容指纹（正文XML和其中引用的关系 rId -> 目标的哈希；
+                正文不变但关系被重新编号时，同一个 rId 可能指向另一张图片或另一个链接）
+            progress: 扫描进度回调（可选），参数为 (已读取的正文字节数, 正文总字节数)，见 iter_body_blocks
+
+        Returns:
+            章节索引列表
+        """
+        sections = []
+        current_section = Section(0, "", 0, 0)
+        hasher = hashlib.sha1() if fingerprints else None
+        rIds = set()
+        position = 0
+
+        def close_section():
+            current_section.end = position
+            if hasher is not None:
+                hasher.update(b"\0rels\0" + self._relationship_key(rIds))
+                current_section.fingerprint = hasher.hexdigest()
+            if current_section.size > 0:
+                sections.append(current_section)
+
+        p_tag = qn("w:p")
+        for block in self.iter_body_blocks(progress):
+            if block.tag == p_tag and self.style_table.heading_level(block.style) == 1:
+                close_section()
+                current_section = Section(current_section.index + 1, Paragraph(block, None).text.strip(),
+                                          position + 1, position + 1)
+                hasher = hashlib.sha1() if fingerprints else None
+                rIds = set()
+            elif hasher is not None:
+                hasher.update(etree.tostring(block))
+                rIds.update(REL_ID_XPATH(block))
+            position += 1
+
+        close_section()
+        return sections
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .section import Section
+
+CACHE_VERSION = 4
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "word2md")
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class ParseCache:
+    """章节索引的磁盘缓存
+
+    以文件路径、大小、修改时间和内容哈希为键保存章节索引及各章节的内容指纹，
+    文档未改变时重复打开和转换可以完全跳过解析。缓存总大小超过上限时按最近最少使用淘汰。
+
+    缓存需要显式启用：解析器只在传入 cache 时使用缓存，Word2MarkdownConverter 和命令行默认启用
+    （use_cache / --no-cache）。启用后每个文档在缓存目录中写入一个JSON文件，记录文档的绝对路径、
+    章节标题和指纹；写入缓存时需要计算整个文件的哈希。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE,
+                 enabled: bool = True):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录（默认读取环境变量 WORD2MD_CACHE_DIR，否则为 ~/.cache/word2md）
+            max_size: 缓存目录的最大字节数
+            enabled: 是否启用缓存（设置环境变量 WORD2MD_NO_CACHE 也可关闭）
+        """
+        self.cache_dir = cache_dir or os.environ.get("WORD2MD_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.max_size = max_size
+        self.enabled = enabled and not os.environ.get("WORD2MD_NO_CACHE")
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """计算文件内容的哈希"""
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _entry_path(self, docx_path: str) -> str:
+        """获取文档对应的缓存条目路径"""
+        key = hashlib.sha1(os.path.abspath(docx_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _write_entry(self, entry_path: str, entry: Dict[str, Any]):
+        """原子地写入缓存条目"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, entry_path)
+
+    def get(self, docx_path: str) -> Optional[List[Section]]:
+        """
+        读取缓存的章节索引
+
+        Args:
+            docx_path: Word文档路径
+
+        Returns:
+            章节索引列表，未命中时返回None
+        """
+        return self._lookup(docx_path)[0]
+
+    def _lookup(self, docx_path: str) -> Tuple[Optional[List[Section]], Optional[str]]:
+        """读取缓存的章节索引，同时返回查找时计算的内容哈希（没有计算时为None）"""
+        if not self.enabled:
+            return None, None
+
+        entry_path = self._entry_path(docx_path)
+        content_hash = None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            stat = os.stat(docx_path)
+
+            if entry.get("version") != CACHE_VERSION or entry["size"] != stat.st_size:
+                return None, None
+            if entry["mtime_ns"] != stat.st_mtime_ns:
+                # 修改时间变了但内容可能没变（例如复制或 touch），以内容哈希为准
+                content_hash = self.file_hash(docx_path)
+                if content_hash != entry["content_hash"]:
+                    return None, content_hash
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._write_entry(entry_path, entry)
+
+            os.utime(entry_path)
+            return [Section.from_dict(sec) for sec in entry["sections"]], content_hash
+        except (OSError, ValueError, KeyError):
+            return None, content_hash
+
+    def put(self, docx_path: str, sections: List[Section], stat: Optional[os.stat_result] = None,
+            content_hash: Optional[str] = None):
+        """
+        保存章节索引
+
+        Args:
+            docx_path: Word文档路径
+            sections: 章节索引列表
+            stat: 扫描前获取的文件状态（可选，避免保存扫描期间被修改的文件）
+            content_hash: 与 stat 对应的文件内容哈希（可选，已在查找时计算过时传入，避免再读一遍文件）
+        """
+        if not self.enabled:
+            return
+
+        try:
+            stat = stat or os.stat(docx_path)
+            entry = {
+                "version": CACHE_VERSION,
+                "path": os.path.abspath(docx_path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": content_hash or self.file_hash(docx_path),
+                "sections": [sec.to_dict() for sec in sections]
+            }
+            self._write_entry(self._entry_path(docx_path), entry)
+            self._evict()
+        except OSError:
+            pass
+
+    def load_sections(self, docx_path: Union[str, bytes],
+                      scan: Callable[[], List[Section]]) -> List[Section]:
+        """
+        读取章节索引，未命中时调用 scan 扫描并写入缓存；内存中的文档（bytes）直接扫描
+
+        Args:
+            docx_path: Word文档路径或文件内容
+            scan: 扫描文档、返回章节索引的函数
+
+        Returns:
+            章节索引列表
+        """
+        if not isinstance(docx_path, str):
+            return scan()
+
+        stat = os.stat(docx_path) if self.enabled else None
+        sections, content_hash = self._lookup(docx_path)
+        if sections is not None:
+            return sections
+
+        sections = scan()
+        self.put(docx_path, sections, stat, content_hash)
+        return sections
+
+    def _evict(self):
+        """淘汰最近最少使用的条目，直到缓存大小不超过上限"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """清空缓存"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+
+class Section:
+    """章节索引
+
+    只记录章节索引、标题和章节正文在正文块（段落和表格，按文档顺序）中的下标范围 [start, end)，
+    不持有段落对象；章节内容由解析器的 iter_sections 在需要时按范围创建。
+    """
+
+    __slots__ = ("index", "title", "start", "end", "fingerprint")
+
+    def __init__(self, index: int, title: str, start: int, end: int, fingerprint: Optional[str] = None):
+        """
+        初始化章节
+
+        Args:
+            index: 章节索引，第一个一级标题之前的内容为 0
+            title: 章节标题
+            start: 章节正文的第一个正文块下标
+            end: 章节正文结束的正文块下标（不含）
+            fingerprint: 章节内容指纹（可选，用于增量转换）
+        """
+        self.index = index
+        self.title = title
+        self.start = start
+        self.end = end
+        self.fingerprint = fingerprint
+
+    @property
+    def size(self) -> int:
+        """章节正文的正文块数量"""
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        data = {"index": self.index, "title": self.title, "start": self.start, "end": self.end}
+        if self.fingerprint is not None:
+            data["fingerprint"] = self.fingerprint
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        """从 to_dict 的结果创建章节"""
+        return cls(data["index"], data["title"], data["start"], data["end"], data.get("fingerprint"))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Section):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.index, self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"Section(index={self.index}, title={self.title!r}, start={self.start}, end={self.end})"
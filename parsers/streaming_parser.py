@@ -0,0 +1,119 @@
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .package_reader import DocxPackageReader, DocxSource, ZipPart, load_source
+from .parse_cache import ParseCache
+from .section import Section
+
+
+class StreamingDocumentParser:
+    """流式Word文档解析器
+
+    直接从zip包中增量解析 word/document.xml，段落和表格被消费后立即释放，
+    内存占用与文档大小无关。对外接口与 WordDocumentParser 保持一致。
+    """
+
+    def __init__(self, docx_path: DocxSource, cache: Optional[ParseCache] = None,
+                 sections: Optional[List[Section]] = None, fingerprints: bool = False):
+        """
+        初始化文档解析器
+
+        Args:
+            docx_path: Word文档路径或文件内容（也可以是二进制文件对象）
+            cache: 章节索引缓存（可选，不提供时不使用缓存；内存中的文档不使用缓存）
+            sections: 已知的章节索引（可选，提供时跳过扫描）
+            fingerprints: 扫描时是否计算章节内容指纹（增量转换需要，使用缓存时总会计算）
+        """
+        self.docx_path = docx_path = load_source(docx_path)
+        self.cache = cache if cache is not None else ParseCache(enabled=False)
+        self.reader = DocxPackageReader(docx_path)
+        self.sections = sections if sections is not None else self.cache.load_sections(
+            docx_path, lambda: self.reader.scan_sections(fingerprints or self.cache.enabled)
+        )
+
+    def get_style_name(self, para: Paragraph) -> str:
+        """获取段落的规范化样式名称（按 w:pStyle 查样式表）"""
+        return self.reader.get_style_name(para._p)
+
+    def get_image_parts(self) -> Dict[str, ZipPart]:
+        """获取文档关系中可供读取的部件"""
+        return self.reader.get_image_parts()
+
+    def get_hyperlinks(self) -> Dict[str, str]:
+        """获取文档中外部超链接的地址，rId -> URL"""
+        return self.reader.get_hyperlinks()
+
+    def get_shared_fingerprint(self) -> str:
+        """获取所有章节共用的样式表和外部关系的指纹"""
+        return self.reader.shared_fingerprint()
+
+    def iter_events(self, section_indices: Optional[Set[int]] = None) -> Iterator[Tuple[str, int, Any]]:
+        """
+        按文档顺序产生章节、段落和表格事件
+
+        Args:
+            section_indices: 只产生这些章节的事件（可选），越过其中最大的章节后即停止解析
+
+        Returns:
+            ("section", 章节索引, 标题)、("paragraph", 章节索引, 段落) 或 ("table", 章节索引, 表格) 事件
+        """
+        if section_indices is not None and not section_indices:
+            return
+        last_index = max(section_indices) if section_indices is not None else None
+        section_index = 0
+        p_tag = qn("w:p")
+        blocks = self.reader.iter_body_blocks()
+        try:
+            for block in blocks:
+                if block.tag != p_tag:
+                    if section_indices is None or section_index in section_indices:
+                        yield "table", section_index, Table(block, None)
+                    continue
+                para = Paragraph(block, None)
+                if self.reader.style_table.heading_level(block.style) == 1:
+                    section_index += 1
+                    if last_index is not None and section_index > last_index:
+                        return
+                    if section_indices is None or section_index in section_indices:
+                        yield "section", section_index, para.text.strip()
+                elif section_indices is None or section_index in section_indices:
+                    yield "paragraph", section_index, para
+        finally:
+            blocks.close()
+
+    def iter_sections(self, sections: List[Section]
+                      ) -> Iterator[Tuple[Section, Iterator[Union[Paragraph, Table]]]]:
+        """
+        以单次流式遍历产生选定章节及其段落和表格
+
+        章节的内容为惰性迭代器，必须在取下一个章节前按顺序消费。
+
+        Args:
+            sections: 选定的章节列表
+
+        Returns:
+            (章节, 段落和表格迭代器) 的迭代器
+        """
+        selected = {sec.index: sec for sec in sections}
+        blocks = (
+            (index, block) for event, index, block in self.iter_events(set(selected))
+            if event != "section"
+        )
+        for index, group in groupby(blocks, key=lambda item: item[0]):
+            yield selected[index], (block for _, block in group)
+
+    def get_sections(self) -> List[Section]:
+        """获取所有章节（只含标题和位置，不含内容）"""
+        return self.sections
+
+    def get_section_titles(self) -> Dict[int, str]:
+        """获取章节标题映射"""
+        return {sec.index: sec.title for sec in self.sections if sec.index > 0}
+
+    def get_max_section_index(self) -> int:
+        """获取最大章节索引"""
+        return max((sec.index for sec in self.sections), default=0)
@@ -0,0 +1,94 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.styles import BabelFish
+
+# 各语言版本 Word/WPS 中内置标题样式的名称，如 "标题 1"、"見出し 1"、"Überschrift 1"
+LOCALIZED_HEADING_PATTERN = re.compile(
+    r"^(?:heading|标题|標題|見出し|제목|überschrift|titre|título|titolo|kop|nagłówek|заголовок)\s*([1-9])$",
+    re.IGNORECASE
+)
+
+
+class StyleTable:
+    """段落样式解析表
+
+    从 styles.xml 一次性建立 styleId -> (规范化样式名称, 标题级别) 的映射，
+    解析段落时只需按 w:pStyle 的原始值查表。
+    """
+
+    def __init__(self, styles=None):
+        """
+        初始化样式表
+
+        Args:
+            styles: styles.xml 的根元素（CT_Styles），为None时所有段落都视为无样式
+        """
+        self._styles: Dict[str, Tuple[str, int]] = {}
+        self._default: Tuple[str, int] = ("", 0)
+
+        if styles is None:
+            return
+
+        default_style = styles.default_for(WD_STYLE_TYPE.PARAGRAPH)
+        if default_style is not None:
+            self._default = self._classify(default_style.name_val)
+
+        # 与 python-docx 的 styles.get_by_id 一致：取第一个匹配的样式，类型不符时回退到默认样式
+        for style in styles.findall(qn("w:style")):
+            if style.styleId in self._styles:
+                continue
+            if style.type == WD_STYLE_TYPE.PARAGRAPH:
+                self._styles[style.styleId] = self._classify(style.name_val)
+            else:
+                self._styles[style.styleId] = self._default
+
+    @staticmethod
+    def normalize_name(name: Optional[str]) -> str:
+        """
+        规范化样式名称
+
+        内置样式按 python-docx 的规则转换为界面名称（heading 1 -> Heading 1），
+        本地化的标题样式名称统一为 "Heading N"。
+
+        Args:
+            name: styles.xml 中的样式名称
+
+        Returns:
+            规范化后的样式名称
+        """
+        if name is None:
+            return ""
+        name = BabelFish.internal2ui(name).strip()
+        match = LOCALIZED_HEADING_PATTERN.match(name)
+        if match:
+            return f"Heading {match.group(1)}"
+        return name
+
+    def _classify(self, name: Optional[str]) -> Tuple[str, int]:
+        """计算样式的规范化名称和标题级别"""
+        name = self.normalize_name(name)
+        match = LOCALIZED_HEADING_PATTERN.match(name)
+        return name, int(match.group(1)) if match else 0
+
+    def lookup(self, style_id: Optional[str]) -> Tuple[str, int]:
+        """
+        按 w:pStyle 的值查找样式
+
+        Args:
+            style_id: 段落的 styleId，无样式时为None
+
+        Returns:
+            (规范化样式名称, 标题级别，非标题为0)
+        """
+        return self._styles.get(style_id, self._default)
+
+    def name(self, style_id: Optional[str]) -> str:
+        """获取样式的规范化名称"""
+        return self.lookup(style_id)[0]
+
+    def heading_level(self, style_id: Optional[str]) -> int:
+        """获取样式的标题级别，非标题返回0"""
+        return self.lookup(style_id)[1]
@@ -1,4 +1,23 @@
-from .image_processor import ImageProcessor
+import importlib
 
+# 导出名称 -> 所在子模块，首次访问时才导入（PEP 562），导入包本身不会加载 python-docx 等依赖
+_EXPORTS = {
+    'ImageProcessor': 'image_processor',
+    'BackgroundImageWriter': 'image_writer',
+    'ImageWriteError': 'image_writer'
+}
 
-__all__ = ['ImageProcessor']
\ No newline at end of file
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'ImageProcessor',
+    'BackgroundImageWriter',
+    'ImageWriteError'
+]
\ No newline at end of file
@@ -1,61 +1,183 @@
+import hashlib
 import os
-import shutil
-from docx.oxml.ns import qn
-from typing import List, Tuple
+from docx.oxml.ns import nsmap, qn
+from lxml import etree
+from typing import Any, Dict, List, Optional, Tuple
+
+from .image_writer import (MAX_BUFFERED_IMAGE_SIZE, BackgroundImageWriter, image_file_name,
+                           store_image_part, write_image_data)
+
+# 一次找出元素下所有引用了图片的 blip
+BLIP_XPATH = etree.XPath(".//w:drawing//a:blip[@r:embed]", namespaces=nsmap)
+TAG_R = qn("w:r")
+TAG_DRAWING = qn("w:drawing")
+ATTR_EMBED = qn("r:embed")
 
 
 class ImageProcessor:
-    """图片处理器"""
+    """图片处理器
+
+    图片按内容哈希命名存放，同一张图片只写入一次，文档中每处引用都指向同一个文件；
+    目录中已存在的同名文件直接复用，不会清空图片目录。
+    每个部件只从zip包中解压一次：提供 writer 时，不太大的图片读入内存、算出文件名后在后台写入，
+    需要在结束前调用 flush；其余情况边解压边计算哈希并同步写入。
+    提供 images 时图片不写入磁盘，只在其中记录 文件名 -> 图片部件。
+    """
 
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, image_dir: Optional[str] = None,
+                 writer: Optional[BackgroundImageWriter] = None, relative_links: bool = False,
+                 images: Optional[Dict[str, Any]] = None):
         """
         初始化图片处理器
 
         Args:
             output_dir: 输出目录
+            image_dir: 图片目录（可选，默认为输出目录下的 images）
+            writer: 后台图片写入器（可选，不提供时同步写入）
+            relative_links: Markdown中是否以相对输出目录的路径引用图片（默认使用图片目录的原始路径）
+            images: 收集图片的字典（可选），提供时不创建图片目录、不写入任何文件
         """
         self.output_dir = output_dir
-        self.image_dir = os.path.join(output_dir, "images")
+        self.image_dir = image_dir or os.path.join(output_dir, "images")
+        self.writer = writer
+        self.relative_links = relative_links
+        self.images = images
+        # Markdown中引用图片使用的目录
+        self.link_dir = (
+            os.path.relpath(self.image_dir, output_dir).replace(os.sep, "/") if relative_links else self.image_dir
+        )
+        # 部件名 -> 图片文件名
+        self._image_names: Dict[str, str] = {}
+        # 章节索引 -> 该章节引用的图片（部件名、CRC、大小、文件名）
+        self.section_images: Dict[int, List[Dict[str, Any]]] = {}
         self._prepare_image_directory()
 
     def _prepare_image_directory(self):
         """准备图片目录"""
-        if os.path.exists(self.image_dir):
-            shutil.rmtree(self.image_dir)
-        os.makedirs(self.image_dir)
+        if self.images is not None:
+            return
+        os.makedirs(self.image_dir, exist_ok=True)
+
+    def store_part(self, part) -> str:
+        """
+        按内容哈希保存图片部件
+
+        文件名在返回前就已确定，图片内容可以稍后在后台写入；扩展名由部件的内容类型决定。
+
+        Args:
+            part: 图片部件（ZipPart）
+
+        Returns:
+            图片文件名
+        """
+        if self.images is not None:
+            image_name = store_image_part(part)
+            self.images[image_name] = part
+            return image_name
+        if self.writer is None or not 0 <= part.size <= MAX_BUFFERED_IMAGE_SIZE:
+            return store_image_part(part, self.image_dir)
+
+        data = part.blob
+        image_name = image_file_name(hashlib.sha256(data).hexdigest(), part)
+        self.writer.submit(write_image_data, os.path.join(self.image_dir, image_name), data)
+        return image_name
+
+    def image_name(self, part) -> str:
+        """
+        获取图片部件保存后的文件名，同一部件被多次引用时只读取和写入一次
+
+        Args:
+            part: 图片部件（ZipPart）
+
+        Returns:
+            图片文件名
+        """
+        image_name = self._image_names.get(part.partname)
+        if image_name is None:
+            image_name = self.store_part(part)
+            self._image_names[part.partname] = image_name
+        return image_name
+
+    def flush(self):
+        """等待后台写入的图片全部完成，写入失败时抛出 ImageWriteError"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    @staticmethod
+    def index_drawings(element, image_parts) -> Dict[Any, List[Any]]:
+        """
+        用一次XPath查询建立 run元素 -> 图片部件 的索引
 
-    def process_images_in_run(self, run, rels, section_index: int,
+        每个run只取其中第一个绘图里的图片，rId 在建立索引时一并解析为部件；
+        绝大多数run没有图片，之后按run查索引即可，不必再遍历每个run的子树。
+
+        Args:
+            element: 段落等XML元素
+            image_parts: 文档关系中的部件（rId -> 部件）
+
+        Returns:
+            run元素 -> 图片部件列表，没有图片的run不在索引中
+        """
+        index: Dict[Any, List[Any]] = {}
+        first_drawings = {}
+        for blip in BLIP_XPATH(element):
+            part = image_parts.get(blip.get(ATTR_EMBED))
+            if part is None:
+                continue
+            # 取最外层的run和其中的绘图（文本框中的图片归属于外层run）
+            run = drawing = None
+            for ancestor in blip.iterancestors():
+                if ancestor.tag == TAG_DRAWING:
+                    drawing = ancestor
+                elif ancestor.tag == TAG_R:
+                    run = ancestor
+                if ancestor is element:
+                    break
+            if run is None or first_drawings.setdefault(run, drawing) is not drawing:
+                continue
+            index.setdefault(run, []).append(part)
+        return index
+
+    def process_image_parts(self, parts: List[Any], section_index: int,
+                            image_count: int) -> Tuple[List[str], int]:
+        """
+        保存run引用的图片部件并生成Markdown图片行
+
+        Args:
+            parts: run引用的图片部件（来自 index_drawings）
+            section_index: 章节索引
+            image_count: 当前图片计数
+
+        Returns:
+            (markdown图片行列表, 更新后的图片计数)
+        """
+        markdown_lines = []
+        for part in parts:
+            image_name = self.image_name(part)
+            self.section_images.setdefault(section_index, []).append({
+                "part": part.partname, "crc": part.crc, "size": part.size, "name": image_name
+            })
+
+            markdown_lines.append(f"![img{section_index}-{image_count}]({self.link_dir}/{image_name})")
+            image_count += 1
+
+        return markdown_lines, image_count
+
+    def process_images_in_run(self, run, image_parts, section_index: int,
                               image_count: int) -> Tuple[List[str], int]:
         """
         处理run中的图片
 
+        保留给外部调用的简单包装：对单个run建立图片索引后交给 process_image_parts。
+
         Args:
             run: Word文档中的run对象
-            rels: 文档关系
+            image_parts: 文档关系中的部件（rId -> 部件）
             section_index: 章节索引
             image_count: 当前图片计数
 
         Returns:
             (markdown图片行列表, 更新后的图片计数)
         """
-        markdown_lines = []
-
-        for drawing in run._element.iter():
-            if drawing.tag.endswith('drawing'):
-                blip_elems = drawing.findall('.//{http://schemas.openxmlformats.org/drawingml/2006/main}blip')
-                for blip in blip_elems:
-                    embed = blip.get(qn("r:embed"))
-                    if embed in rels:
-                        image_part = rels[embed]._target
-                        image_data = image_part.blob
-                        image_name = f"{section_index}-{image_count}.jpg"
-                        image_path = os.path.join(self.image_dir, image_name)
-
-                        with open(image_path, "wb") as f:
-                            f.write(image_data)
-
-                        markdown_lines.append(f"![img{section_index}-{image_count}]({self.image_dir}/{image_name})")
-                        image_count += 1
-                break
-
-        return markdown_lines, image_count
\ No newline at end of file
+        parts = self.index_drawings(run._element, image_parts).get(run._element, [])
+        return self.process_image_parts(parts, section_index, image_count)
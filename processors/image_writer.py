@@ -0,0 +1,194 @@
+import hashlib
+import os
+import posixpath
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# 图片文件名使用的内容哈希长度（十六进制字符数）
+IMAGE_HASH_LENGTH = 32
+# 不超过该大小的图片读入内存、在当前线程中计算文件名后交给后台写入，更大的图片边读边写
+MAX_BUFFERED_IMAGE_SIZE = 4 * 1024 * 1024
+
+
+class ImageWriteError(OSError):
+    """后台写入图片失败"""
+
+    def __init__(self, errors: List[BaseException]):
+        """
+        初始化异常
+
+        Args:
+            errors: 各个写入任务抛出的异常
+        """
+        self.errors = errors
+        super().__init__(f"{len(errors)} 张图片写入失败：{errors[0]}")
+
+
+def _tmp_path(path: str) -> str:
+    """写入 path 时使用的临时文件路径，不同进程和线程互不冲突"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def copy_image_part(image_path: str, part):
+    """
+    把图片部件按块从zip包复制到文件，已存在且大小一致的文件不再写入
+
+    先写临时文件再替换，多个进程写同一张图片时也不会读到写了一半的文件。
+
+    Args:
+        image_path: 图片路径
+        part: 图片部件（ZipPart）
+    """
+    if os.path.isfile(image_path) and os.path.getsize(image_path) == part.size:
+        return
+    tmp_path = _tmp_path(image_path)
+    try:
+        with part.open() as source, open(tmp_path, "wb") as f:
+            shutil.copyfileobj(source, f, COPY_CHUNK_SIZE)
+        os.replace(tmp_path, image_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def image_file_name(digest: str, part) -> str:
+    """由内容哈希（sha256 十六进制）和部件的扩展名得到图片文件名"""
+    return f"{digest[:IMAGE_HASH_LENGTH]}.{part.extension}"
+
+
+def write_image_data(image_path: str, data: bytes):
+    """
+    把内存中的图片内容写入文件，已存在且大小一致的文件不再写入
+
+    先写临时文件再替换，多个进程写同一张图片时也不会读到写了一半的文件。
+
+    Args:
+        image_path: 图片路径
+        data: 图片内容
+    """
+    if os.path.isfile(image_path) and os.path.getsize(image_path) == len(data):
+        return
+    tmp_path = _tmp_path(image_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, image_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def store_image_part(part, image_dir: Optional[str] = None) -> str:
+    """
+    按内容哈希保存图片部件，部件只解压一次
+
+    边读取边计算哈希并写入图片目录中的临时文件，读完后再改名为 哈希.扩展名；
+    目录中已有同名且大小一致的文件时丢弃临时文件。内存占用与图片大小无关。
+
+    Args:
+        part: 图片部件（ZipPart）
+        image_dir: 图片目录（可选），为None时只计算文件名，不写入任何文件
+
+    Returns:
+        图片文件名
+    """
+    hasher = hashlib.sha256()
+    if image_dir is None:
+        with part.open() as source:
+            for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return image_file_name(hasher.hexdigest(), part)
+
+    tmp_path = _tmp_path(os.path.join(image_dir, posixpath.basename(part.partname)))
+    try:
+        with part.open() as source, open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                f.write(chunk)
+            size = f.tell()
+        image_name = image_file_name(hasher.hexdigest(), part)
+        image_path = os.path.join(image_dir, image_name)
+        if not (os.path.isfile(image_path) and os.path.getsize(image_path) == size):
+            os.replace(tmp_path, image_path)
+        return image_name
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BackgroundImageWriter:
+    """后台图片写入器
+
+    用线程池在后台写入图片，与文档解析和Markdown生成重叠进行。等待写入的图片数量有上限，
+    达到上限时 submit 会阻塞，避免待写入的任务（及其内容）无限堆积。
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 32,
+                 on_written: Optional[Callable[[int, int], None]] = None):
+        """
+        初始化写入器
+
+        Args:
+            workers: 写入线程数
+            max_pending: 最多等待写入的图片数
+            on_written: 每完成一个写入任务后调用的回调（在写入线程中调用），参数为 (已完成数, 已提交数)
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self.on_written = on_written
+        self.submitted = 0
+        self.written = 0
+
+    def submit(self, write: Callable, *args):
+        """
+        提交一个写入任务，等待写入的任务过多时阻塞
+
+        Args:
+            write: 写入函数（如 write_image_data）
+            args: 写入函数的参数
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.submitted += 1
+        future.add_done_callback(self._on_done)
+        self._futures.append(future)
+
+    def _on_done(self, _: Future):
+        """写入任务完成后释放名额并报告进度"""
+        self._slots.release()
+        with self._lock:
+            self.written += 1
+            written = self.written
+        if self.on_written is not None:
+            self.on_written(written, self.submitted)
+
+    def flush(self):
+        """
+        等待所有已提交的图片写入完成
+
+        Raises:
+            ImageWriteError: 有图片写入失败
+        """
+        futures, self._futures = self._futures, []
+        errors = [e for e in (future.exception() for future in futures) if e is not None]
+        if errors:
+            raise ImageWriteError(errors)
+
+    def close(self):
+        """关闭写入器，等待后台线程退出"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Set, Union
+from typing import List, Set, Union
 from parsers import WordDocumentParser
+from parsers.section import Section
 
 
 class SectionSelector:
@@ -37,7 +38,7 @@ class SectionSelector:
         """
         return all(1 <= idx <= max_index for idx in indices)
 
-    def select_sections_interactive(self, parser: WordDocumentParser) -> List[Dict[str, Any]]:
+    def select_sections_interactive(self, parser: WordDocumentParser) -> List[Section]:
         """
         交互式选择章节
 
@@ -60,7 +61,7 @@ class SectionSelector:
             try:
                 selected_indices = self.parse_range_input(user_input)
                 if self.validate_selection(selected_indices, max_index):
-                    return [s for s in sections if s["index"] in selected_indices]
+                    return [s for s in sections if s.index in selected_indices]
                 else:
                     print(f"错误，请检查输入的段落数值！最大值为{max_index}")
             except ValueError:
@@ -68,7 +69,7 @@ class SectionSelector:
 
     @staticmethod
     def select_sections_by_range(parser: WordDocumentParser,
-                                 section_range: Union[Set[int], List[int]]) -> List[Dict[str, Any]]:
+                                 section_range: Union[Set[int], List[int]]) -> List[Section]:
         """
         根据指定范围选择章节
 
@@ -83,7 +84,7 @@ class SectionSelector:
             section_range = set(section_range)
 
         sections = parser.get_sections()
-        return [s for s in sections if s["index"] in section_range]
+        return [s for s in sections if s.index in section_range]
 
 
 
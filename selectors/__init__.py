@@ -1,4 +0,0 @@
-from .section_selector import SectionSelector
-
-
-__all__ = ['SectionSelector']
\ No newline at end of file
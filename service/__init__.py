@@ -0,0 +1,5 @@
+from .conversion_service import ConversionService, ServiceBusy, ServiceTimeout
+from .http_server import create_server, serve
+
+
+__all__ = ['ConversionService', 'ServiceBusy', 'ServiceTimeout', 'create_server', 'serve']
\ No newline at end of file
@@ -0,0 +1,230 @@
+import io
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from converters.conversion_result import IMAGE_LINK_DIR
+
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_TIMEOUT = 300
+
+# 工作进程中按代码块语言复用的转换器
+_converters: Dict[str, Any] = {}
+
+
+class ServiceBusy(Exception):
+    """正在转换和排队的请求已达上限"""
+
+
+class ServiceTimeout(Exception):
+    """转换超时"""
+
+
+def _warm_up():
+    """工作进程的初始化函数：提前导入 python-docx 和转换模块"""
+    import docx  # noqa: F401
+    from converters import word2md_converter  # noqa: F401
+
+
+def _ping() -> int:
+    """空任务，用于启动时拉起全部工作进程"""
+    return os.getpid()
+
+
+def _get_converter(code_language: str):
+    """获取（或创建）工作进程中该代码块语言的转换器"""
+    converter = _converters.get(code_language)
+    if converter is None:
+        from converters.word2md_converter import Word2MarkdownConverter
+        converter = Word2MarkdownConverter(code_language, use_cache=False)
+        _converters[code_language] = converter
+    return converter
+
+
+def _zip_result(result, name: str) -> bytes:
+    """把转换结果打包为zip，图片已是压缩格式，只压缩Markdown"""
+    from generators import ArchiveWriter
+
+    buffer = io.BytesIO()
+    with ArchiveWriter(buffer, "zip") as archive:
+        archive.write_bytes(f"{name}.md", result.markdown.encode("utf-8"))
+        for image_name in sorted(result.images):
+            archive.add_part(f"{IMAGE_LINK_DIR}/{image_name}", result.images[image_name])
+    return buffer.getvalue()
+
+
+def convert_upload(data: bytes, name: str, section_range: Optional[List[int]], code_language: str,
+                   engine: str) -> Tuple[Optional[bytes], Dict[str, Any]]:
+    """
+    在工作进程中转换上传的文档
+
+    整个转换在内存中完成，Markdown以相对路径引用图片，和图片一起打包为zip。
+
+    Args:
+        data: .docx 文件内容
+        name: 输出的Markdown文件名（不含扩展名）
+        section_range: 要转换的章节索引（为None时转换全部章节）
+        code_language: 代码块语言
+        engine: 解析引擎
+
+    Returns:
+        (zip内容，转换失败时为None, 转换统计)
+    """
+    result = _get_converter(code_language).convert_document(data, section_range=section_range, engine=engine)
+    stats = result.stats.to_dict()
+    stats["input"], stats["output"] = f"{name}.docx", f"{name}.md"
+    return (_zip_result(result, name) if result else None), stats
+
+
+class ConversionService:
+    """常驻的转换服务
+
+    维护一组预先导入了转换模块的工作进程；同时处理的请求数超过工作进程数时排队，
+    正在转换和排队的请求总数超过上限时直接拒绝。工作进程意外退出时重建进程池。
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = DEFAULT_MAX_QUEUE,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT):
+        """
+        初始化转换服务并启动工作进程
+
+        Args:
+            workers: 工作进程数（默认为CPU核数）
+            max_queue: 最多排队等待的请求数
+            timeout: 单个请求的最长等待时间（秒），为None时不限制
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters: Counter = Counter()
+        self._stage_times: Counter = Counter()
+        self._timed = 0  # 计入耗时的转换次数
+        self._started = time.time()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """创建进程池并拉起全部工作进程"""
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _restart_executor(self, broken: ProcessPoolExecutor):
+        """工作进程异常退出后重建进程池（只重建一次）"""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False)
+            self._executor = self._create_executor()
+            self._counters["restarts"] += 1
+
+    def convert(self, data: bytes, name: str = "document", section_range: Optional[List[int]] = None,
+                code_language: str = "", engine: str = "docx") -> Tuple[Optional[bytes], Dict[str, Any]]:
+        """
+        转换上传的文档，没有空闲的工作进程时排队等待
+
+        Args:
+            data: .docx 文件内容
+            name: 输出的Markdown文件名（不含扩展名）
+            section_range: 要转换的章节索引（为None时转换全部章节）
+            code_language: 代码块语言
+            engine: 解析引擎
+
+        Returns:
+            (zip内容，转换失败时为None, 转换统计)
+
+        Raises:
+            ServiceBusy: 正在转换和排队的请求已达上限
+            ServiceTimeout: 等待超时，超时的任务结束前仍占用一个名额
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ServiceBusy(f"服务繁忙：{self.workers} 个请求正在转换，{self.max_queue} 个请求在排队")
+
+        with self._lock:
+            self._in_flight += 1
+            self._counters["requests"] += 1
+            self._counters["bytes_in"] += len(data)
+        executor = self._executor
+        try:
+            args = (data, name, section_range, code_language, engine)
+            try:
+                future = executor.submit(convert_upload, *args)
+            except BaseException:
+                self._release_slot()
+                raise
+            # 任务结束时才归还名额：等待超时后任务仍在占用工作进程，不能让新的请求越过上限
+            future.add_done_callback(self._release_slot)
+            try:
+                archive, result = future.result(self.timeout)
+            except FutureTimeoutError:
+                self._count("timeouts")
+                raise ServiceTimeout(f"转换超过 {self.timeout}s 未完成")
+        except ServiceTimeout:
+            # 已计入 timeouts，不再计入 failed
+            raise
+        except BrokenProcessPool:
+            self._restart_executor(executor)
+            self._count("failed")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+
+        with self._lock:
+            self._counters["succeeded" if archive is not None else "failed"] += 1
+            self._counters["bytes_out"] += len(archive or b"")
+            self._timed += 1
+            self._stage_times["total"] += result["duration"]
+            for stage, record in result["stages"].items():
+                self._stage_times[stage] += record["time"]
+        return archive, result
+
+    def _release_slot(self, _future=None):
+        """归还一个请求名额（也作为任务完成的回调）"""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _count(self, name: str):
+        """线程安全地累加计数"""
+        with self._lock:
+            self._counters[name] += 1
+
+    def health(self) -> Dict[str, Any]:
+        """服务状态"""
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "active": min(in_flight, self.workers),
+            "queued": max(in_flight - self.workers, 0),
+            "max_queue": self.max_queue
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """累计的请求计数和各阶段耗时；超时的请求只计入 timeouts，不计入 failed"""
+        metrics = self.health()
+        with self._lock:
+            counters = dict(self._counters)
+            stage_times = {name: round(value, 6) for name, value in self._stage_times.items()}
+            timed = self._timed
+        metrics.update({
+            "uptime": round(time.time() - self._started, 3),
+            "counters": counters,
+            "stage_times": stage_times,
+            "average_duration": round(stage_times.get("total", 0.0) / timed, 6) if timed else 0.0
+        })
+        return metrics
+
+    def close(self):
+        """停止工作进程"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import signal
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+from parsers import ENGINES
+from .conversion_service import DEFAULT_MAX_QUEUE, ConversionService, ServiceBusy, ServiceTimeout
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+DEFAULT_MAX_UPLOAD = 100 * 1024 * 1024
+SECTION_RANGE_PATTERN = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+)\s*)?$")
+UNSAFE_NAME_PATTERN = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class RequestError(Exception):
+    """请求参数错误"""
+
+    def __init__(self, status: int, message: str):
+        """
+        初始化异常
+
+        Args:
+            status: HTTP状态码
+            message: 错误说明
+        """
+        self.status = status
+        super().__init__(message)
+
+
+def parse_section_range(value: Optional[str]) -> Optional[List[int]]:
+    """
+    解析章节范围参数，如 "1-3,5,8-9"
+
+    Args:
+        value: 参数值，为空时表示全部章节
+
+    Returns:
+        排序后的章节索引，全部章节时为None
+    """
+    if not value:
+        return None
+    indices = set()
+    for item in value.split(","):
+        match = SECTION_RANGE_PATTERN.match(item)
+        if match is None:
+            raise RequestError(400, f"章节范围格式错误：{item}")
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if end < start:
+            raise RequestError(400, f"章节范围格式错误：{item}")
+        indices.update(range(start, end + 1))
+    return sorted(indices)
+
+
+def _output_name(value: Optional[str]) -> str:
+    """由 name 参数得到安全的输出文件名（不含扩展名）"""
+    name = os.path.splitext(os.path.basename(value or ""))[0]
+    name = UNSAFE_NAME_PATTERN.sub("_", name).strip(". ")
+    return name or "document"
+
+
+def content_disposition(filename: str) -> str:
+    """
+    生成附件下载的 Content-Disposition 响应头
+
+    响应头只能使用 latin-1 编码，非ASCII的文件名放在 filename*（RFC 5987，UTF-8 百分号编码）中，
+    filename 中只保留ASCII字符，供不支持 filename* 的客户端使用。
+
+    Args:
+        filename: 文件名（已去除不安全的字符）
+
+    Returns:
+        响应头的值
+    """
+    stem, extension = os.path.splitext(filename)
+    fallback = stem.encode("ascii", "ignore").decode("ascii").strip() or "document"
+    return f"attachment; filename=\"{fallback}{extension}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """转换服务的HTTP请求处理
+
+    POST /convert?sections=1-3,5&lang=c&engine=docx&name=report，请求体为 .docx 文件内容，
+    返回包含 Markdown 和 images 目录的zip；GET /health 返回服务状态，GET /metrics 返回累计指标。
+    """
+
+    server_version = "word2md"
+
+    def address_string(self) -> str:
+        # Unix socket 的客户端地址为空字符串
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """发送JSON响应"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        """发送JSON格式的错误响应"""
+        self._send_json(status, {"error": message}, headers)
+
+    def do_GET(self):
+        service: ConversionService = self.server.service
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, service.health())
+        elif path == "/metrics":
+            self._send_json(200, service.metrics())
+        else:
+            self._send_error(404, f"未知的路径：{path}")
+
+    def _read_request(self) -> Tuple[bytes, Dict[str, Any]]:
+        """读取上传的文档和转换参数"""
+        url = urlparse(self.path)
+        if url.path != "/convert":
+            raise RequestError(404, f"未知的路径：{url.path}")
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        engine = query.get("engine", "docx")
+        if engine not in ENGINES:
+            raise RequestError(400, f"未知的解析引擎：{engine}")
+        params = {
+            "name": _output_name(query.get("name")),
+            "section_range": parse_section_range(query.get("sections")),
+            "code_language": query.get("lang", ""),
+            "engine": engine
+        }
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise RequestError(411, "需要 Content-Length")
+        try:
+            length = int(length)
+        except ValueError:
+            raise RequestError(400, "Content-Length 格式错误")
+        if length <= 0:
+            raise RequestError(400, "请求体为空，请上传 .docx 文件")
+        if length > self.server.max_upload:
+            raise RequestError(413, f"文件超过上传上限 {self.server.max_upload} 字节")
+        data = self.rfile.read(length)
+        if len(data) != length:
+            raise RequestError(400, "请求体不完整")
+        return data, params
+
+    def do_POST(self):
+        service: ConversionService = self.server.service
+        try:
+            data, params = self._read_request()
+        except RequestError as e:
+            # 不读取被拒绝的请求体，响应后关闭连接
+            self.close_connection = True
+            self._send_error(e.status, str(e))
+            return
+
+        try:
+            archive, result = service.convert(data, **params)
+        except ServiceBusy as e:
+            self._send_error(503, str(e), {"Retry-After": "1"})
+            return
+        except ServiceTimeout as e:
+            self._send_error(504, str(e))
+            return
+        except Exception as e:
+            self._send_error(500, f"{type(e).__name__}: {e}")
+            return
+
+        if archive is None:
+            self._send_json(422, {"error": result["error"] or "转换失败", "stats": result})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(archive)))
+        self.send_header("Content-Disposition", content_disposition(f"{params['name']}.zip"))
+        # 统计信息以ASCII的JSON放在响应头中
+        self.send_header("X-Word2md-Stats", json.dumps(result, separators=(",", ":")))
+        self.end_headers()
+        self.wfile.write(archive)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """监听 Unix socket 的多线程HTTP服务"""
+
+    daemon_threads = True
+
+
+def create_server(service: ConversionService, address: str = DEFAULT_ADDRESS,
+                  max_upload: int = DEFAULT_MAX_UPLOAD) -> socketserver.BaseServer:
+    """
+    创建HTTP服务
+
+    Args:
+        service: 转换服务
+        address: 监听地址，"host:port" 或以 unix: 开头的 Unix socket 路径（如 unix:/tmp/word2md.sock）
+        max_upload: 上传文件的最大字节数
+
+    Returns:
+        尚未开始处理请求的服务对象
+    """
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if os.path.exists(path):
+            os.remove(path)
+        server = ThreadingUnixHTTPServer(path, ConversionRequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), ConversionRequestHandler)
+    server.service = service
+    server.max_upload = max_upload
+    return server
+
+
+def serve(address: str = DEFAULT_ADDRESS, workers: Optional[int] = None, max_queue: int = DEFAULT_MAX_QUEUE,
+          max_upload: int = DEFAULT_MAX_UPLOAD):
+    """
+    启动转换服务，直到按下 Ctrl+C 或收到 SIGTERM
+
+    Args:
+        address: 监听地址，"host:port" 或 unix:路径
+        workers: 工作进程数（默认为CPU核数）
+        max_queue: 最多排队等待的请求数
+        max_upload: 上传文件的最大字节数
+    """
+    service = ConversionService(workers, max_queue)
+    server = create_server(service, address, max_upload)
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"🚀 转换服务已启动：{address}（{service.workers} 个工作进程，最多排队 {service.max_queue} 个请求）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n正在停止转换服务...")
+    finally:
+        server.server_close()
+        service.close()
+        if address.startswith("unix:") and os.path.exists(address[len("unix:"):]):
+            os.remove(address[len("unix:"):])
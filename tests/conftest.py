@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# 测试直接导入仓库根目录下的各个包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import build_synthetic_docx
+
+
+@pytest.fixture(scope="session")
+def sample_docx(tmp_path_factory) -> str:
+    """带标题、格式、图片和表格的小型测试文档"""
+    path = str(tmp_path_factory.mktemp("docx") / "sample.docx")
+    build_synthetic_docx(path, sections=4, paragraphs=6, images=4, tables=2, table_rows=3)
+    return path
@@ -0,0 +1,76 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from converters import Word2MarkdownConverter
+from generators import archive_writer
+from generators.archive_writer import ArchiveWriter, detect_archive_format, strip_archive_extension
+
+
+class _PipeStream(io.RawIOBase):
+    """只能顺序写入的流，模拟管道"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data.extend(b)
+        return len(b)
+
+
+def _members(path):
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+def test_detect_and_strip_extension():
+    assert detect_archive_format("out.tar.gz") == "tar.gz"
+    assert detect_archive_format("out.TGZ") == "tar.gz"
+    assert detect_archive_format("out.md") is None
+    assert strip_archive_extension("dir/out.tar.gz") == "dir/out"
+
+
+@pytest.mark.parametrize("extension", ["zip", "tar", "tar.gz"])
+def test_convert_to_archive(tmp_path, sample_docx, extension):
+    archive_path = tmp_path / f"doc.{extension}"
+    converter = Word2MarkdownConverter("c", use_cache=False)
+    assert converter.convert_to_archive(sample_docx, str(archive_path))
+    members = _members(archive_path)
+
+    expected = converter.convert_document(sample_docx)
+    assert members.pop("doc.md").decode("utf-8") == expected.markdown
+    assert members == {f"images/{name}": data for name, data in expected.image_bytes().items()}
+    assert [p.name for p in tmp_path.iterdir()] == [archive_path.name]
+
+
+def test_tar_member_spills_to_temp_file(monkeypatch):
+    monkeypatch.setattr(archive_writer, "TAR_SPOOL_SIZE", 16)
+    stream = _PipeStream()
+    content = "章节内容\n".encode("utf-8") * 1000
+    with ArchiveWriter(stream, "tar") as archive:
+        with archive.open_member("doc.md") as member:
+            for line in content.splitlines(keepends=True):
+                member.write(line)
+    with tarfile.open(fileobj=io.BytesIO(bytes(stream.data))) as archive:
+        assert archive.extractfile("doc.md").read() == content
+
+
+def test_zip_to_non_seekable_stream():
+    stream = _PipeStream()
+    with ArchiveWriter(stream, "zip") as archive:
+        archive.write_bytes("a.md", b"# a\n")
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as archive:
+        assert archive.read("a.md") == b"# a\n"
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        ArchiveWriter(io.BytesIO(), "rar")
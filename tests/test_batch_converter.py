@@ -0,0 +1,53 @@
+import json
+import os
+import shutil
+
+from converters import BatchConverter
+
+
+def _input_tree(root, sample_docx):
+    """input/a.docx、input/sub/b.docx、Word锁文件和一个无法解析的文档"""
+    (root / "sub").mkdir(parents=True)
+    shutil.copy(sample_docx, root / "a.docx")
+    shutil.copy(sample_docx, root / "sub" / "b.docx")
+    shutil.copy(sample_docx, root / "~$a.docx")
+    (root / "notes.txt").write_text("x", encoding="utf-8")
+    (root / "broken.docx").write_bytes(b"not a docx")
+
+
+def test_collect_tasks_mirrors_directories(tmp_path, sample_docx):
+    source = tmp_path / "input"
+    _input_tree(source, sample_docx)
+    out = str(tmp_path / "out")
+    converter = BatchConverter(workers=1, use_cache=False)
+
+    tasks = converter.collect_tasks([str(source), str(source / "sub" / "*.docx")], out)
+    outputs = {os.path.relpath(task["output"], out) for task in tasks}
+    assert outputs == {"a.md", "broken.md", os.path.join("sub", "b.md")}
+    assert all(task["use_cache"] is False for task in tasks)
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# 注释\n\ndocs/a.docx\n", encoding="utf-8")
+    assert BatchConverter.read_manifest(str(manifest)) == [os.path.join(str(tmp_path), "docs/a.docx")]
+
+
+def test_run_isolates_failures(tmp_path, sample_docx):
+    source = tmp_path / "input"
+    _input_tree(source, sample_docx)
+    out = tmp_path / "out"
+    converter = BatchConverter("c", workers=2, use_cache=False)
+    tasks = converter.collect_tasks([str(source)], str(out))
+
+    summary = converter.run(tasks)
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (3, 2, 1)
+    assert [r["input"] for r in summary["files"]] == [task["input"] for task in tasks]
+    failed = [r for r in summary["files"] if r["status"] != "ok"]
+    assert failed[0]["input"].endswith("broken.docx") and failed[0]["error"]
+    assert (out / "a.md").read_text(encoding="utf-8").startswith("## ")
+    assert (out / "sub" / "b.md").is_file()
+
+    summary_path = tmp_path / "report" / "summary.json"
+    BatchConverter.write_summary(summary, str(summary_path))
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["failed"] == 1
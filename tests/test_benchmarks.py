@@ -0,0 +1,61 @@
+import json
+import zipfile
+
+from benchmarks import build_synthetic_docx
+from benchmarks.run_benchmarks import STAGES, StageRecorder, compare, main, run_pipeline
+
+
+def _result(time, peak_memory=0):
+    return {"engines": {"docx": {"stages": {"parse": {"time": time, "peak_memory": peak_memory}}}}}
+
+
+def test_synthetic_document_is_deterministic(tmp_path):
+    paths = [tmp_path / "a.docx", tmp_path / "b.docx"]
+    for path in paths:
+        build_synthetic_docx(str(path), sections=3, paragraphs=4, images=2, tables=1, table_rows=2, seed=7)
+    contents = []
+    for path in paths:
+        with zipfile.ZipFile(path) as archive:
+            contents.append(archive.read("word/document.xml"))
+    assert contents[0] == contents[1]
+
+
+def test_run_pipeline_records_every_stage(tmp_path, sample_docx):
+    for engine in ("docx", "stream"):
+        recorder = StageRecorder()
+        work_dir = tmp_path / engine
+        work_dir.mkdir()
+        counters = run_pipeline(sample_docx, engine, str(work_dir), recorder)
+        assert set(recorder.times) == set(STAGES)
+        assert counters["sections"] == 4
+        assert counters["images"] == 4
+        assert counters["bytes_written"] == (work_dir / "out.md").stat().st_size
+
+
+def test_compare_reports_regressions():
+    assert compare(_result(1.0), _result(1.0), 0.25) == []
+    # 低于噪声下限的差值不算退化
+    assert compare(_result(0.004), _result(0.001), 0.25) == []
+    assert compare(_result(2.0), _result(1.0), 0.25) == ["docx/parse time: 1.0 -> 2.0"]
+    assert compare(_result(1.0, 64 * 1024 * 1024), _result(1.0, 1024 * 1024), 0.25) == [
+        f"docx/parse peak_memory: {1024 * 1024} -> {64 * 1024 * 1024}"
+    ]
+    assert compare(_result(2.0), {"engines": {}}, 0.25) == []
+
+
+def test_main_writes_results_and_checks_baseline(tmp_path, capsys):
+    output = tmp_path / "result.json"
+    args = ["--sections", "2", "--paragraphs", "2", "--images", "1", "--tables", "1", "--table-rows", "2",
+            "--repeat", "1", "--no-startup", "--engines", "stream", "-o", str(output)]
+    assert main(args) == 0
+    results = json.loads(output.read_text(encoding="utf-8"))
+    assert set(results["engines"]["stream"]["stages"]) == set(STAGES)
+
+    for stage in results["engines"]["stream"]["stages"].values():
+        stage["time"] = 0.0
+        stage["peak_memory"] = 0
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results), encoding="utf-8")
+    capsys.readouterr()
+    assert main(args[:-2] + ["--baseline", str(baseline), "--threshold", "0"]) == 1
+    assert "stream/" in capsys.readouterr().out
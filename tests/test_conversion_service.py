@@ -0,0 +1,59 @@
+import pytest
+
+from service import ConversionService, ServiceBusy, ServiceTimeout
+
+
+@pytest.fixture
+def docx_data(sample_docx) -> bytes:
+    with open(sample_docx, "rb") as f:
+        return f.read()
+
+
+def test_convert_counts_success(docx_data):
+    service = ConversionService(workers=1, max_queue=0)
+    try:
+        archive, result = service.convert(docx_data, name="sample")
+    finally:
+        service.close()
+    assert archive is not None
+    assert result["output"] == "sample.md"
+    counters = service.metrics()["counters"]
+    assert counters["requests"] == 1
+    assert counters["succeeded"] == 1
+    assert "failed" not in counters
+
+
+def test_timeout_counted_once(docx_data):
+    service = ConversionService(workers=1, max_queue=0, timeout=0)
+    try:
+        with pytest.raises(ServiceTimeout):
+            service.convert(docx_data)
+    finally:
+        service.close()
+    counters = service.metrics()["counters"]
+    assert counters["timeouts"] == 1
+    assert "failed" not in counters
+
+
+def test_invalid_document_counts_failed():
+    service = ConversionService(workers=1, max_queue=0)
+    try:
+        archive, result = service.convert(b"not a docx")
+    finally:
+        service.close()
+    assert archive is None
+    assert result["error"]
+    assert service.metrics()["counters"]["failed"] == 1
+
+
+def test_busy_when_queue_full(docx_data):
+    service = ConversionService(workers=1, max_queue=0, timeout=0)
+    try:
+        with pytest.raises(ServiceTimeout):
+            service.convert(docx_data)
+        # 超时的任务结束前仍占用唯一的名额
+        with pytest.raises(ServiceBusy):
+            service.convert(docx_data)
+    finally:
+        service.close()
+    assert service.metrics()["counters"]["rejected"] == 1
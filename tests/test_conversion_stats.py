@@ -0,0 +1,38 @@
+import json
+
+from converters import Word2MarkdownConverter
+from converters.conversion_stats import STAGES, ConversionStats
+
+
+def test_stages_accumulate_and_report():
+    stats = ConversionStats("in.docx", "out.md")
+    with stats.stage("generate"):
+        pass
+    with stats.stage("generate"):
+        pass
+    stats.count("sections", 3)
+    stats.finish(True)
+
+    data = stats.to_dict()
+    assert data["success"] is True
+    assert data["counters"]["sections"] == 3
+    assert "generate" in data["stages"]
+    json.dumps(data)
+    assert "generate" in stats.format_report()
+
+
+def test_conversion_records_all_stages(tmp_path, sample_docx):
+    stats = Word2MarkdownConverter(use_cache=False).convert(sample_docx, str(tmp_path / "out.md"),
+                                                            interactive=False)
+    assert stats
+    assert set(STAGES) <= set(stats.stages)
+    assert stats.counters["images"] > 0
+    assert stats.counters["image_files"] == len(list((tmp_path / "images").iterdir()))
+
+
+def test_failed_conversion_records_error(tmp_path):
+    missing = str(tmp_path / "missing.docx")
+    stats = Word2MarkdownConverter(use_cache=False).convert(missing, str(tmp_path / "out.md"), interactive=False)
+    assert not stats
+    assert stats.error
+    assert stats.to_dict()["success"] is False
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt5.QtCore")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui"))
+
+from PyQt5.QtCore import QCoreApplication  # noqa: E402
+from workers import ConversionWorker, SectionLoader  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORD2MD_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _record(signal):
+    values = []
+    signal.connect(lambda *args: values.append(args))
+    return values
+
+
+def test_section_loader_reports_progress(sample_docx):
+    loader = SectionLoader(sample_docx)
+    progress, loaded = _record(loader.progress), _record(loader.loaded)
+    loader.run()
+
+    assert progress[-1] == (100,)
+    (parser,), = loaded
+    assert list(parser.get_section_titles()) == [1, 2, 3, 4]
+
+
+def test_section_loader_cancel(sample_docx):
+    loader = SectionLoader(sample_docx)
+    loaded, cancelled = _record(loader.loaded), _record(loader.cancelled)
+    loader.cancel()
+    loader.run()
+
+    assert cancelled == [()]
+    assert loaded == []
+
+
+def test_conversion_worker_cancelled_flag(tmp_path, sample_docx):
+    worker = ConversionWorker(sample_docx, str(tmp_path / "out.md"), [1, 2])
+    finished = _record(worker.finished_with_stats)
+    worker.cancel()
+    worker.run()
+
+    (stats,), = finished
+    assert stats.cancelled
+    assert not stats
+
+
+def test_conversion_worker_progress(tmp_path, sample_docx):
+    worker = ConversionWorker(sample_docx, str(tmp_path / "out.md"), [1, 2])
+    progress, finished = _record(worker.progress), _record(worker.finished_with_stats)
+    worker.run()
+    # 图片进度从后台写入线程发出，排队到当前线程处理
+    QCoreApplication.processEvents()
+
+    (stats,), = finished
+    assert stats and not stats.cancelled
+    assert ("sections", 2, 2) in progress
+    assert any(kind == "images" for kind, _, _ in progress)
@@ -0,0 +1,108 @@
+import http.client
+import io
+import json
+import threading
+import zipfile
+from urllib.parse import quote
+
+import pytest
+
+from service import ConversionService, create_server
+from service.http_server import RequestError, content_disposition, parse_section_range
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = ConversionService(workers=1, max_queue=1)
+    server = create_server(service, "127.0.0.1:0", max_upload=10 * 1024 * 1024)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response, response.read()
+    finally:
+        connection.close()
+
+
+def test_content_disposition_non_ascii_name():
+    value = content_disposition("报告.zip")
+    value.encode("latin-1")
+    assert 'filename="document.zip"' in value
+    assert "filename*=UTF-8''%E6%8A%A5%E5%91%8A.zip" in value
+
+
+def test_content_disposition_ascii_name():
+    assert content_disposition("report.zip") == "attachment; filename=\"report.zip\"; filename*=UTF-8''report.zip"
+
+
+def test_convert_non_ascii_name(server, sample_docx):
+    with open(sample_docx, "rb") as f:
+        data = f.read()
+    response, body = _request(server, "POST", f"/convert?name={quote('报告')}", data)
+    assert response.status == 200
+    assert "filename*=UTF-8''%E6%8A%A5%E5%91%8A.zip" in response.getheader("Content-Disposition")
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        names = archive.namelist()
+        assert "报告.md" in names
+        assert any(name.startswith("images/") for name in names)
+
+
+def test_parse_section_range():
+    assert parse_section_range(None) is None
+    assert parse_section_range("3-4,1,4") == [1, 3, 4]
+    with pytest.raises(RequestError):
+        parse_section_range("5-2")
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/unknown", None, 404),
+    ("POST", "/unknown", b"x", 404),
+    ("POST", "/convert?engine=pdf", b"x", 400),
+    ("POST", "/convert?sections=a-b", b"x", 400),
+    ("POST", "/convert", b"", 400),
+    ("POST", "/convert", b"not a docx", 422),
+])
+def test_request_errors(server, method, path, body, status):
+    response, data = _request(server, method, path, body)
+    assert response.status == status
+    assert response.getheader("Content-Type").startswith("application/json")
+    assert json.loads(data)["error"]
+
+
+def _post_headers(server, headers):
+    """只发送请求头，不发送请求体"""
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    try:
+        connection.putrequest("POST", "/convert")
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def test_missing_content_length(server):
+    assert _post_headers(server, {}) == 411
+
+
+def test_upload_too_large(server):
+    assert _post_headers(server, {"Content-Length": str(server.max_upload + 1)}) == 413
+
+
+def test_health_and_metrics(server):
+    response, data = _request(server, "GET", "/health")
+    assert response.status == 200
+    assert json.loads(data)
+    response, data = _request(server, "GET", "/metrics")
+    assert response.status == 200
+    assert {"counters", "stage_times", "uptime"} <= set(json.loads(data))
@@ -0,0 +1,125 @@
+import hashlib
+import io
+import threading
+import zipfile
+
+import pytest
+
+from benchmarks.synthetic_docx import make_png
+from parsers import StreamingDocumentParser
+from parsers.package_reader import SharedPackage, ZipPart
+from processors import BackgroundImageWriter, ImageProcessor, ImageWriteError
+from processors.image_writer import IMAGE_HASH_LENGTH, store_image_part
+
+PNG = make_png(1)
+
+
+def _parts(members):
+    """由 {部件名: (内容类型, 内容)} 创建内存中 zip 包里的部件"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for partname, (_, data) in members.items():
+            archive.writestr(partname, data)
+    package = SharedPackage(buffer.getvalue())
+    return [
+        ZipPart(package, partname, content_type, len(data))
+        for partname, (content_type, data) in members.items()
+    ]
+
+
+def test_extension_from_content_type():
+    parts = _parts({
+        "word/media/image1.bin": ("image/png", PNG),
+        "word/media/image2.jpeg": ("application/octet-stream", b"jpeg"),
+        "word/media/image3": ("", b"data"),
+    })
+    assert [part.extension for part in parts] == ["png", "jpg", "bin"]
+
+
+def test_store_image_part_names_by_content(tmp_path):
+    part = _parts({"word/media/image1.bin": ("image/png", PNG)})[0]
+    expected = f"{hashlib.sha256(PNG).hexdigest()[:IMAGE_HASH_LENGTH]}.png"
+    assert store_image_part(part) == expected
+    assert not list(tmp_path.iterdir())
+    assert store_image_part(part, str(tmp_path)) == expected
+    assert [p.name for p in tmp_path.iterdir()] == [expected]
+    assert (tmp_path / expected).read_bytes() == PNG
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_identical_images_are_stored_once(tmp_path, background):
+    parts = _parts({
+        "word/media/image1.png": ("image/png", PNG),
+        "word/media/image2.png": ("image/png", PNG),
+        "word/media/image3.png": ("image/png", make_png(2)),
+    })
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    (image_dir / "keep.txt").write_text("x", encoding="utf-8")
+
+    with BackgroundImageWriter(workers=2) as writer:
+        processor = ImageProcessor(str(tmp_path), writer=writer if background else None)
+        names = [processor.image_name(part) for part in parts]
+        processor.flush()
+
+    assert names[0] == names[1] != names[2]
+    assert sorted(p.name for p in image_dir.iterdir()) == sorted({"keep.txt", names[0], names[2]})
+    assert (image_dir / names[0]).read_bytes() == PNG
+
+
+def test_collecting_images_writes_nothing(tmp_path):
+    images = {}
+    part = _parts({"word/media/image1.png": ("image/png", PNG)})[0]
+    processor = ImageProcessor(str(tmp_path), images=images)
+    name = processor.image_name(part)
+    assert images == {name: part}
+    assert not list(tmp_path.iterdir())
+
+
+def test_background_writer_bounds_pending_writes():
+    release = threading.Event()
+    progress = []
+    writer = BackgroundImageWriter(workers=1, max_pending=1, on_written=lambda *args: progress.append(args))
+    try:
+        writer.submit(release.wait)
+        second = threading.Thread(target=writer.submit, args=(lambda: None,))
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+        assert writer.submitted == 1
+
+        release.set()
+        second.join(5)
+        assert not second.is_alive()
+        writer.flush()
+        assert writer.written == writer.submitted == 2
+        assert progress[-1] == (2, 2)
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_background_writer_reports_errors():
+    def fail():
+        raise OSError("disk full")
+
+    with BackgroundImageWriter(workers=1) as writer:
+        writer.submit(fail)
+        writer.submit(lambda: None)
+        with pytest.raises(ImageWriteError) as info:
+            writer.flush()
+        assert len(info.value.errors) == 1
+        writer.flush()
+
+
+def test_index_drawings_finds_every_image(sample_docx):
+    parser = StreamingDocumentParser(sample_docx)
+    image_parts = parser.get_image_parts()
+    found = []
+    for _, content in parser.iter_sections(parser.get_sections()):
+        for block in content:
+            for run, parts in ImageProcessor.index_drawings(block._element, image_parts).items():
+                assert run.tag.endswith("}r")
+                found.extend(part.partname for part in parts)
+    assert len(found) == 4
+    assert set(found) <= {part.partname for part in image_parts.values()}
@@ -0,0 +1,48 @@
+import io
+
+import docx
+import pytest
+
+from converters import Word2MarkdownConverter
+from generators.table_renderer import TableRenderer
+
+
+@pytest.fixture(scope="module")
+def markdown() -> str:
+    document = docx.Document()
+    document.add_heading("First", level=1)
+    paragraph = document.add_paragraph("plain ")
+    paragraph.add_run("bold").bold = True
+    paragraph.add_run(" and ")
+    paragraph.add_run("ital").italic = True
+    paragraph.add_run("ic").italic = True
+    paragraph.add_run(" ")
+    paragraph.add_run("x = 1").font.name = "Consolas"
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "a|b"
+    table.cell(0, 1).text = "h2"
+    table.cell(1, 0).text = "line1\nline2"
+    table.cell(1, 1).text = "v"
+    document.add_paragraph("after table")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    result = Word2MarkdownConverter("c", use_cache=False).convert_document(buffer.getvalue())
+    assert result
+    return result.markdown
+
+
+def test_inline_formatting(markdown):
+    # 相邻的同格式run合并为一段
+    assert "plain **bold** and *italic* `x = 1`" in markdown
+
+
+def test_table_in_body_order(markdown):
+    table = "| a\\|b | h2 |\n| --- | --- |\n| line1<br>line2 | v |"
+    assert table in markdown
+    assert markdown.index("plain") < markdown.index(table) < markdown.index("after table")
+
+
+def test_escape_cell_text():
+    assert TableRenderer._escape("a|b\r\nc\nd") == "a\\|b<br>c<br>d"
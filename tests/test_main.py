@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 以 __main__ 运行 main.py，最后一行输出已导入的转换相关模块
+RUN_MAIN = """
+import runpy, sys
+sys.argv = ["main.py"] + sys.argv[1:]
+try:
+    runpy.run_path("main.py", run_name="__main__")
+except SystemExit as e:
+    assert not e.code, e.code
+print(sorted({m.split(".")[0] for m in sys.modules} & {"docx", "generators", "converters", "processors"}))
+"""
+
+
+def _run_main(tmp_path, *args):
+    env = dict(os.environ, WORD2MD_CACHE_DIR=str(tmp_path / "cache"))
+    result = subprocess.run([sys.executable, "-c", RUN_MAIN, *args], cwd=ROOT, env=env,
+                            capture_output=True, text=True, encoding="utf-8", check=True)
+    *output, modules = result.stdout.rstrip("\n").split("\n")
+    return "\n".join(output), json.loads(modules.replace("'", '"'))
+
+
+def test_help_does_not_import_converters(tmp_path):
+    output, modules = _run_main(tmp_path, "-h")
+    assert "--list-sections" in output
+    assert modules == []
+
+
+def test_list_sections(tmp_path, sample_docx):
+    output, modules = _run_main(tmp_path, "-i", sample_docx, "--list-sections", "json")
+    sections = json.loads(output)
+    assert [sec["index"] for sec in sections] == [1, 2, 3, 4]
+    assert modules == ["docx"]
+
+    # 第二次命中缓存，不再加载 python-docx
+    cached, modules = _run_main(tmp_path, "-i", sample_docx, "--list-sections", "json")
+    assert json.loads(cached) == sections
+    assert modules == []
+
+    text, _ = _run_main(tmp_path, "-i", sample_docx, "--list-sections")
+    assert text.splitlines() == [f"{sec['index']}: {sec['title']}" for sec in sections]
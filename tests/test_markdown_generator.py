@@ -0,0 +1,49 @@
+from converters import MarkdownConverter
+from converters.markdown_converter import escape_link_text
+from generators import MarkdownGenerator
+from parsers import WordDocumentParser
+from processors import ImageProcessor
+
+
+def _generator(tmp_path) -> MarkdownGenerator:
+    return MarkdownGenerator(MarkdownConverter("c"), ImageProcessor(str(tmp_path)))
+
+
+def test_convert_plain_urls_to_md():
+    text = "见 https://example.com/a，以及 http://x.org/b)"
+    assert MarkdownConverter.convert_plain_urls_to_md(text) == (
+        "见 [https://example.com/a](https://example.com/a)，以及 [http://x.org/b](http://x.org/b))"
+    )
+
+
+def test_escape_link_text():
+    assert escape_link_text(r"a[1]\b") == r"a\[1\]\\b"
+    assert escape_link_text("普通文字") == "普通文字"
+
+
+def test_generate_markdown_for_sections_matches_iter_markdown(tmp_path, sample_docx):
+    parser = WordDocumentParser(sample_docx)
+    sections = parser.get_sections()[1:]
+
+    lines = _generator(tmp_path).generate_markdown_for_sections(sections, parser)
+    expected = [line for _, section_lines in _generator(tmp_path).iter_markdown(
+        parser.iter_sections(sections), parser) for line in section_lines]
+    assert lines == expected
+    assert any(line.startswith("#") for line in lines)
+    assert any(line.startswith("![") for line in lines)
+
+
+def test_process_images_in_run(tmp_path, sample_docx):
+    parser = WordDocumentParser(sample_docx)
+    image_parts = parser.get_image_parts()
+    image_processor = ImageProcessor(str(tmp_path))
+    runs = [run for sec, content in parser.iter_sections(parser.get_sections())
+            for block in content if hasattr(block, "runs") for run in block.runs]
+
+    lines, count = [], 1
+    for run in runs:
+        run_lines, count = image_processor.process_images_in_run(run, image_parts, 1, count)
+        lines.extend(run_lines)
+    assert len(lines) == count - 1 > 0
+    assert all(line.startswith("![") for line in lines)
+    assert len(list((tmp_path / "images").iterdir())) == len(lines)
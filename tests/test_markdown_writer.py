@@ -0,0 +1,32 @@
+import hashlib
+import io
+
+from generators.markdown_writer import MarkdownWriter
+
+SECTIONS = {1: ["## 一", "正文"], 2: (line for line in ["", "## 二"]), 5: ["## 五"]}
+
+
+def test_output_matches_joined_lines():
+    stream = io.BytesIO()
+    writer = MarkdownWriter(stream)
+    for index, lines in SECTIONS.items():
+        writer.write_section(index, lines)
+
+    expected = "\n".join(["## 一", "正文", "", "## 二", "## 五"]).encode("utf-8")
+    assert stream.getvalue() == expected
+    assert writer.position == len(expected)
+    assert writer.output_hash == hashlib.sha256(expected).hexdigest()
+    sections = {
+        index: stream.getvalue()[offset:offset + length].decode("utf-8")
+        for index, (offset, length) in writer.spans.items()
+    }
+    assert sections == {1: "## 一\n正文", 2: "\n## 二", 5: "## 五"}
+
+
+def test_text_stream():
+    stream = io.StringIO()
+    writer = MarkdownWriter(stream)
+    writer.write_section(1, ["## 一"])
+    writer.write_section(2, ["## 二"])
+    assert stream.getvalue() == "## 一\n## 二"
+    assert writer.position == len("## 一\n## 二".encode("utf-8"))
@@ -0,0 +1,96 @@
+import os
+import shutil
+
+from parsers import ParseCache, WordDocumentParser
+from parsers.section import Section
+
+
+def _sections(title: str):
+    return [Section(1, title, 1, 5, "f" * 40)]
+
+
+def _change_same_size(path: str):
+    """改变文件的最后一个字节并推后修改时间，文件大小不变"""
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+
+
+def test_parser_does_not_use_cache_by_default(tmp_path, sample_docx, monkeypatch):
+    monkeypatch.setenv("WORD2MD_CACHE_DIR", str(tmp_path / "cache"))
+    WordDocumentParser(sample_docx).get_sections()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_load_sections_scans_once(tmp_path, sample_docx):
+    cache = ParseCache(str(tmp_path / "cache"))
+    scans = []
+
+    def scan():
+        scans.append(1)
+        return _sections("Section 1")
+
+    assert [sec.title for sec in cache.load_sections(sample_docx, scan)] == ["Section 1"]
+    assert [sec.title for sec in cache.load_sections(sample_docx, scan)] == ["Section 1"]
+    assert len(scans) == 1
+
+
+def test_touched_file_hits_and_changed_file_misses(tmp_path, sample_docx):
+    docx_path = str(tmp_path / "doc.docx")
+    shutil.copyfile(sample_docx, docx_path)
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.put(docx_path, _sections("old"))
+
+    stat = os.stat(docx_path)
+    os.utime(docx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert [sec.title for sec in cache.get(docx_path)] == ["old"]
+
+    _change_same_size(docx_path)
+    assert cache.get(docx_path) is None
+
+
+def test_put_reuses_lookup_hash(tmp_path, sample_docx, monkeypatch):
+    docx_path = str(tmp_path / "doc.docx")
+    shutil.copyfile(sample_docx, docx_path)
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.put(docx_path, _sections("old"))
+    _change_same_size(docx_path)
+
+    hashes = []
+    original = ParseCache.file_hash
+    monkeypatch.setattr(ParseCache, "file_hash", staticmethod(lambda path: hashes.append(path) or original(path)))
+    sections = cache.load_sections(docx_path, lambda: _sections("new"))
+    assert [sec.title for sec in sections] == ["new"]
+    assert len(hashes) == 1
+    assert [sec.title for sec in cache.get(docx_path)] == ["new"]
+
+
+def test_evicts_least_recently_used(tmp_path, sample_docx):
+    cache_dir = tmp_path / "cache"
+    cache = ParseCache(str(cache_dir))
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"doc{i}.docx")
+        shutil.copyfile(sample_docx, path)
+        cache.put(path, _sections(f"doc{i}"))
+        paths.append(path)
+
+    # 按 doc0、doc1、doc2 的顺序写入，然后访问 doc0，使 doc1 成为最久未使用的条目
+    for i, path in enumerate(paths):
+        os.utime(cache._entry_path(path), (1000 + i, 1000 + i))
+    assert cache.get(paths[0]) is not None
+
+    entry_size = os.path.getsize(cache._entry_path(paths[0]))
+    cache.max_size = entry_size * 3
+    extra = str(tmp_path / "doc3.docx")
+    shutil.copyfile(sample_docx, extra)
+    cache.put(extra, _sections("doc3"))
+
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None
+    assert cache.get(paths[2]) is not None
+    assert cache.get(extra) is not None
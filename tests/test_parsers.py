@@ -0,0 +1,95 @@
+import io
+
+import docx
+import pytest
+from docx.enum.style import WD_STYLE_TYPE
+
+from converters import Word2MarkdownConverter
+from parsers import StreamingDocumentParser, WordDocumentParser
+from parsers.section import Section
+from parsers.style_table import StyleTable
+
+
+def _localized_docx() -> bytes:
+    """标题使用本地化样式名称（标题 1）的文档"""
+    document = docx.Document()
+    document.add_paragraph("前言")
+    document.styles.add_style("标题 1", WD_STYLE_TYPE.PARAGRAPH)
+    document.add_paragraph("第一章", style="标题 1")
+    document.add_paragraph("正文一")
+    document.add_heading("Second", level=1)
+    document.add_heading("Sub", level=2)
+    document.add_paragraph("正文二")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _block_texts(parser, sections):
+    return [
+        (section.index, [getattr(block, "text", None) for block in content])
+        for section, content in parser.iter_sections(sections)
+    ]
+
+
+def test_streaming_parser_matches_document_parser(sample_docx):
+    word_parser = WordDocumentParser(sample_docx)
+    stream_parser = StreamingDocumentParser(sample_docx)
+
+    assert stream_parser.get_sections() == word_parser.get_sections()
+    assert stream_parser.get_section_titles() == word_parser.get_section_titles()
+    assert stream_parser.get_hyperlinks() == word_parser.get_hyperlinks()
+    assert set(stream_parser.get_image_parts()) == set(word_parser.get_image_parts())
+    sections = word_parser.get_sections()
+    assert _block_texts(stream_parser, sections) == _block_texts(word_parser, sections)
+
+
+def test_engines_produce_identical_markdown(tmp_path, sample_docx):
+    outputs = {}
+    for engine in ("docx", "stream"):
+        output_path = tmp_path / engine / "out.md"
+        converter = Word2MarkdownConverter("c", use_cache=False, relative_image_links=True)
+        assert converter.convert(sample_docx, str(output_path), engine=engine, interactive=False)
+        outputs[engine] = output_path.read_text(encoding="utf-8")
+    assert outputs["stream"] == outputs["docx"]
+
+
+@pytest.mark.parametrize("parser_class", [WordDocumentParser, StreamingDocumentParser])
+def test_section_index(parser_class):
+    parser = parser_class(_localized_docx())
+    sections = parser.get_sections()
+    assert [(sec.index, sec.title, sec.size) for sec in sections] == [(0, "", 1), (1, "第一章", 1), (2, "Second", 2)]
+    assert parser.get_section_titles() == {1: "第一章", 2: "Second"}
+    assert parser.get_max_section_index() == 2
+    assert _block_texts(parser, sections[2:]) == [(2, ["Sub", "正文二"])]
+
+
+def test_iter_events_stops_after_last_selected_section():
+    parser = StreamingDocumentParser(_localized_docx())
+    events = [(event, index) for event, index, _ in parser.iter_events({1})]
+    assert events == [("section", 1), ("paragraph", 1)]
+    assert list(parser.iter_events(set())) == []
+
+
+def test_style_table_localized_headings():
+    assert StyleTable.normalize_name("heading 1") == "Heading 1"
+    assert StyleTable.normalize_name("标题 2") == "Heading 2"
+    assert StyleTable.normalize_name("Überschrift 3") == "Heading 3"
+    assert StyleTable.normalize_name(None) == ""
+
+    document = docx.Document(io.BytesIO(_localized_docx()))
+    table = StyleTable(document.styles.element)
+    style_ids = {style.name: style.style_id for style in document.styles}
+    assert table.lookup(style_ids["标题 1"]) == ("Heading 1", 1)
+    assert table.heading_level(style_ids["Heading 2"]) == 2
+    assert table.heading_level(None) == 0
+    assert table.name("missing") == table.name(None)
+    assert StyleTable().lookup("Heading1") == ("", 0)
+
+
+def test_section_round_trip():
+    section = Section(3, "标题", 10, 25, "f" * 40)
+    assert section.size == 15
+    assert Section.from_dict(section.to_dict()) == section
+    assert "fingerprint" not in Section(1, "t", 0, 1).to_dict()
+    assert not hasattr(section, "__dict__")
@@ -0,0 +1,61 @@
+import re
+import shutil
+import zipfile
+
+from converters import Word2MarkdownConverter
+from parsers import WordDocumentParser
+
+RELS_NAME = "word/_rels/document.xml.rels"
+
+
+def _swap_image_targets(source: str, target: str):
+    """交换前两个图片关系的目标，正文XML保持不变"""
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == RELS_NAME:
+                rels = data.decode("utf-8")
+                first, second = re.findall(r'Target="(media/[^"]+)"', rels)[:2]
+                rels = rels.replace(first, "\0").replace(second, first).replace("\0", second)
+                data = rels.encode("utf-8")
+            dst.writestr(info, data)
+
+
+def _convert(docx_path, output_path):
+    converter = Word2MarkdownConverter("c", use_cache=False)
+    return converter.convert(str(docx_path), str(output_path), interactive=False, incremental=True)
+
+
+def test_unchanged_document_reuses_all_sections(tmp_path, sample_docx):
+    output_path = tmp_path / "out.md"
+    first = _convert(sample_docx, output_path)
+    content = output_path.read_text(encoding="utf-8")
+
+    second = _convert(sample_docx, output_path)
+    assert second.counters["reused_sections"] == first.counters["sections"] > 0
+    assert output_path.read_text(encoding="utf-8") == content
+
+
+def test_renumbered_relationships_change_fingerprint(tmp_path, sample_docx):
+    swapped = tmp_path / "swapped.docx"
+    _swap_image_targets(sample_docx, str(swapped))
+    with zipfile.ZipFile(sample_docx) as a, zipfile.ZipFile(swapped) as b:
+        assert a.read("word/document.xml") == b.read("word/document.xml")
+
+    before = {sec.index: sec.fingerprint for sec in WordDocumentParser(sample_docx, fingerprints=True).get_sections()}
+    after = {sec.index: sec.fingerprint for sec in WordDocumentParser(str(swapped), fingerprints=True).get_sections()}
+    assert before != after
+
+
+def test_renumbered_relationships_are_not_reused(tmp_path, sample_docx):
+    docx_path = tmp_path / "doc.docx"
+    shutil.copyfile(sample_docx, docx_path)
+    output_path = tmp_path / "out.md"
+    assert _convert(docx_path, output_path)
+
+    _swap_image_targets(sample_docx, str(docx_path))
+    assert _convert(docx_path, output_path)
+
+    full_path = tmp_path / "full.md"
+    assert Word2MarkdownConverter("c", use_cache=False).convert(str(docx_path), str(full_path), interactive=False)
+    assert output_path.read_text(encoding="utf-8") == full_path.read_text(encoding="utf-8")
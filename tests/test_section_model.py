@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt5.QtCore")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui"))
+
+from section_model import SECTION_INDEX_ROLE, SectionFilterModel, SectionListModel  # noqa: E402
+
+TITLES = {i: f"Chapter {i}" if i % 2 else f"附录 {i}" for i in range(1, 2001)}
+
+
+def test_add_and_remove_indices():
+    model = SectionListModel(TITLES)
+    model.add_indices([5, 3, 5])
+    model.add_indices([1, 3])
+    assert model.indices() == [1, 3, 5]
+    assert 3 in model and 4 not in model
+    assert model.data(model.index(1, 0)) == "3: Chapter 3"
+    assert model.data(model.index(1, 0), SECTION_INDEX_ROLE) == 3
+
+    model.remove_indices([3, 4])
+    assert model.indices() == [1, 5]
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_set_titles_lists_every_section():
+    model = SectionListModel({})
+    model.set_titles(TITLES)
+    assert model.rowCount() == len(TITLES)
+    assert model.indices() == sorted(TITLES)
+
+
+def test_filter_model():
+    model = SectionListModel(TITLES)
+    model.set_titles(TITLES)
+    proxy = SectionFilterModel(model)
+    assert proxy.visible_indices() == sorted(TITLES)
+
+    proxy.setFilterFixedString("chapter 19")
+    assert proxy.visible_indices() == [19] + [i for i in range(191, 200, 2)] + [
+        i for i in range(1901, 2000, 2)
+    ]
+    proxy.setFilterFixedString("附录 200")
+    assert proxy.visible_indices() == [200, 2000]
@@ -0,0 +1,55 @@
+from urllib.parse import unquote
+
+import pytest
+
+from converters import Word2MarkdownConverter
+from generators import SplitWriter
+from generators.split_writer import HeadingEvent
+from parsers.section import Section
+
+
+def test_write_section_splits_on_heading_events(tmp_path):
+    writer = SplitWriter(str(tmp_path), split_level=2)
+    lines = ["## 第一章", "正文", HeadingEvent(2, "小节 A"), "### 小节 A", "内容", HeadingEvent(3, "更深"), "#### 更深"]
+    entries = writer.write_section(Section(1, "第一章", 1, 5), lines)
+
+    assert [(e["part"], e["title"], e["file"]) for e in entries] == [
+        (0, "第一章", "001-00-第一章.md"), (1, "小节 A", "001-01-小节 A.md")
+    ]
+    assert (tmp_path / "001-00-第一章.md").read_text(encoding="utf-8") == "## 第一章\n正文"
+    assert (tmp_path / "001-01-小节 A.md").read_text(encoding="utf-8") == "### 小节 A\n内容\n#### 更深"
+    assert [e["bytes"] for e in entries] == [len("## 第一章\n正文".encode("utf-8")),
+                                              len("### 小节 A\n内容\n#### 更深".encode("utf-8"))]
+
+
+def test_write_index_escapes_link_text(tmp_path):
+    writer = SplitWriter(str(tmp_path))
+    index_path = writer.write_index([
+        {"index": 1, "part": 0, "title": r"数组 a[i] 与 C:\路径", "file": "001-a.md"},
+        {"index": 1, "part": 1, "title": "小节", "file": "001 b.md"},
+    ], "文档")
+    with open(index_path, encoding="utf-8") as f:
+        assert f.read() == "# 文档\n\n- [数组 a\\[i\\] 与 C:\\\\路径](001-a.md)\n  - [小节](001%20b.md)\n"
+
+
+@pytest.mark.parametrize("template", ["{title}", "{index}-{bad", "{index}-{missing}"])
+def test_invalid_template(tmp_path, template):
+    with pytest.raises(ValueError):
+        SplitWriter(str(tmp_path), filename_template=template)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_split_matches_single_file(tmp_path, sample_docx, workers):
+    converter = Word2MarkdownConverter("c", use_cache=False, relative_image_links=True)
+    split_dir = tmp_path / "split"
+    assert converter.convert_split(sample_docx, str(split_dir), workers=workers)
+    assert converter.convert(sample_docx, str(tmp_path / "all.md"), interactive=False)
+
+    index = (split_dir / "index.md").read_text(encoding="utf-8").splitlines()
+    files = [unquote(line.rsplit("](", 1)[1].rstrip(")")) for line in index[2:]]
+    assert len(files) == 4
+    parts = [(split_dir / name).read_text(encoding="utf-8") for name in files]
+    # 单文件输出中章节之间以换行分隔，拆分后每个文件对应其中一段
+    assert "\n".join(parts) == (tmp_path / "all.md").read_text(encoding="utf-8")
+    assert sorted(p.name for p in (split_dir / "images").iterdir()) == \
+        sorted(p.name for p in (tmp_path / "images").iterdir())
@@ -0,0 +1,35 @@
+import shutil
+import threading
+
+from converters import DocumentWatcher
+
+
+def test_failed_conversion_is_retried(tmp_path, sample_docx):
+    docx_path = tmp_path / "doc.docx"
+    docx_path.write_bytes(b"still being written")
+    output_path = tmp_path / "doc.md"
+    watcher = DocumentWatcher([str(docx_path)], str(output_path), use_cache=False)
+
+    assert watcher.convert_changed() == 1
+    assert not output_path.exists()
+    # 文件状态没有改变，但上一次转换失败，仍然重新尝试
+    assert watcher.convert_changed() == 1
+
+    shutil.copyfile(sample_docx, docx_path)
+    assert watcher.convert_changed() == 1
+    assert output_path.exists()
+    assert watcher.convert_changed() == 0
+
+
+def test_stop_ends_run(tmp_path, sample_docx):
+    shutil.copyfile(sample_docx, tmp_path / "doc.docx")
+    watcher = DocumentWatcher([str(tmp_path)], str(tmp_path / "out"), use_cache=False,
+                              debounce=0.1, poll_interval=0.1)
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    try:
+        watcher.stop()
+    finally:
+        thread.join(5)
+    assert not thread.is_alive()
+    assert (tmp_path / "out" / "doc.md").exists()
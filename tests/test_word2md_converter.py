@@ -0,0 +1,54 @@
+import threading
+
+from converters import Word2MarkdownConverter
+
+
+def test_convert_document_in_memory(tmp_path, sample_docx, capsys):
+    with open(sample_docx, "rb") as f:
+        result = Word2MarkdownConverter("c", use_cache=False).convert_document(f.read())
+
+    assert result
+    assert capsys.readouterr().out == ""
+    assert result.markdown.startswith("## ")
+    assert result.images
+    for name in result.images:
+        assert f"](images/{name})" in result.markdown
+    assert not list(tmp_path.iterdir())
+
+
+def test_convert_document_matches_file_output(tmp_path, sample_docx):
+    converter = Word2MarkdownConverter("c", use_cache=False, relative_image_links=True)
+    output_path = tmp_path / "out.md"
+    assert converter.convert(sample_docx, str(output_path), interactive=False)
+    result = converter.convert_document(sample_docx)
+    assert result.markdown == output_path.read_text(encoding="utf-8")
+    assert sorted(result.images) == sorted(p.name for p in (tmp_path / "images").iterdir())
+
+
+def test_convert_document_reports_errors_quietly(capsys):
+    result = Word2MarkdownConverter(use_cache=False).convert_document(b"not a docx")
+    assert not result
+    assert result.markdown == ""
+    assert result.stats.error
+    assert capsys.readouterr().out == ""
+
+
+def test_cancelled_conversion_writes_nothing(tmp_path, sample_docx):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    output_path = tmp_path / "out.md"
+    stats = Word2MarkdownConverter(use_cache=False).convert(
+        sample_docx, str(output_path), interactive=False, cancel_event=cancel_event
+    )
+    assert not stats
+    assert not output_path.exists()
+
+
+def test_parallel_generation_matches_sequential(tmp_path, sample_docx):
+    outputs = {}
+    for workers in (1, 3):
+        output_path = tmp_path / str(workers) / "out.md"
+        converter = Word2MarkdownConverter("c", use_cache=False, relative_image_links=True)
+        assert converter.convert(sample_docx, str(output_path), interactive=False, workers=workers)
+        outputs[workers] = output_path.read_text(encoding="utf-8")
+    assert outputs[3] == outputs[1]
@@ -10,6 +10,8 @@ a = Analysis(
     binaries=[],
     datas=[
         ('gui/style.py', '.'),
+        ('gui/workers.py', '.'),
+        ('gui/section_model.py', '.'),
         ('parsers', 'parsers'),
         ('converters', 'converters'),
         ('generators', 'generators'),